@@ -0,0 +1,15 @@
+from services.document_store import DocumentStore, get_default_document_store
+from utils.cache import ResultCache, get_default_cache
+from utils.files import ScratchStore, get_default_scratch_store
+
+
+def get_result_cache() -> ResultCache:
+    return get_default_cache()
+
+
+def get_scratch_store() -> ScratchStore:
+    return get_default_scratch_store()
+
+
+def get_document_store() -> DocumentStore:
+    return get_default_document_store()
@@ -1,5 +1,5 @@
 from fastapi import FastAPI
-from api.routers import convert, compress, merge, split, extract, images, drawings
+from api.routers import convert, compress, merge, split, extract, images, drawings, documents
 
 app = FastAPI(
     title="CeayDocs API",
@@ -13,4 +13,5 @@ app.include_router(merge.router, prefix="/merge", tags=["Merge"])
 app.include_router(split.router, prefix="/split", tags=["Split"])
 app.include_router(extract.router, prefix="/extract", tags=["Extract"])
 app.include_router(images.router, prefix="/images", tags=["Images"])
-app.include_router(drawings.router, prefix="/drawings", tags=["Drawings"])
\ No newline at end of file
+app.include_router(drawings.router, prefix="/drawings", tags=["Drawings"])
+app.include_router(documents.router, prefix="/documents", tags=["Documents"])
@@ -0,0 +1,25 @@
+from typing import Dict, Any
+
+from fastapi import Request
+
+from utils.files import ScratchStore
+
+
+def split_files_available(result: Dict[str, Any], store: ScratchStore) -> bool:
+    """A cached analysis is only usable while its split files are still on disk."""
+    return all(
+        store.exists(h["file_id"], h["name"])
+        for h in result.get("split_files", {}).values()
+    )
+
+
+def with_download_urls(request: Request, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of an analysis result with a download URL on every split file handle."""
+    split_files = {
+        name: {
+            **handle,
+            "url": str(request.url_for("download_split_file", file_id=handle["file_id"], name=name)),
+        }
+        for name, handle in result.get("split_files", {}).items()
+    }
+    return {**result, "split_files": split_files}
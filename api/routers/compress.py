@@ -1,17 +1,60 @@
-from fastapi import APIRouter, UploadFile, File
+from typing import Optional
+
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse
 import io
 
-from utils.compress import compress_pdf
+from api.deps import get_result_cache
+from utils.cache import ResultCache
+from utils.compress import compress_pdf, resolve_settings, COMPRESSION_MODES
 
 router = APIRouter()
 
 
 @router.post("/")
-async def compress_endpoint(file: UploadFile = File(...)):
-    output = compress_pdf(file)
+async def compress_endpoint(
+    file: UploadFile = File(...),
+    mode: str = Query("auto", description="auto, ghostscript, raster or images"),
+    preset: Optional[str] = Query(None, description="high, medium, low or extreme"),
+    dpi: Optional[int] = Query(None, description="Image resolution; overrides the preset"),
+    quality: Optional[int] = Query(None, description="JPEG quality 1-100; overrides the preset"),
+    target_mb: Optional[float] = Query(None, gt=0, description="Aim for an output below this size"),
+    cache: ResultCache = Depends(get_result_cache),
+):
+    if mode not in COMPRESSION_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown compression mode: {mode}")
+
+    target_size = int(target_mb * 1024 * 1024) if target_mb else None
+    try:
+        settings = resolve_settings(preset, dpi, quality)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    params = {"mode": mode, "target_size": target_size}
+    if target_size is None:
+        params["dpi"], params["quality"] = settings
+
+    pdf_bytes = await file.read()
+    try:
+        output = cache.get_or_compute(
+            pdf_bytes,
+            "compress",
+            params,
+            lambda: compress_pdf(
+                io.BytesIO(pdf_bytes),
+                mode=mode,
+                dpi=settings[0],
+                quality=settings[1],
+                target_size=target_size,
+            ),
+        )
+    except RuntimeError as exc:
+        raise HTTPException(status_code=501, detail=str(exc))
+    headers = {"Content-Disposition": "attachment; filename=compressed.pdf"}
+    if target_size is not None:
+        headers["X-Target-Reached"] = "true" if len(output) <= target_size else "false"
     return StreamingResponse(
         io.BytesIO(output),
         media_type="application/pdf",
-        headers={"Content-Disposition": "attachment; filename=compressed.pdf"}
+        headers=headers,
     )
@@ -1,14 +1,28 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query
 from fastapi.responses import StreamingResponse
 import io
 
-from utils.convert import pdf_to_word
+from api.deps import get_result_cache
+from utils.cache import ResultCache
+from services.pdf_to_word import PdfToWordService
+from utils.convert import DOCX_MAX_WORKERS, word_to_pdf_batch, iter_pdf_batch_zip
 
 router = APIRouter()
 
 
 @router.post("/pdf-to-word")
-async def pdf_to_word_api(file: UploadFile = File(...)):
+async def pdf_to_word_api(
+    file: UploadFile = File(...),
+    pages: Optional[str] = Query(None, description="Page ranges to convert, e.g. 1-3,7"),
+    start: Optional[int] = Query(None, ge=1, description="First page (ignored with pages)"),
+    end: Optional[int] = Query(None, ge=1, description="Last page (ignored with pages)"),
+    parallel: bool = Query(False, description="Parse page chunks in several processes"),
+    workers: Optional[int] = Query(None, ge=1, le=DOCX_MAX_WORKERS),
+    engine: str = Query("auto", description="auto, fast (text flow) or pdf2docx (full layout)"),
+    cache: ResultCache = Depends(get_result_cache),
+):
     if not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files allowed")
 
@@ -17,10 +31,56 @@ async def pdf_to_word_api(file: UploadFile = File(...)):
     if not pdf_bytes:
         raise HTTPException(status_code=400, detail="Uploaded file is empty")
 
-    output_bytes = pdf_to_word(pdf_bytes)
+    service = PdfToWordService()
+    try:
+        output_bytes = cache.get_or_compute(
+            pdf_bytes,
+            "pdf-to-word",
+            {"pages": pages, "start": start, "end": end, "engine": engine},
+            lambda: service.execute(
+                pdf_bytes,
+                pages=pages,
+                start=start,
+                end=end,
+                parallel=parallel,
+                workers=workers,
+                engine=engine,
+            ),
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
     return StreamingResponse(
         io.BytesIO(output_bytes),
         media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
         headers={"Content-Disposition": "attachment; filename=converted.docx"}
-    )
\ No newline at end of file
+    )
+
+
+@router.post("/word-to-pdf/batch")
+async def word_to_pdf_batch_api(files: list[UploadFile] = File(...)):
+    """
+    Convert many Word files in as few LibreOffice sessions as possible.
+    Returns a ZIP of the PDFs plus status.json with per-file results.
+    """
+    for f in files:
+        if not f.filename.lower().endswith((".docx", ".doc")):
+            raise HTTPException(status_code=400, detail=f"Only Word files allowed: {f.filename}")
+
+    documents = [(f.filename, await f.read()) for f in files]
+
+    try:
+        results = word_to_pdf_batch(documents)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=501, detail=str(exc))
+
+    failed = sum(1 for r in results if r["status"] != "ok")
+    return StreamingResponse(
+        iter_pdf_batch_zip(results),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": "attachment; filename=converted.zip",
+            "X-Converted-Count": str(len(results) - failed),
+            "X-Failed-Count": str(failed),
+        },
+    )
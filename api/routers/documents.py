@@ -0,0 +1,204 @@
+from typing import Optional
+
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Request, Query
+from fastapi.responses import Response, StreamingResponse
+
+from api.deps import get_document_store, get_result_cache, get_scratch_store
+from api.results import split_files_available, with_download_urls
+from services.analyzer import analyze_drawing
+from services.document_store import DocumentStore, StoredDocument
+from services.parallel_analyzer import DEFAULT_CHUNK_SIZE, MAX_CHUNK_SIZE, MAX_WORKERS
+from services.preview import get_default_preview_service
+from utils.cache import ResultCache
+from utils.files import ScratchStore
+from utils.pdf import parse_page_ranges
+from utils.split import plan_parts, write_pages
+from utils.zipstream import iter_zip
+
+router = APIRouter()
+
+
+def _get(store: DocumentStore, document_id: str) -> StoredDocument:
+    try:
+        return store.get(document_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Document not found or expired; upload it again")
+
+
+@router.post("/")
+async def upload_document(
+    file: UploadFile = File(...),
+    store: DocumentStore = Depends(get_document_store),
+):
+    """Upload a PDF once; later operations refer to it by document_id."""
+    pdf_bytes = await file.read()
+    try:
+        entry = store.add(pdf_bytes, file.filename or "document.pdf")
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return entry.info()
+
+
+@router.get("/{document_id}")
+def document_info(document_id: str, store: DocumentStore = Depends(get_document_store)):
+    return _get(store, document_id).info()
+
+
+@router.delete("/{document_id}")
+def delete_document(document_id: str, store: DocumentStore = Depends(get_document_store)):
+    if not store.remove(document_id):
+        raise HTTPException(status_code=404, detail="Document not found")
+    return {"deleted": document_id}
+
+
+@router.post("/{document_id}/split")
+def split_document(
+    document_id: str,
+    pages: str = Query(..., description="Pages to keep, e.g. 1-3,7"),
+    store: DocumentStore = Depends(get_document_store),
+):
+    entry = _get(store, document_id)
+    with entry.lock:
+        try:
+            selected = parse_page_ranges(pages, entry.page_count)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        output = write_pages(entry.reader, selected)
+
+    return Response(
+        output,
+        media_type="application/pdf",
+        headers={"Content-Disposition": "attachment; filename=split.pdf"},
+    )
+
+
+@router.post("/{document_id}/split/parts")
+def split_document_parts(
+    document_id: str,
+    ranges: Optional[str] = Query(None, description="One file per range, e.g. 1-3,7,10-"),
+    every: Optional[int] = Query(None, ge=1, description="A new file every N pages"),
+    burst: bool = Query(False, description="One file per page"),
+    store: DocumentStore = Depends(get_document_store),
+):
+    """Split into several PDFs and stream them back as a ZIP."""
+    entry = _get(store, document_id)
+    with entry.lock:
+        try:
+            parts = plan_parts(entry.page_count, ranges, every, burst)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+
+    def entries():
+        for name, pages in parts:
+            # lock per part: the response is iterated from worker threads
+            with entry.lock:
+                data = write_pages(entry.reader, pages)
+            yield name, data
+
+    return StreamingResponse(
+        iter_zip(entries()),
+        media_type="application/zip",
+        headers={"Content-Disposition": "attachment; filename=split.zip"},
+    )
+
+
+@router.get("/{document_id}/text")
+def extract_document_text(
+    document_id: str,
+    pages: Optional[str] = Query(None, description="Pages to extract, e.g. 1-3,7"),
+    store: DocumentStore = Depends(get_document_store),
+):
+    """Per-page text from the document's PyMuPDF handle (extracted once, then reused)."""
+    entry = _get(store, document_id)
+    with entry.lock:
+        ctx = entry.context
+        try:
+            selected = parse_page_ranges(pages, ctx.page_count) if pages else range(1, ctx.page_count + 1)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
+        page_texts = [{"page": n, "text": ctx.page_text(n)} for n in selected]
+
+    return {
+        "text": "\n".join(p["text"] for p in page_texts),
+        "pages": page_texts,
+    }
+
+
+@router.get("/{document_id}/pages/{page}/grid/{level}")
+def page_grid(
+    document_id: str,
+    page: int,
+    level: int,
+    store: DocumentStore = Depends(get_document_store),
+):
+    """Tile layout of a page at one zoom level (see PreviewService)."""
+    entry = _get(store, document_id)
+    preview = get_default_preview_service()
+    with entry.lock:
+        if not 1 <= page <= entry.page_count:
+            raise HTTPException(status_code=404, detail="Page out of range")
+        if not 0 <= level < len(preview.zoom_levels):
+            raise HTTPException(status_code=404, detail="Zoom level out of range")
+        rect = entry.context.doc[page - 1].rect
+    return preview.page_grid(rect, level)
+
+
+@router.get("/{document_id}/pages/{page}/tiles/{level}/{col}/{row}")
+def page_tile(
+    document_id: str,
+    page: int,
+    level: int,
+    col: int,
+    row: int,
+    store: DocumentStore = Depends(get_document_store),
+):
+    """One PNG preview tile, rendered from the stored handle and cached."""
+    entry = _get(store, document_id)
+    preview = get_default_preview_service()
+    with entry.lock:
+        if not 1 <= page <= entry.page_count:
+            raise HTTPException(status_code=404, detail="Page out of range")
+        if not 0 <= level < len(preview.zoom_levels):
+            raise HTTPException(status_code=404, detail="Zoom level out of range")
+        try:
+            png = preview.render_tile_from_page(entry.id, entry.context.doc[page - 1], level, col, row)
+        except ValueError as exc:
+            raise HTTPException(status_code=404, detail=str(exc))
+    return Response(png, media_type="image/png")
+
+
+@router.post("/{document_id}/analyze")
+def analyze_document(
+    request: Request,
+    document_id: str,
+    parallel: bool = False,
+    workers: Optional[int] = Query(None, ge=1, le=MAX_WORKERS),
+    chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=1, le=MAX_CHUNK_SIZE),
+    store: DocumentStore = Depends(get_document_store),
+    cache: ResultCache = Depends(get_result_cache),
+    scratch: ScratchStore = Depends(get_scratch_store),
+):
+    """Drawing analysis of a stored document; shares results with /drawings/analyze."""
+    entry = _get(store, document_id)
+    scratch.cleanup()
+
+    # the document id is the content hash, so this is the /drawings/analyze key
+    key = ResultCache.make_key(entry.id, "drawings-analyze")
+    result = cache.get(key)
+
+    if result is None or not split_files_available(result, scratch):
+        # the lock is only held while the shared handle is read, so tile and
+        # text requests for this document are not blocked by the worker pool
+        with entry.lock:
+            ctx = entry.context
+        result = analyze_drawing(
+            ctx,
+            parallel=parallel,
+            workers=workers,
+            chunk_size=chunk_size,
+            store=scratch,
+            lock=entry.lock,
+        )
+        cache.set(key, result)
+
+    return with_download_urls(request, result)
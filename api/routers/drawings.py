@@ -1,9 +1,147 @@
-from fastapi import APIRouter, UploadFile, File
-from services.analyzer import analyze_drawing
+import json
+from typing import Optional, Dict, Any, Iterator, List
+
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Request, Query, Body
+from fastapi.responses import FileResponse, StreamingResponse
+from api.deps import get_result_cache, get_scratch_store
+from api.results import split_files_available, with_download_urls
+from services.analyzer import analyze_drawing, iter_analysis
+from services.drawing_set import analyze_drawing_set
+from services.exporter import EXPORT_FORMATS, iter_index_export, iter_register_export
+from services.parallel_analyzer import DEFAULT_CHUNK_SIZE, MAX_CHUNK_SIZE, MAX_WORKERS
+from utils.cache import ResultCache, hash_bytes
+from utils.files import ScratchStore
 
 router = APIRouter()
 
+
 @router.post("/analyze")
-async def analyze(file: UploadFile = File(...)):
+async def analyze(
+    request: Request,
+    file: UploadFile = File(...),
+    parallel: bool = False,
+    workers: Optional[int] = Query(None, ge=1, le=MAX_WORKERS),
+    chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=1, le=MAX_CHUNK_SIZE),
+    cache: ResultCache = Depends(get_result_cache),
+    store: ScratchStore = Depends(get_scratch_store),
+):
+    pdf_bytes = await file.read()
+    store.cleanup()
+
+    # parallel settings do not change the result, so they are not part of the key
+    key = ResultCache.make_key(hash_bytes(pdf_bytes), "drawings-analyze")
+    result = cache.get(key)
+
+    # a cached result is only usable while its split files are still on disk
+    if result is None or not split_files_available(result, store):
+        result = analyze_drawing(
+            pdf_bytes,
+            parallel=parallel,
+            workers=workers,
+            chunk_size=chunk_size,
+            store=store,
+        )
+        cache.set(key, result)
+
+    return with_download_urls(request, result)
+
+
+@router.post("/analyze/stream")
+async def analyze_stream(
+    request: Request,
+    file: UploadFile = File(...),
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$"),
+    cache: ResultCache = Depends(get_result_cache),
+    store: ScratchStore = Depends(get_scratch_store),
+):
+    """
+    Stream one record per analysed page as soon as it is known, then a
+    final {"type": "summary"} record with the full report.
+    """
     pdf_bytes = await file.read()
-    return analyze_drawing(pdf_bytes)
+    store.cleanup()
+    key = ResultCache.make_key(hash_bytes(pdf_bytes), "drawings-analyze")
+
+    def events() -> Iterator[str]:
+        for record in iter_analysis(pdf_bytes, store=store):
+            if record["type"] == "summary":
+                report = {k: v for k, v in record.items() if k != "type"}
+                cache.set(key, report)
+                record = {"type": "summary", **with_download_urls(request, report)}
+
+            line = json.dumps(record)
+            yield f"data: {line}\n\n" if format == "sse" else f"{line}\n"
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(events(), media_type=media_type)
+
+
+@router.post("/analyze/batch")
+async def analyze_batch(
+    files: list[UploadFile] = File(...),
+    project_code: str = "PRJ",
+    revision: str = "A",
+):
+    """
+    Analyze many PDFs as one drawing set. Repeated sheets are analysed once;
+    the index and register record each sheet's source file and page.
+    """
+    documents = [(f.filename, await f.read()) for f in files]
+    return analyze_drawing_set(documents, project_code=project_code, revision=revision)
+
+
+@router.get("/files/{file_id}/{name}")
+def download_split_file(
+    file_id: str,
+    name: str,
+    store: ScratchStore = Depends(get_scratch_store),
+):
+    try:
+        path = store.path(file_id, name)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid file reference")
+
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail="File not found or expired; re-run the analysis")
+
+    return FileResponse(path, media_type="application/pdf", filename=f"{name}.pdf")
+
+
+def _export_response(make_chunks, fmt: str, filename: str) -> StreamingResponse:
+    try:
+        chunks = make_chunks()
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except RuntimeError as exc:
+        raise HTTPException(status_code=501, detail=str(exc))
+
+    media_type, ext = EXPORT_FORMATS[fmt]
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}.{ext}"}
+    )
+
+
+@router.post("/export/index")
+def export_index(
+    index: List[Dict[str, Any]] = Body(...),
+    format: str = "csv",
+):
+    """Download an index (the `index` list from /analyze) as csv, parquet, arrow or xlsx."""
+    return _export_response(lambda: iter_index_export(index, format), format, "drawing_index")
+
+
+@router.post("/export/register")
+def export_register(
+    index: List[Dict[str, Any]] = Body(...),
+    format: str = "csv",
+    project_code: str = "PRJ",
+    revision: str = "A",
+):
+    """Build the drawing register from an index and download it as csv, parquet, arrow or xlsx."""
+    return _export_response(
+        lambda: iter_register_export(index, format, project_code, revision),
+        format,
+        "drawing_register",
+    )
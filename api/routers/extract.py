@@ -1,14 +1,21 @@
-from fastapi import APIRouter, UploadFile, File
+from fastapi import APIRouter, UploadFile, File, Depends
 
+from api.deps import get_result_cache
+from utils.cache import ResultCache
 from utils.extract import extract_text_from_pdf
 
 router = APIRouter()
 
 
 @router.post("/")
-async def extract_text_endpoint(file: UploadFile = File(...)):
+async def extract_text_endpoint(
+    file: UploadFile = File(...),
+    cache: ResultCache = Depends(get_result_cache),
+):
     pdf_bytes = await file.read()
-    text = extract_text_from_pdf(pdf_bytes)
+    text = cache.get_or_compute(
+        pdf_bytes, "extract-text", {}, lambda: extract_text_from_pdf(pdf_bytes)
+    )
     return {
         "text": text
     }
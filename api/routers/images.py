@@ -1,16 +1,23 @@
-from fastapi import APIRouter, UploadFile, File
+from fastapi import APIRouter, UploadFile, File, Depends
 from fastapi.responses import StreamingResponse
 import io
 
+from api.deps import get_result_cache
+from utils.cache import ResultCache
 from utils.images import pdf_to_images, images_to_pdf
 
 router = APIRouter()
 
 
 @router.post("/pdf-to-images")
-async def pdf_to_images_endpoint(file: UploadFile = File(...)):
+async def pdf_to_images_endpoint(
+    file: UploadFile = File(...),
+    cache: ResultCache = Depends(get_result_cache),
+):
     pdf_bytes = await file.read()
-    output = pdf_to_images(pdf_bytes)
+    output = cache.get_or_compute(
+        pdf_bytes, "pdf-to-images", {"dpi": 150}, lambda: pdf_to_images(pdf_bytes)
+    )
 
     return StreamingResponse(
         io.BytesIO(output),
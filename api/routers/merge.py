@@ -1,18 +1,21 @@
-from fastapi import APIRouter, UploadFile, File
+from fastapi import APIRouter, UploadFile, File, HTTPException
 from fastapi.responses import StreamingResponse
-import io
 
-from utils.merge import merge_pdfs
+from utils.merge import merge_pdfs_to_file, iter_file_chunks
 
 router = APIRouter()
 
 
 @router.post("/")
 async def merge_endpoint(files: list[UploadFile] = File(...)):
-    pdf_bytes = await file.read()
-    output = merge_pdfs(pdf_bytes)
+    for f in files:
+        if not f.filename.lower().endswith(".pdf"):
+            raise HTTPException(status_code=400, detail=f"Only PDF files allowed: {f.filename}")
+
+    # merge from the upload spools directly; large results are written to disk
+    output = merge_pdfs_to_file([f.file for f in files])
     return StreamingResponse(
-        io.BytesIO(output),
+        iter_file_chunks(output),
         media_type="application/pdf",
         headers={"Content-Disposition": "attachment; filename=merged.pdf"}
     )
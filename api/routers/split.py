@@ -1,8 +1,10 @@
-from fastapi import APIRouter, UploadFile, File, Query
+from typing import Optional
+
+from fastapi import APIRouter, UploadFile, File, Query, HTTPException
 from fastapi.responses import StreamingResponse
 import io
 
-from utils.split import split_pdf
+from utils.split import split_pdf, iter_split_zip
 
 router = APIRouter()
 
@@ -14,7 +16,10 @@ async def split_endpoint(
     end: int = 1
 ):
     pdf_bytes = await file.read()
-    output = split_pdf(pdf_bytes, start, end)
+    try:
+        output = split_pdf(pdf_bytes, start, end)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
     return StreamingResponse(
         io.BytesIO(output),
@@ -22,3 +27,23 @@ async def split_endpoint(
         headers={"Content-Disposition": "attachment; filename=split.pdf"}
     )
 
+
+@router.post("/parts")
+async def split_parts_endpoint(
+    file: UploadFile = File(...),
+    ranges: Optional[str] = Query(None, description="One file per range, e.g. 1-3,7,10-"),
+    every: Optional[int] = Query(None, ge=1, description="A new file every N pages"),
+    burst: bool = Query(False, description="One file per page"),
+):
+    """Split into several PDFs in one pass and stream them back as a ZIP."""
+    pdf_bytes = await file.read()
+    try:
+        chunks = iter_split_zip(pdf_bytes, ranges=ranges, every=every, burst=burst)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    return StreamingResponse(
+        chunks,
+        media_type="application/zip",
+        headers={"Content-Disposition": "attachment; filename=split.zip"}
+    )
@@ -3,20 +3,21 @@ import streamlit as st
 from utils.convert import pdf_to_word, word_to_pdf
 from utils.merge import merge_pdfs
 from utils.split import split_pdf
-from utils.compress import compress_pdf
+from utils.compress import compress_pdf, PRESETS
 from utils.extract import extract_text_from_pdf
 from utils.images import pdf_to_images, images_to_pdf
-from services.drawing_index import generate_index, generate_qa, index_to_csv
+from services.drawing_index import DrawingIndex
+from services.exporter import iter_index_export, iter_register_export
+from services.overrides import apply_overrides_to_index
 from services.analyzer import analyze_drawing
 from services.drawing_register import build_register
-import pandas as pd
+from services.preview import get_default_preview_service
 from pathlib import Path
 import io
 from utils.compress import _find_ghostscript
+from utils.cache import get_default_cache, ResultCache
+from utils.files import get_default_scratch_store
 import hashlib
-import fitz
-from io import BytesIO
-from PIL import Image
 
 # paths
 ASSETS = Path(__file__).parent / "assets"
@@ -102,10 +103,15 @@ menu = st.sidebar.selectbox(
 # ===== PDF → Word =====
 if menu == "PDF → Word":
     uploaded = st.file_uploader("Upload PDF", type=["pdf"])
+    pages = st.text_input("Pages (optional, e.g. 1-3,7)").strip() or None
     if uploaded:
         with st.spinner("Converting..."):
             pdf_bytes = uploaded.read()
-            output = pdf_to_word(pdf_bytes)
+            try:
+                output = pdf_to_word(pdf_bytes, pages=pages, parallel=True)
+            except ValueError as exc:
+                st.error(str(exc))
+                st.stop()
         st.success("Done!")
         st.download_button("Download Word File", output, file_name="converted.docx")
 
@@ -167,18 +173,32 @@ elif menu == "Compress PDF":
 
             # Map preset to internal DPI + quality
             preset_map = {
-                "🔵 High Quality (Large File)": (180, 80),
-                "🟢 Medium (Balanced)": (150, 60),
-                "🟡 Low (Small File)": (120, 40),
-                "🔴 Extreme (Minimum Size)": (100, 25),
+                "🔵 High Quality (Large File)": "high",
+                "🟢 Medium (Balanced)": "medium",
+                "🟡 Low (Small File)": "low",
+                "🔴 Extreme (Minimum Size)": "extreme",
             }
 
-            dpi, quality = preset_map[preset]
+            dpi, quality = PRESETS[preset_map[preset]]
 
             st.write(f"DPI: **{dpi}** | JPEG Quality: **{quality}%**")
 
+            target_size = None
+            if st.checkbox("Aim for a maximum file size instead"):
+                target_mb = st.number_input("Maximum size (MB)", min_value=0.1, value=10.0, step=0.5)
+                target_size = int(target_mb * 1024 * 1024)
+                st.caption("DPI and quality are chosen automatically from a sample of pages.")
+
+            engine = st.radio(
+                "Compression engine",
+                ["Automatic", "Images only (keep text and vectors)"],
+            )
+            mode = "images" if engine.startswith("Images") else "auto"
+
             # Detect compressor type
-            if _find_ghostscript():
+            if mode == "images":
+                st.info("Only embedded images are downsampled; text stays searchable.")
+            elif _find_ghostscript():
                 st.success("Using Ghostscript (best compression).")
             else:
                 st.warning("Ghostscript not available — using fallback compressor.")
@@ -187,12 +207,18 @@ elif menu == "Compress PDF":
                 with st.spinner("Compressing PDF... Please wait ⏳"):
                     output_bytes = compress_pdf(
                         io.BytesIO(pdf_bytes),   # pass file-like object
+                        mode=mode,
+                        dpi=dpi,
+                        quality=quality,
+                        target_size=target_size,
                     )
 
                 compressed_size = len(output_bytes)
                 ratio = compressed_size / original_size
 
                 st.success("Compression successful!")
+                if target_size is not None and compressed_size > target_size:
+                    st.warning("The target size could not be reached; this is the smallest output.")
 
                 st.write(f"**New size:** {compressed_size / 1024:.2f} KB")
                 st.write(f"**Compression ratio:** {ratio:.2%}")
@@ -258,16 +284,28 @@ elif menu == "Drawing Analyzer (AEC)":
         if "drawing_state" not in st.session_state or st.session_state.drawing_state.get("source_hash") != pdf_hash:
             with st.spinner("Analyzing drawing..."):
                 try:
-                    result = analyze_drawing(pdf_bytes)
+                    cache = get_default_cache()
+                    store = get_default_scratch_store()
+                    cache_key = ResultCache.make_key(pdf_hash, "drawings-analyze")
+                    result = cache.get(cache_key)
+                    # split files expire from the scratch store; re-run if any are gone
+                    if result is None or not all(
+                        store.exists(h["file_id"], h["name"])
+                        for h in result.get("split_files", {}).values()
+                    ):
+                        result = analyze_drawing(pdf_bytes)
+                        cache.set(cache_key, result)
                 except Exception as e:
                     st.error(f"Analysis failed: {e}")
                     st.stop()
 
             # initialize canonical editable model and clear overrides
+            pages = [p.copy() for p in result.get("pages", [])]
             st.session_state.drawing_state = {
-                "pages": [p.copy() for p in result.get("pages", [])],
+                "pages": pages,
+                "index": DrawingIndex(pages),
                 "raw": result,
-                "split_pdfs": result.get("split_pdfs", {}),
+                "split_files": result.get("split_files", {}),
                 "source_hash": pdf_hash
             }
             st.session_state.overrides = {}  # reset overrides on new upload
@@ -277,12 +315,14 @@ elif menu == "Drawing Analyzer (AEC)":
 
         # now canonical pages variable (single source of truth)
         pages = st.session_state.drawing_state["pages"]
+        if "index" not in st.session_state.drawing_state:
+            st.session_state.drawing_state["index"] = DrawingIndex(pages)
+        drawing_index = st.session_state.drawing_state["index"]
 
         # --- Rule Validation (derived from pages) ---
         st.subheader("📋 Rule Validation")
-        # note: rule_check might originally come from analyzer.raw; but we re-evaluate via generate_qa on current pages
-        index = generate_index(pages)
-        qa = generate_qa(index)
+        # note: rule_check might originally come from analyzer.raw; but we re-evaluate QA on the current index
+        qa = drawing_index.qa()
         rule_check = result.get("rule_check", {})  # keep original if present
         # show rule_check status from analyzer if available, else use our QA verdict
         status = rule_check.get("status") or ("PASS" if not qa.get("missing_views") and not qa.get("scale_issues") else "FAIL")
@@ -360,16 +400,12 @@ elif menu == "Drawing Analyzer (AEC)":
             # replace overrides in session state (keep other pages unchanged)
             st.session_state.overrides.update(new_overrides)
 
-            # apply overrides to canonical pages
-            for idx, p in enumerate(st.session_state.drawing_state["pages"]):
-                ov = st.session_state.overrides.get(p.get("page"))
+            # apply only the changed pages to canonical pages and the index
+            for p in pages:
+                ov = new_overrides.get(p.get("page"))
                 if ov:
-                    st.session_state.drawing_state["pages"][idx].update(ov)
-
-            # recompute derived artifacts
-            pages = st.session_state.drawing_state["pages"]
-            index = generate_index(pages)
-            qa = generate_qa(index)
+                    p.update(ov)
+            apply_overrides_to_index(drawing_index, new_overrides)
 
             st.success("Corrections applied and locked in")
 
@@ -384,47 +420,65 @@ elif menu == "Drawing Analyzer (AEC)":
             }.get(p.get("view_type"), "⬜")
             st.markdown(f"**Page {p.get('page')}** → {badge_color} `{p.get('view_type')}`")
 
-        # Download Separated Drawings (use raw split_pdfs or canonical pages if your splitter supports pages)
+        # Download Separated Drawings (split PDFs live in the scratch store; read on demand)
         st.subheader("Download Separated Drawings")
-        split_map = st.session_state.drawing_state.get("split_pdfs", {}) or {}
-        for name, pdf_bytes in split_map.items():
-            if not pdf_bytes:
+        split_map = st.session_state.drawing_state.get("split_files", {}) or {}
+        store = get_default_scratch_store()
+        for name, handle in split_map.items():
+            if not store.exists(handle["file_id"], handle["name"]):
                 continue
             st.download_button(
                 label=f"⬇️ Download {name.upper()} PDF",
-                data=pdf_bytes,
+                data=store.read_bytes(handle["file_id"], handle["name"]),
                 file_name=f"{name}.pdf",
                 mime="application/pdf"
             )
 
-        # Drawing Preview (Page 1)
-        st.subheader("Drawing Preview (Page 1)")
+        # Drawing Preview (any page; tiles rendered lazily and cached by document hash)
+        st.subheader("Drawing Preview")
         try:
-            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-            page0 = doc[0]
-            pix = page0.get_pixmap(dpi=120)
-            image = Image.open(BytesIO(pix.tobytes("png")))
-
-            st.image(
-                image,
-                caption="Page 1 Preview",
-                width='stretch'
+            previews = get_default_preview_service()
+            doc_hash = previews.open(pdf_bytes, pdf_hash)
+            preview_page = st.number_input(
+                "Page", min_value=1, max_value=previews.page_count(doc_hash), value=1, key="preview_page"
             )
+            overview = previews.overview_level(doc_hash, preview_page)
+            level = st.select_slider(
+                "Zoom",
+                options=list(range(overview, len(previews.zoom_levels))),
+                format_func=lambda lv: f"{previews.zoom_levels[lv]:g}x",
+                key="preview_zoom"
+            )
+
+            if level == overview:
+                st.image(
+                    previews.render_page(doc_hash, preview_page, level),
+                    caption=f"Page {preview_page} Preview",
+                    width='stretch'
+                )
+            else:
+                # zoomed in: show only the selected tile
+                grid = previews.grid(doc_hash, preview_page, level)
+                col_pick, row_pick = st.columns(2)
+                tile_col = col_pick.number_input("Tile column", 1, grid["columns"], 1, key="preview_col") - 1
+                tile_row = row_pick.number_input("Tile row", 1, grid["rows"], 1, key="preview_row") - 1
+                st.image(
+                    previews.render_tile(doc_hash, preview_page, level, tile_col, tile_row),
+                    caption=f"Page {preview_page} — tile {tile_col + 1},{tile_row + 1} at {grid['zoom']:g}x"
+                )
         except Exception:
             st.info("Could not render page preview.")
 
         # Drawing Index and CSV download (derived from canonical pages)
         st.subheader("Drawing Index")
-        index = generate_index(pages)
+        index = drawing_index.rows()
         if index:
-            df = pd.DataFrame(index)
-            st.dataframe(df)
+            st.dataframe(index)
 
-            csv_text = index_to_csv(index)
             # ensure bytes for download button to avoid media-store issues
             st.download_button(
                 "⬇️ Download Index CSV",
-                data=csv_text.encode("utf-8"),
+                data=b"".join(iter_index_export(index, "csv")),
                 file_name="drawing_index.csv",
                 mime="text/csv"
             )
@@ -434,19 +488,17 @@ elif menu == "Drawing Analyzer (AEC)":
         st.subheader("📘 Drawing Register")
 
         register = build_register(
-            index=result.get("index", []),
+            index=index,
             project_code="CEAY-001",
             revision="A"
         )
 
         if register:
-            df_reg = pd.DataFrame(register)
-            st.dataframe(df_reg)
+            st.dataframe(register)
 
-            csv = df_reg.to_csv(index=False)
             st.download_button(
                 "⬇️ Download Drawing Register",
-                csv,
+                b"".join(iter_register_export(index, "csv", project_code="CEAY-001", revision="A")),
                 file_name="drawing_register.csv",
                 mime="text/csv"
             )
@@ -456,7 +508,7 @@ elif menu == "Drawing Analyzer (AEC)":
 
         # QA Summary (derived)
         st.subheader("QA Summary")
-        qa = generate_qa(index)
+        qa = drawing_index.qa()
         if qa:
             if qa.get("missing_views"):
                 st.warning(f"Missing views: {', '.join(qa['missing_views'])}")
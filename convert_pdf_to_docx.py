@@ -2,8 +2,14 @@ from pdf2docx import Converter
 import os
 from pathlib import Path
 import argparse
-from typing import Optional
+from typing import Dict, Optional
 import sys
+import hashlib
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
 
 # Configuration
 BASE_DIR = Path(__file__).parent
@@ -12,9 +18,9 @@ DEFAULT_OUTPUT_DIR = BASE_DIR / "docx"
 DEFAULT_PDF_FILE = "Executive Summary_Onshore_3004.pdf"
 DEFAULT_DOCX_FILE = "Executive Summary_Onshore_3004.docx"
 
-# Ensure directories exist
-os.makedirs(DEFAULT_PDF_DIR, exist_ok=True)
-os.makedirs(DEFAULT_OUTPUT_DIR, exist_ok=True)
+# Batch bookkeeping, written next to the converted files by default
+MANIFEST_NAME = ".convert_manifest.jsonl"
+REPORT_NAME = "conversion_report.json"
 
 def convert_pdf_to_docx(pdf_path: str, output_path: str, start: int = 0, end: Optional[int] = None) -> None:
     """Convert a single PDF to DOCX with error handling."""
@@ -26,11 +32,200 @@ def convert_pdf_to_docx(pdf_path: str, output_path: str, start: int = 0, end: Op
     except Exception as e:
         print(f"Error converting {pdf_path}: {e}")
 
-def convert_multiple_pdfs(pdf_dir: Path, output_dir: Path) -> None:
-    """Convert all PDFs in a directory to DOCX files."""
-    for pdf_file in pdf_dir.glob("*.pdf"):
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_manifest(manifest_path: Path) -> Dict[str, dict]:
+    """Latest manifest entry per input file; a torn last line (crash) is ignored."""
+    entries = {}
+    if manifest_path.exists():
+        with open(manifest_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                entries[entry["input"]] = entry
+    return entries
+
+
+def is_up_to_date(pdf_file: Path, output_file: Path, entry: Optional[dict]) -> bool:
+    """True when the manifest shows this exact input was already converted."""
+    if not entry or not output_file.exists() or entry.get("output") != str(output_file):
+        return False
+    stat = pdf_file.stat()
+    if entry.get("mtime") == stat.st_mtime and entry.get("size") == stat.st_size:
+        return True
+    # touched but maybe unchanged: fall back to the content hash
+    return entry.get("sha256") == file_sha256(pdf_file)
+
+
+def _convert_job(pdf_path: str, output_path: str) -> dict:
+    """Worker: convert one file to a temp name, then move it into place."""
+    t0 = time.perf_counter()
+    result = {"input": pdf_path, "output": output_path}
+    partial = output_path + ".part"
+    try:
+        sha256 = file_sha256(Path(pdf_path))
+        stat = os.stat(pdf_path)
+        cv = Converter(pdf_path)
+        try:
+            cv.convert(partial, fancy_table=True)
+        finally:
+            cv.close()
+        os.replace(partial, output_path)
+        result.update(status="converted", sha256=sha256, mtime=stat.st_mtime, size=stat.st_size)
+    except Exception as e:
+        Path(partial).unlink(missing_ok=True)
+        result.update(status="failed", error=f"{type(e).__name__}: {e}")
+    result["seconds"] = round(time.perf_counter() - t0, 3)
+    return result
+
+
+def _run_isolated(job) -> dict:
+    """Rerun one job in its own process, so a crash is attributed to that file."""
+    pool = ProcessPoolExecutor(max_workers=1)
+    try:
+        return pool.submit(_convert_job, *job).result()
+    except BrokenProcessPool:
+        return {"input": job[0], "output": job[1], "status": "failed",
+                "error": "BrokenProcessPool: worker process died", "seconds": 0.0}
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def convert_multiple_pdfs(
+    pdf_dir: Path,
+    output_dir: Path,
+    workers: Optional[int] = None,
+    manifest_path: Optional[Path] = None,
+    report_path: Optional[Path] = None,
+    force: bool = False,
+) -> dict:
+    """
+    Convert all PDFs in a directory to DOCX files on a process pool.
+
+    Every finished conversion is appended to a JSONL manifest (input,
+    sha256, mtime, size, output), so a rerun skips unchanged files and an
+    interrupted run resumes where it stopped. A JSON report with per-file
+    status, timing and errors is written at the end (also on Ctrl+C).
+
+    If a worker process dies (segfault, OOM kill) the pool is recreated:
+    the files that may have been running are retried one at a time in
+    their own process, a file that crashes again is recorded as failed,
+    and the rest of the batch continues.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = manifest_path or output_dir / MANIFEST_NAME
+    report_path = report_path or output_dir / REPORT_NAME
+    manifest = {} if force else load_manifest(manifest_path)
+
+    started = time.perf_counter()
+    files = []
+    jobs = []
+    touched = []
+    for pdf_file in sorted(pdf_dir.glob("*.pdf")):
         output_file = output_dir / f"{pdf_file.stem}.docx"
-        convert_pdf_to_docx(str(pdf_file), str(output_file))
+        entry = manifest.get(str(pdf_file))
+        if is_up_to_date(pdf_file, output_file, entry):
+            files.append({"input": str(pdf_file), "output": str(output_file), "status": "skipped", "seconds": 0.0})
+            mtime = pdf_file.stat().st_mtime
+            if entry.get("mtime") != mtime:
+                # unchanged by hash; record the new mtime so it is not rehashed next run
+                touched.append(dict(entry, mtime=mtime))
+        else:
+            jobs.append((str(pdf_file), str(output_file)))
+
+    workers = workers or os.cpu_count() or 1
+    print(f"{len(jobs)} to convert, {len(files)} unchanged, {workers} workers")
+
+    interrupted = False
+    done = 0
+    with open(manifest_path, "a", encoding="utf-8") as manifest_file:
+        for entry in touched:
+            manifest_file.write(json.dumps(entry) + "\n")
+        manifest_file.flush()
+
+        def record(result):
+            nonlocal done
+            done += 1
+            files.append(result)
+            if result["status"] == "converted":
+                entry = {k: result[k] for k in ("input", "sha256", "mtime", "size", "output")}
+                entry["converted_at"] = datetime.now(timezone.utc).isoformat()
+                manifest_file.write(json.dumps(entry) + "\n")
+                manifest_file.flush()
+                print(f"[{done}/{len(jobs)}] Converted {result['input']} ({result['seconds']}s)")
+            else:
+                print(f"[{done}/{len(jobs)}] Error converting {result['input']}: {result['error']}")
+
+        pending = jobs
+        try:
+            while pending:
+                pool = ProcessPoolExecutor(max_workers=workers)
+                futures = [pool.submit(_convert_job, *job) for job in pending]
+                recorded = set()
+                broken = False
+                try:
+                    for future in as_completed(futures):
+                        try:
+                            result = future.result()
+                        except BrokenProcessPool:
+                            broken = True
+                            break
+                        recorded.add(future)
+                        record(result)
+                except KeyboardInterrupt:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    raise
+                pool.shutdown(wait=True, cancel_futures=True)
+
+                if not broken:
+                    break
+
+                unfinished = []
+                for job, future in zip(pending, futures):
+                    if future in recorded:
+                        continue
+                    if future.done() and not future.cancelled() and future.exception() is None:
+                        record(future.result())
+                    else:
+                        unfinished.append(job)
+
+                # jobs are dispatched in order, so only the first workers + 1
+                # unfinished ones can have been running when the pool broke
+                suspects = unfinished[:workers + 1]
+                print(f"A worker process died; retrying {len(suspects)} file(s) one at a time")
+                for job in suspects:
+                    record(_run_isolated(job))
+                pending = unfinished[workers + 1:]
+        except KeyboardInterrupt:
+            interrupted = True
+            print("Interrupted; rerun to resume from the manifest.")
+
+    report = {
+        "finished_at": datetime.now(timezone.utc).isoformat(),
+        "seconds": round(time.perf_counter() - started, 3),
+        "workers": workers,
+        "interrupted": interrupted,
+        "total": len(jobs) + sum(1 for f in files if f["status"] == "skipped"),
+        "converted": sum(1 for f in files if f["status"] == "converted"),
+        "skipped": sum(1 for f in files if f["status"] == "skipped"),
+        "failed": sum(1 for f in files if f["status"] == "failed"),
+        "files": [
+            {k: f.get(k) for k in ("input", "output", "status", "seconds", "error") if k in f}
+            for f in files
+        ],
+    }
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {report_path}")
+    return report
 
 def create_executable() -> None:
     """Guide users to create an executable."""
@@ -45,7 +240,11 @@ def main(pdf_input: str = str(DEFAULT_PDF_DIR / DEFAULT_PDF_FILE),
          start_page: int = 0,
          end_page: Optional[int] = None,
          batch: bool = False,
-         executable: bool = False) -> None:
+         executable: bool = False,
+         workers: Optional[int] = None,
+         manifest: Optional[str] = None,
+         report: Optional[str] = None,
+         force: bool = False) -> None:
     """Main function to handle conversion with command-line arguments."""
     if executable:
         create_executable()
@@ -53,7 +252,14 @@ def main(pdf_input: str = str(DEFAULT_PDF_DIR / DEFAULT_PDF_FILE),
     pdf_path = Path(pdf_input)
     
     if batch and pdf_path.is_dir():
-        convert_multiple_pdfs(pdf_path, Path(output).parent)
+        convert_multiple_pdfs(
+            pdf_path,
+            Path(output).parent,
+            workers=workers,
+            manifest_path=Path(manifest) if manifest else None,
+            report_path=Path(report) if report else None,
+            force=force,
+        )
     elif pdf_path.is_file():
         convert_pdf_to_docx(pdf_input, output, start_page, end_page)
     else:
@@ -67,6 +273,16 @@ if __name__ == "__main__":
     parser.add_argument("--end", type=int, help="Ending page number (inclusive, None for all)")
     parser.add_argument("--batch", action="store_true", help="Process all PDFs in a directory")
     parser.add_argument("--executable", action="store_true", help="Get instructions to create a standalone executable")
-    
+    parser.add_argument("--workers", type=int, help="Batch: number of conversion processes (default: all cores)")
+    parser.add_argument("--manifest", help=f"Batch: manifest file (default: <output dir>/{MANIFEST_NAME})")
+    parser.add_argument("--report", help=f"Batch: JSON report file (default: <output dir>/{REPORT_NAME})")
+    parser.add_argument("--force", action="store_true", help="Batch: reconvert files already in the manifest")
+
     args = parser.parse_args()
-    main(args.input, args.output, args.start, args.end, args.batch, args.executable)
\ No newline at end of file
+
+    # Ensure directories exist
+    os.makedirs(DEFAULT_PDF_DIR, exist_ok=True)
+    os.makedirs(DEFAULT_OUTPUT_DIR, exist_ok=True)
+
+    main(args.input, args.output, args.start, args.end, args.batch, args.executable,
+         args.workers, args.manifest, args.report, args.force)
\ No newline at end of file
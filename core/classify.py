@@ -1,12 +1,110 @@
-import fitz  # PyMuPDF
-from io import BytesIO
+import os
+from typing import Dict, Any, Optional, Union
 
-def classify_pdf(pdf_bytes: bytes) -> dict:
-    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+from utils.pdf import DocumentContext, open_context, sample_page_numbers
 
-    text_len = sum(len(page.get_text().strip()) for page in doc)
-    image_count = sum(len(page.get_images()) for page in doc)
+# Pages inspected by the fast (sampling) mode
+SAMPLE_PAGES = int(os.environ.get("CEAYDOCS_CLASSIFY_SAMPLE_PAGES", "20"))
 
+
+def page_type(text_len: int, image_count: int) -> str:
+    """Type of a single page: scanned, vector, hybrid or empty."""
+    if image_count > 0 and text_len == 0:
+        return "scanned"
+    if image_count == 0 and text_len > 0:
+        return "vector"
+    if image_count > 0:
+        return "hybrid"
+    return "empty"
+
+
+def _page_flags(page_num: int, text_len: int, image_count: int) -> Dict[str, Any]:
+    return {
+        "page": page_num,
+        "type": page_type(text_len, image_count),
+        "has_text": text_len > 0,
+        "has_images": image_count > 0,
+    }
+
+
+def classify_pdf(
+    source: Union[bytes, DocumentContext],
+    fast: bool = False,
+    max_pages: Optional[int] = None,
+    page_types: bool = False,
+) -> dict:
+    """
+    Decide whether a PDF is scanned, vector or hybrid.
+
+    fast: inspect at most `max_pages` (default SAMPLE_PAGES) evenly spread
+        pages and stop as soon as both text and images have been seen,
+        since the verdict is then certainly "hybrid". The result gains
+        `sampled_pages`; a scanned/vector verdict is an estimate from
+        the sample.
+    page_types: also return `page_types`, one {page, type, has_text,
+        has_images} entry per inspected page.
+    """
+    if not fast:
+        return _classify_all(source, page_types)
+
+    ctx, owned = open_context(source)
+    try:
+        page_count = ctx.page_count
+        text_len = 0
+        image_count = 0
+        flags = []
+        inspected = 0
+
+        for page_num in sample_page_numbers(page_count, max_pages or SAMPLE_PAGES):
+            if ctx.has_text:
+                info = ctx.page(page_num)
+                page_text_len, page_images = len(info["text"].strip()), info["image_count"]
+            else:
+                page = ctx.doc[page_num - 1]
+                page_images = len(page.get_images())
+                page_text_len = len(page.get_text("text").strip())
+
+            inspected += 1
+            text_len += page_text_len
+            image_count += page_images
+            if page_types:
+                flags.append(_page_flags(page_num, page_text_len, page_images))
+
+            if text_len and image_count:
+                break
+    finally:
+        if owned:
+            ctx.close()
+
+    result = classify_from_stats(text_len, image_count, page_count)
+    result["sampled_pages"] = inspected
+    if page_types:
+        result["page_types"] = flags
+    return result
+
+
+def _classify_all(source: Union[bytes, DocumentContext], page_types: bool) -> dict:
+    ctx, owned = open_context(source)
+    try:
+        text_len = sum(len(p["text"].strip()) for p in ctx.pages)
+        image_count = sum(p["image_count"] for p in ctx.pages)
+        page_count = ctx.page_count
+        flags = [
+            _page_flags(p["page"], len(p["text"].strip()), p["image_count"])
+            for p in ctx.pages
+        ] if page_types else None
+    finally:
+        if owned:
+            ctx.close()
+
+    result = classify_from_stats(text_len, image_count, page_count)
+    if page_types:
+        result["page_types"] = flags
+    return result
+
+
+def classify_from_stats(text_len: int, image_count: int, page_count: int) -> dict:
+    """Build the classify_pdf verdict from already-collected page totals."""
     if image_count > 0 and text_len == 0:
         pdf_type = "scanned"
     elif image_count == 0 and text_len > 0:
@@ -16,7 +114,7 @@ def classify_pdf(pdf_bytes: bytes) -> dict:
 
     return {
         "pdf_type": pdf_type,
-        "pages": len(doc),
+        "pages": page_count,
         "has_text": text_len > 0,
         "has_images": image_count > 0,
     }
@@ -1,12 +1,17 @@
-from core.classify import classify_pdf
+from core.classify import classify_pdf, classify_from_stats
 from services.view_classifier import classify_pdf_views
-from services.view_splitter import split_views_into_pdfs
+from services.view_splitter import split_views_to_store
 from services.scale_detector import detect_scales
 from services.drawing_index import generate_index, generate_qa, index_to_csv
-from typing import Dict, Any, List, Union
+from services.parallel_analyzer import analyze_page, analyze_pages_parallel, DEFAULT_CHUNK_SIZE
+from utils.cache import hash_bytes
+from utils.files import ScratchStore, get_default_scratch_store
+from utils.pdf import DocumentContext
+from typing import ContextManager, Dict, Any, Iterator, List, Optional, Tuple, Union
 import logging
 import io
 import traceback
+from contextlib import nullcontext
 
 logger = logging.getLogger(__name__)
 
@@ -24,19 +29,38 @@ def _read_bytes(input_obj: Union[bytes, io.IOBase]) -> bytes:
     raise TypeError("input must be bytes or a file-like object with read()")
 
 
-def analyze_drawing(pdf_input: Union[bytes, io.IOBase]) -> Dict[str, Any]:
+def analyze_drawing(
+    pdf_input: Union[bytes, io.IOBase, DocumentContext],
+    parallel: bool = False,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    store: Optional[ScratchStore] = None,
+    lock: Optional[ContextManager] = None,
+) -> Dict[str, Any]:
     """
     Analyze an engineering drawing PDF and return a consolidated report.
 
+    With parallel=True, view classification and scale detection run in a
+    process pool over chunks of `chunk_size` pages using `workers`
+    processes (default: CPU count). Output order matches the serial path.
+
     The report includes:
     - classification: result from classify_pdf(...)
     - summary: counts of view types grouped by detected scale
     - pages: list of page-level info {page, view_type, confidence, scale}
-    - split_pdfs: mapping of split file names -> bytes (as returned by split_views_into_pdfs)
-    - files: list of split file names (keys of split_pdfs)
+    - split_files: mapping of view name -> handle {file_id, name, pages, size}
+      for the per-view PDFs written to the scratch store (see split_views_to_store)
+    - files: list of split file names (keys of split_files)
     - errors: list of error messages captured during processing
+
+    An open DocumentContext is used as-is and left open for the caller.
+    When the context is shared, pass its `lock`: it is held only while
+    the document handle is read, not while the parallel workers run.
     """
     errors: List[str] = []
+    if isinstance(pdf_input, DocumentContext):
+        return _analyze_context(pdf_input, errors, parallel, workers, chunk_size, store, lock)
+
     try:
         pdf_bytes = _read_bytes(pdf_input)
     except Exception as exc:
@@ -46,15 +70,64 @@ def analyze_drawing(pdf_input: Union[bytes, io.IOBase]) -> Dict[str, Any]:
             "classification": {},
             "summary": {},
             "pages": [],
-            "split_pdfs": {},
+            "split_files": {},
             "files": [],
             "errors": [f"Failed to read input: {exc}", tb],
         }
 
+    # open the document once; every stage reads from the shared context
+    try:
+        ctx = DocumentContext(pdf_bytes)
+    except Exception as exc:
+        tb = traceback.format_exc()
+        logger.exception("Failed to open pdf")
+        return {
+            "classification": {},
+            "summary": {},
+            "pages": [],
+            "split_files": {},
+            "files": [],
+            "errors": [f"Failed to open PDF: {exc}", tb],
+        }
+
+    try:
+        return _analyze_context(ctx, errors, parallel, workers, chunk_size, store)
+    finally:
+        ctx.close()
+
+
+def _run_parallel_stages(
+    pdf_bytes: bytes,
+    page_count: int,
+    workers: Optional[int],
+    chunk_size: int,
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Classify views and detect scales in a process pool (workers open their own handles)."""
+    page_results = analyze_pages_parallel(
+        pdf_bytes,
+        page_count,
+        workers=workers,
+        chunk_size=chunk_size,
+    )
+
+    classification = classify_from_stats(
+        sum(r["text_len"] for r in page_results),
+        sum(r["image_count"] for r in page_results),
+        page_count,
+    )
+    views = [r["view"] for r in page_results]
+    scales = [{"page": r["page"], "scale": r["scale"]} for r in page_results]
+    return classification, views, scales
+
+
+def _run_serial_stages(
+    ctx: DocumentContext,
+    errors: List[str],
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]], List[Dict[str, Any]]]:
     # call services defensively
     classification = {}
     try:
-        classification = classify_pdf(pdf_bytes) or {}
+        classification = classify_pdf(ctx) or {}
     except Exception as exc:
         tb = traceback.format_exc()
         logger.exception("classify_pdf failed")
@@ -63,7 +136,7 @@ def analyze_drawing(pdf_input: Union[bytes, io.IOBase]) -> Dict[str, Any]:
 
     views: List[Dict[str, Any]] = []
     try:
-        raw_views = classify_pdf_views(pdf_bytes)
+        raw_views = classify_pdf_views(ctx)
         if raw_views:
             views = list(raw_views)
     except Exception as exc:
@@ -74,7 +147,7 @@ def analyze_drawing(pdf_input: Union[bytes, io.IOBase]) -> Dict[str, Any]:
 
     scales: List[Dict[str, Any]] = []
     try:
-        raw_scales = detect_scales(pdf_bytes)
+        raw_scales = detect_scales(ctx)
         if raw_scales:
             scales = list(raw_scales)
     except Exception as exc:
@@ -83,17 +156,65 @@ def analyze_drawing(pdf_input: Union[bytes, io.IOBase]) -> Dict[str, Any]:
         errors.append(f"detect_scales error: {exc}")
         errors.append(tb)
 
-    split_pdfs: Dict[str, bytes] = {}
+    return classification, views, scales
+
+
+def _analyze_context(
+    ctx: DocumentContext,
+    errors: List[str],
+    parallel: bool = False,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    store: Optional[ScratchStore] = None,
+    lock: Optional[ContextManager] = None,
+) -> Dict[str, Any]:
+    lock = lock or nullcontext()
+    stages = None
+    if parallel:
+        with lock:
+            page_count = ctx.page_count
+        try:
+            stages = _run_parallel_stages(ctx.pdf_bytes, page_count, workers, chunk_size)
+        except Exception as exc:
+            tb = traceback.format_exc()
+            logger.exception("parallel analysis failed, falling back to serial")
+            errors.append(f"parallel analysis error: {exc}")
+            errors.append(tb)
+
+    with lock:
+        if stages is None:
+            stages = _run_serial_stages(ctx, errors)
+
+        classification, views, scales = stages
+        split_files = _split_to_store(ctx, views, store, errors)
+    return _build_report(classification, views, scales, split_files, errors)
+
+
+def _split_to_store(
+    ctx: DocumentContext,
+    views: List[Dict[str, Any]],
+    store: Optional[ScratchStore],
+    errors: List[str],
+) -> Dict[str, Dict[str, Any]]:
+    split_files: Dict[str, Dict[str, Any]] = {}
     try:
-        sp = split_views_into_pdfs(pdf_bytes) or {}
-        # ensure bytes values
-        split_pdfs = {str(k): (v if isinstance(v, (bytes, bytearray)) else _read_bytes(v)) for k, v in sp.items()}
+        store = store or get_default_scratch_store()
+        split_files = split_views_to_store(ctx, store, hash_bytes(ctx.pdf_bytes), views or None) or {}
     except Exception as exc:
         tb = traceback.format_exc()
-        logger.exception("split_views_into_pdfs failed")
-        errors.append(f"split_views_into_pdfs error: {exc}")
+        logger.exception("split_views_to_store failed")
+        errors.append(f"split_views_to_store error: {exc}")
         errors.append(tb)
+    return split_files
 
+
+def _build_report(
+    classification: Dict[str, Any],
+    views: List[Dict[str, Any]],
+    scales: List[Dict[str, Any]],
+    split_files: Dict[str, Dict[str, Any]],
+    errors: List[str],
+) -> Dict[str, Any]:
     # Build a map of page -> scale for quick lookup
     scale_map: Dict[int, Any] = {}
     for s in scales:
@@ -145,8 +266,8 @@ def analyze_drawing(pdf_input: Union[bytes, io.IOBase]) -> Dict[str, Any]:
         "classification": classification,
         "summary": summary,
         "pages": enriched_pages,
-        "split_pdfs": split_pdfs,
-        "files": list(split_pdfs.keys()),
+        "split_files": split_files,
+        "files": list(split_files.keys()),
         "index": index,
         "qa": qa,
     }
@@ -162,3 +283,63 @@ def analyze_drawing(pdf_input: Union[bytes, io.IOBase]) -> Dict[str, Any]:
 
     return result
 
+
+
+def iter_analysis(
+    pdf_input: Union[bytes, io.IOBase],
+    store: Optional[ScratchStore] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Analyze page by page, yielding progress records as soon as each is known:
+
+    - {"type": "page", page, page_count, view_type, confidence, scale} per page
+    - {"type": "summary", ...analyze_drawing report...} once at the end
+    """
+    errors: List[str] = []
+    try:
+        ctx = DocumentContext(_read_bytes(pdf_input))
+    except Exception as exc:
+        logger.exception("Failed to open pdf")
+        yield {"type": "summary", **_build_report({}, [], [], {}, [f"Failed to open PDF: {exc}"])}
+        return
+
+    try:
+        page_count = ctx.page_count
+        views: List[Dict[str, Any]] = []
+        scales: List[Dict[str, Any]] = []
+        text_len = 0
+        image_count = 0
+
+        for i, page in enumerate(ctx.doc):
+            try:
+                r = analyze_page(page, i + 1)
+            except Exception as exc:
+                logger.exception("page %s analysis failed", i + 1)
+                errors.append(f"page {i + 1} error: {exc}")
+                r = {
+                    "page": i + 1,
+                    "view": {"page": i + 1, "view_type": "UNKNOWN", "confidence": None},
+                    "scale": "Unknown",
+                    "text_len": 0,
+                    "image_count": 0,
+                }
+
+            views.append(r["view"])
+            scales.append({"page": r["page"], "scale": r["scale"]})
+            text_len += r["text_len"]
+            image_count += r["image_count"]
+
+            yield {
+                "type": "page",
+                "page": r["page"],
+                "page_count": page_count,
+                "view_type": r["view"]["view_type"],
+                "confidence": r["view"].get("confidence"),
+                "scale": r["scale"],
+            }
+
+        classification = classify_from_stats(text_len, image_count, page_count)
+        split_files = _split_to_store(ctx, views, store, errors)
+        yield {"type": "summary", **_build_report(classification, views, scales, split_files, errors)}
+    finally:
+        ctx.close()
@@ -0,0 +1,202 @@
+# services/document_store.py
+import os
+import threading
+import time
+from collections import OrderedDict
+from io import BytesIO
+from typing import Dict, Any, List, Optional
+
+from PyPDF2 import PdfReader
+
+from utils.cache import hash_bytes
+from utils.pdf import DocumentContext
+
+# Defaults (override with environment variables)
+MAX_DOCUMENTS = int(os.environ.get("CEAYDOCS_DOCUMENTS_MAX", "8"))
+MAX_DOCUMENT_BYTES = int(os.environ.get("CEAYDOCS_DOCUMENTS_MAX_BYTES", 1024 * 1024 * 1024))
+IDLE_SECONDS = int(os.environ.get("CEAYDOCS_DOCUMENTS_IDLE_SECONDS", 30 * 60))
+
+
+class StoredDocument:
+    """
+    One uploaded PDF kept in memory with lazily opened parsed handles.
+
+    Hold `lock` while using `context` or `reader`: PyMuPDF and PyPDF2
+    handles are not safe to share between threads.
+    """
+
+    def __init__(self, document_id: str, name: str, data: bytes):
+        self.id = document_id
+        self.name = name
+        self.data = data
+        self.size = len(data)
+        self.created_at = time.time()
+        self.last_used = time.monotonic()
+        self.lock = threading.RLock()
+
+        self._context: Optional[DocumentContext] = None
+        self._reader: Optional[PdfReader] = None
+
+    @property
+    def context(self) -> DocumentContext:
+        """PyMuPDF handle plus the cached per-page text pass."""
+        if self._context is None:
+            self._context = DocumentContext(self.data)
+        return self._context
+
+    @property
+    def reader(self) -> PdfReader:
+        """PyPDF2 reader, for page-level copying (split)."""
+        if self._reader is None:
+            self._reader = PdfReader(BytesIO(self.data))
+        return self._reader
+
+    def open(self) -> None:
+        """Parse both handles now; raises ValueError when the data is not a readable PDF."""
+        with self.lock:
+            try:
+                self.context
+                len(self.reader.pages)
+            except Exception as exc:
+                self.close()
+                raise ValueError(f"Not a readable PDF: {exc}") from exc
+
+    @property
+    def page_count(self) -> int:
+        return self.context.page_count
+
+    def info(self) -> Dict[str, Any]:
+        with self.lock:
+            pages = self.page_count
+        return {
+            "document_id": self.id,
+            "name": self.name,
+            "size": self.size,
+            "pages": pages,
+        }
+
+    def close(self) -> None:
+        with self.lock:
+            if self._context is not None:
+                self._context.close()
+            self._context = None
+            self._reader = None
+
+
+class DocumentStore:
+    """
+    Uploaded documents by id, in a bounded LRU.
+
+    The id is the SHA-256 of the bytes, so re-uploading a document returns
+    the existing entry and result-cache keys line up with the upload
+    endpoints. Entries are evicted when idle for `idle_seconds`, or least
+    recently used first once `max_documents` or `max_bytes` is exceeded.
+    """
+
+    def __init__(
+        self,
+        max_documents: int = MAX_DOCUMENTS,
+        max_bytes: int = MAX_DOCUMENT_BYTES,
+        idle_seconds: int = IDLE_SECONDS,
+    ):
+        self.max_documents = max_documents
+        self.max_bytes = max_bytes
+        self.idle_seconds = idle_seconds
+
+        self._docs: "OrderedDict[str, StoredDocument]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def add(self, data: bytes, name: str = "document.pdf") -> StoredDocument:
+        """
+        Store a PDF and return its entry. New documents are parsed before
+        they are inserted, so a file that is too large or not a readable
+        PDF raises ValueError without evicting anything.
+        """
+        if len(data) > self.max_bytes:
+            raise ValueError("Document exceeds the document store size limit")
+
+        document_id = hash_bytes(data)
+        candidate = None
+        if document_id not in self._docs:
+            candidate = StoredDocument(document_id, name, data)
+            candidate.open()
+
+        evicted: List[StoredDocument] = []
+        with self._lock:
+            entry = self._docs.get(document_id)
+            if entry is None:
+                entry, candidate = candidate or StoredDocument(document_id, name, data), None
+                self._docs[document_id] = entry
+                self._bytes += entry.size
+            entry.last_used = time.monotonic()
+            self._docs.move_to_end(document_id)
+            evicted = self._evict(keep=document_id)
+
+        if candidate is not None:
+            # the same bytes were added concurrently; keep the stored entry
+            evicted.append(candidate)
+        for old in evicted:
+            old.close()
+        return entry
+
+    def get(self, document_id: str) -> StoredDocument:
+        """Entry for an id; raises KeyError when unknown or evicted."""
+        evicted: List[StoredDocument] = []
+        with self._lock:
+            evicted = self._evict()
+            entry = self._docs.get(document_id)
+            if entry is not None:
+                entry.last_used = time.monotonic()
+                self._docs.move_to_end(document_id)
+
+        for old in evicted:
+            old.close()
+        if entry is None:
+            raise KeyError(document_id)
+        return entry
+
+    def remove(self, document_id: str) -> bool:
+        with self._lock:
+            entry = self._docs.pop(document_id, None)
+            if entry is not None:
+                self._bytes -= entry.size
+        if entry is None:
+            return False
+        entry.close()
+        return True
+
+    def _evict(self, keep: Optional[str] = None) -> List[StoredDocument]:
+        """Drop idle and over-limit entries; caller holds self._lock and closes them."""
+        evicted = []
+        cutoff = time.monotonic() - self.idle_seconds
+        for document_id, entry in list(self._docs.items()):
+            if entry.last_used < cutoff and document_id != keep:
+                evicted.append(self._docs.pop(document_id))
+                self._bytes -= entry.size
+
+        while len(self._docs) > self.max_documents or self._bytes > self.max_bytes:
+            oldest = next(iter(self._docs))
+            if oldest == keep:
+                break
+            entry = self._docs.pop(oldest)
+            self._bytes -= entry.size
+            evicted.append(entry)
+
+        return evicted
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, document_id: str) -> bool:
+        return document_id in self._docs
+
+
+_default_store: Optional[DocumentStore] = None
+
+
+def get_default_document_store() -> DocumentStore:
+    global _default_store
+    if _default_store is None:
+        _default_store = DocumentStore()
+    return _default_store
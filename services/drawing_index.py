@@ -1,5 +1,6 @@
 # services/drawing_index.py
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Iterable, Set
+from collections import Counter
 import io
 import csv
 
@@ -35,76 +36,64 @@ def normalize_page(p: Dict[str, Any]) -> Dict[str, Any]:
         "scale": scale
     }
 
-def generate_index(pages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """
-    Turn the pages list (from analyzer) into a stable index:
-    [{page, view_type, confidence, scale, status}, ...]
-    """
-    index = []
-    for p in pages:
-        np = normalize_page(p)
-        # status logic
-        if np["confidence"] is None:
-            status = "LOW CONF"  # explicit low confidence
-        elif np["confidence"] < CONFIDENCE_THRESHOLD:
-            status = "LOW CONF"
-        else:
-            status = "OK"
-
-        # Unknown view_type is suspicious
-        if np["view_type"] == "UNKNOWN":
-            status = "REVIEW" if status == "OK" else status
-
-        row = {
-            "page": np["page"],
-            "view_type": np["view_type"],
-            "scale": np["scale"],
-            "confidence": np["confidence"],
-            "status": status
-        }
-        index.append(row)
-    # sort by page number when possible
-    index.sort(key=lambda r: (r["page"] is None, r["page"]))
-    return index
+def index_row(p: Dict[str, Any]) -> Dict[str, Any]:
+    """Build one index row {page, view_type, scale, confidence, status} from a page dict."""
+    np = normalize_page(p)
+    # status logic
+    if np["confidence"] is None:
+        status = "LOW CONF"  # explicit low confidence
+    elif np["confidence"] < CONFIDENCE_THRESHOLD:
+        status = "LOW CONF"
+    else:
+        status = "OK"
+
+    # Unknown view_type is suspicious
+    if np["view_type"] == "UNKNOWN":
+        status = "REVIEW" if status == "OK" else status
 
-def generate_qa(index: List[Dict[str, Any]]) -> Dict[str, Any]:
-    qa: Dict[str, Any] = {
-        "missing_views": [],
-        "scale_issues": [],
-        "low_confidence_pages": []
+    return {
+        "page": np["page"],
+        "view_type": np["view_type"],
+        "scale": np["scale"],
+        "confidence": np["confidence"],
+        "status": status
     }
 
-    seen_views = set()
-    scales_by_view = {}
 
-    for row in index:
-        vt = row["view_type"]
+def _is_low_confidence(row: Dict[str, Any]) -> bool:
+    return row["confidence"] is None or (
+        isinstance(row["confidence"], (int, float))
+        and row["confidence"] < CONFIDENCE_THRESHOLD
+    )
 
-        # Track only real drawing views
-        if vt in REQUIRED_VIEWS:
-            seen_views.add(vt)
 
-        scales_by_view.setdefault(vt, set()).add(row.get("scale", "Unknown"))
-
-        if row["confidence"] is None or (
-            isinstance(row["confidence"], (int, float))
-            and row["confidence"] < CONFIDENCE_THRESHOLD
-        ):
-            qa["low_confidence_pages"].append({
+def _build_qa(
+    seen_views: Set[str],
+    scales_by_view: Dict[str, Iterable[str]],
+    low_conf_rows: Iterable[Dict[str, Any]],
+) -> Dict[str, Any]:
+    qa: Dict[str, Any] = {
+        "missing_views": [],
+        "scale_issues": [],
+        "low_confidence_pages": [
+            {
                 "page": row["page"],
-                "view_type": vt,
+                "view_type": row["view_type"],
                 "confidence": row["confidence"]
-            })
+            }
+            for row in low_conf_rows
+        ]
+    }
 
     # Missing required views
     qa["missing_views"] = [v for v in REQUIRED_VIEWS if v not in seen_views]
 
     # Scale inconsistencies
-    for vt, scales in scales_by_view.items():
+    for vt in sorted(scales_by_view):
         if vt == "UNKNOWN":
             continue
 
-        known_scales = [s for s in scales if s and str(s).lower() != "unknown"]
+        known_scales = [s for s in scales_by_view[vt] if s and str(s).lower() != "unknown"]
         unique_known = sorted(set(known_scales))
 
         if len(unique_known) > 1:
@@ -119,17 +108,128 @@ def generate_qa(index: List[Dict[str, Any]]) -> Dict[str, Any]:
     return qa
 
 
+class DrawingIndex:
+    """
+    Index rows plus the aggregates QA needs (scales per view, seen views,
+    low-confidence pages), kept up to date incrementally.
+
+    apply_override() touches one row and adjusts only the aggregates that
+    row contributes to, so correcting a sheet never rebuilds or re-sorts
+    the whole index.
+    """
+
+    def __init__(self, pages: Iterable[Dict[str, Any]] = ()):
+        self._rows: List[Dict[str, Any]] = [index_row(p) for p in pages]
+        # sort by page number when possible
+        self._rows.sort(key=lambda r: (r["page"] is None, r["page"]))
+
+        self._position: Dict[int, int] = {}
+        self._view_counts: Counter = Counter()
+        self._scales_by_view: Dict[str, Counter] = {}
+        self._low_conf: Set[int] = set()
+
+        for pos, row in enumerate(self._rows):
+            if row["page"] is not None:
+                self._position[row["page"]] = pos
+            self._add(pos, row)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _add(self, pos: int, row: Dict[str, Any]) -> None:
+        vt = row["view_type"]
+        self._view_counts[vt] += 1
+        self._scales_by_view.setdefault(vt, Counter())[row.get("scale", "Unknown")] += 1
+        if _is_low_confidence(row):
+            self._low_conf.add(pos)
+
+    def _remove(self, pos: int, row: Dict[str, Any]) -> None:
+        vt = row["view_type"]
+        self._view_counts[vt] -= 1
+        if self._view_counts[vt] <= 0:
+            del self._view_counts[vt]
+
+        scales = self._scales_by_view[vt]
+        scale = row.get("scale", "Unknown")
+        scales[scale] -= 1
+        if scales[scale] <= 0:
+            del scales[scale]
+        if not scales:
+            del self._scales_by_view[vt]
+
+        self._low_conf.discard(pos)
+
+    def apply_override(self, page: int, changes: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply {view_type, scale, confidence} changes to one page and return the new row."""
+        pos = self._position.get(page)
+        if pos is None:
+            raise KeyError(f"Page {page} is not in the index")
+
+        old = self._rows[pos]
+        new = index_row({**old, **changes, "page": page})
+
+        self._remove(pos, old)
+        self._rows[pos] = new
+        self._add(pos, new)
+        return new
+
+    def rows(self) -> List[Dict[str, Any]]:
+        return list(self._rows)
+
+    def row(self, page: int) -> Dict[str, Any]:
+        return self._rows[self._position[page]]
+
+    def qa(self) -> Dict[str, Any]:
+        seen_views = {vt for vt in self._view_counts if vt in REQUIRED_VIEWS}
+        low_conf_rows = (self._rows[pos] for pos in sorted(self._low_conf))
+        return _build_qa(seen_views, self._scales_by_view, low_conf_rows)
+
+
+def generate_index(pages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Turn the pages list (from analyzer) into a stable index:
+    [{page, view_type, confidence, scale, status}, ...]
+    """
+    return DrawingIndex(pages).rows()
+
+def generate_qa(index: List[Dict[str, Any]]) -> Dict[str, Any]:
+    seen_views = set()
+    scales_by_view = {}
+    low_conf_rows = []
+
+    for row in index:
+        vt = row["view_type"]
+
+        # Track only real drawing views
+        if vt in REQUIRED_VIEWS:
+            seen_views.add(vt)
+
+        scales_by_view.setdefault(vt, set()).add(row.get("scale", "Unknown"))
+
+        if _is_low_confidence(row):
+            low_conf_rows.append(row)
+
+    return _build_qa(seen_views, scales_by_view, low_conf_rows)
+
+
+INDEX_CSV_HEADER = ["page", "view_type", "scale", "confidence", "status"]
+
+
+def index_csv_row(r: Dict[str, Any]) -> List[Any]:
+    return [
+        "" if r["page"] is None else r["page"],
+        r["view_type"],
+        r["scale"],
+        "" if r["confidence"] is None else f"{r['confidence']:.2f}",
+        r["status"]
+    ]
+
+
 def index_to_csv(index: List[Dict[str, Any]]) -> str:
     """Return CSV string for download."""
     output = io.StringIO()
     writer = csv.writer(output)
-    writer.writerow(["page", "view_type", "scale", "confidence", "status"])
+    writer.writerow(INDEX_CSV_HEADER)
     for r in index:
-        writer.writerow([
-            "" if r["page"] is None else r["page"],
-            r["view_type"],
-            r["scale"],
-            "" if r["confidence"] is None else f"{r['confidence']:.2f}",
-            r["status"]
-        ])
+        writer.writerow(index_csv_row(r))
     return output.getvalue()
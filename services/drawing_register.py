@@ -1,5 +1,5 @@
 # services/drawing_register.py
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 from datetime import datetime
 
 def infer_discipline(view_type: str) -> str:
@@ -8,16 +8,17 @@ def infer_discipline(view_type: str) -> str:
         return "STRUCTURAL"
     return "GENERAL"
 
-def build_register(
-    index: List[Dict[str, Any]],
+def iter_register(
+    index: Iterable[Dict[str, Any]],
     project_code: str = "PRJ",
-    revision: str = "A"
-) -> List[Dict[str, Any]]:
+    revision: str = "A",
+    created_on: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
     """
-    Build a formal drawing register from the drawing index.
+    Yield drawing register entries one at a time from the drawing index.
+    The creation date is taken once for the whole register.
     """
-
-    register = []
+    created_on = created_on or datetime.now().strftime("%Y-%m-%d")
 
     for row in index:
         page = row["page"]
@@ -27,18 +28,27 @@ def build_register(
 
         title = f"{view_type.title()} Drawing"
 
-        register.append({
+        yield {
             "drawing_no": drawing_no,
             "title": title,
             "sheet_no": page,
             "view_type": view_type,
             "scale": row["scale"],
             "revision": revision,
-            "status": "FOR REVIEW" if row["status"] != "OK" else "FOR CONSTRUCTION",
+            "status": "FOR REVIEW" if row.get("status", "") != "OK" else "FOR CONSTRUCTION",
             "discipline": infer_discipline(view_type),
             "confidence": row["confidence"],
             "source": "AUTO",
-            "created_on": datetime.now().strftime("%Y-%m-%d")
-        })
+            "created_on": created_on
+        }
 
-    return register
+
+def build_register(
+    index: List[Dict[str, Any]],
+    project_code: str = "PRJ",
+    revision: str = "A"
+) -> List[Dict[str, Any]]:
+    """
+    Build a formal drawing register from the drawing index.
+    """
+    return list(iter_register(index, project_code, revision))
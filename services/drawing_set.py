@@ -0,0 +1,146 @@
+# services/drawing_set.py
+import hashlib
+import logging
+from typing import Dict, Any, Iterable, List, Tuple, Union
+
+import fitz
+
+from services.drawing_index import generate_index, generate_qa
+from services.drawing_register import iter_register
+from services.parallel_analyzer import analyze_page
+
+logger = logging.getLogger(__name__)
+
+
+def page_fingerprint(page: "fitz.Page", text: str) -> str:
+    """
+    Content hash of a sheet: its text, its drawing operators (the page
+    content stream and every Form XObject it uses), its size and the
+    data of every image it places.
+    Identical sheets in different files get the same fingerprint.
+    """
+    h = hashlib.sha256()
+    h.update(text.encode("utf-8"))
+    h.update(b"\0")
+    h.update(page.read_contents())
+    h.update(b"\0")
+    h.update(f"{page.rect.width:.1f}x{page.rect.height:.1f}".encode("ascii"))
+    doc = page.parent
+    for img in page.get_images():
+        # scans of the same size differ only in their image streams
+        h.update(hashlib.sha256(doc.xref_stream_raw(img[0]) or b"").digest())
+    for xobj in page.get_xobjects():
+        # line work wrapped in Form XObjects (show_pdf_page, CAD exports);
+        # get_xobjects already lists nested forms
+        h.update(hashlib.sha256(doc.xref_stream_raw(xobj[0]) or b"").digest())
+    return h.hexdigest()
+
+
+def analyze_drawing_set(
+    documents: Union[Dict[str, bytes], Iterable[Tuple[str, bytes]]],
+    project_code: str = "PRJ",
+    revision: str = "A",
+) -> Dict[str, Any]:
+    """
+    Analyze a package of PDFs as one drawing set.
+
+    Every page is fingerprinted; a sheet repeated in several files is
+    analysed once and recorded as a duplicate of its first occurrence.
+    Unique sheets are numbered 1..N in submission order.
+
+    The report includes:
+    - documents: [{file, pages, unique_sheets, duplicate_sheets}]
+    - sheets: [{sheet, source_file, source_page, view_type, confidence, scale, also_in}]
+    - duplicates: [{source_file, source_page, sheet}]
+    - index / qa: cross-document index (page = sheet number, plus source fields)
+    - register: drawing register with source_file / source_page columns
+    - errors: list of error messages captured during processing
+    """
+    if isinstance(documents, dict):
+        documents = documents.items()
+
+    errors: List[str] = []
+    docs_summary: List[Dict[str, Any]] = []
+    sheets: List[Dict[str, Any]] = []
+    duplicates: List[Dict[str, Any]] = []
+    sheet_by_fingerprint: Dict[str, Dict[str, Any]] = {}
+
+    for filename, pdf_bytes in documents:
+        try:
+            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+        except Exception as exc:
+            logger.exception("Failed to open %s", filename)
+            errors.append(f"{filename}: failed to open PDF: {exc}")
+            continue
+
+        unique = 0
+        repeated = 0
+        with doc:
+            for i, page in enumerate(doc):
+                try:
+                    textpage = page.get_textpage()
+                    text = page.get_text("text", textpage=textpage)
+                    fingerprint = page_fingerprint(page, text)
+                    seen = sheet_by_fingerprint.get(fingerprint)
+
+                    if seen is not None:
+                        repeated += 1
+                        seen["also_in"].append({"file": filename, "page": i + 1})
+                        duplicates.append({
+                            "source_file": filename,
+                            "source_page": i + 1,
+                            "sheet": seen["sheet"],
+                        })
+                        continue
+
+                    r = analyze_page(page, i + 1, text, page.get_text("words", textpage=textpage))
+                except Exception as exc:
+                    logger.exception("%s page %s analysis failed", filename, i + 1)
+                    errors.append(f"{filename} page {i + 1}: {exc}")
+                    continue
+
+                unique += 1
+                sheet = {
+                    "sheet": len(sheets) + 1,
+                    "source_file": filename,
+                    "source_page": i + 1,
+                    "fingerprint": fingerprint,
+                    "view_type": r["view"]["view_type"],
+                    "confidence": r["view"].get("confidence"),
+                    "scale": r["scale"],
+                    "also_in": [],
+                }
+                sheets.append(sheet)
+                sheet_by_fingerprint[fingerprint] = sheet
+
+            docs_summary.append({
+                "file": filename,
+                "pages": len(doc),
+                "unique_sheets": unique,
+                "duplicate_sheets": repeated,
+            })
+
+    # sheets are numbered in order, so index rows line up with `sheets`
+    index = generate_index([{**s, "page": s["sheet"]} for s in sheets])
+    for row, sheet in zip(index, sheets):
+        row["source_file"] = sheet["source_file"]
+        row["source_page"] = sheet["source_page"]
+
+    register = []
+    for entry, sheet in zip(iter_register(index, project_code, revision), sheets):
+        entry["source_file"] = sheet["source_file"]
+        entry["source_page"] = sheet["source_page"]
+        register.append(entry)
+
+    result = {
+        "documents": docs_summary,
+        "sheets": sheets,
+        "duplicates": duplicates,
+        "index": index,
+        "qa": generate_qa(index),
+        "register": register,
+    }
+    if errors:
+        result["errors"] = errors
+
+    return result
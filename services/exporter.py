@@ -0,0 +1,180 @@
+# services/exporter.py
+import csv
+import io
+import tempfile
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List
+
+from services.drawing_index import INDEX_CSV_HEADER, index_csv_row
+from services.drawing_register import iter_register
+
+# Rows per Arrow record batch / rows buffered before a CSV chunk is emitted
+BATCH_SIZE = 10_000
+CSV_CHUNK_ROWS = 500
+
+# Binary exports stay in memory up to this size, then spill to disk
+SPOOL_MAX_BYTES = 16 * 1024 * 1024
+
+INDEX_COLUMNS = [
+    ("page", "int64"),
+    ("view_type", "string"),
+    ("scale", "string"),
+    ("confidence", "float64"),
+    ("status", "string"),
+]
+
+REGISTER_COLUMNS = [
+    ("drawing_no", "string"),
+    ("title", "string"),
+    ("sheet_no", "int64"),
+    ("view_type", "string"),
+    ("scale", "string"),
+    ("revision", "string"),
+    ("status", "string"),
+    ("discipline", "string"),
+    ("confidence", "float64"),
+    ("source", "string"),
+    ("created_on", "string"),
+]
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.file", "arrow"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+}
+
+
+def _batched(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_csv(
+    rows: Iterable[Dict[str, Any]],
+    header: List[str],
+    to_row: Callable[[Dict[str, Any]], List[Any]],
+) -> Iterator[bytes]:
+    """Write CSV a few hundred rows at a time, yielding encoded chunks."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+
+    for batch in _batched(rows, CSV_CHUNK_ROWS):
+        for row in batch:
+            writer.writerow(to_row(row))
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+
+    tail = buffer.getvalue()
+    if tail:
+        yield tail.encode("utf-8")
+
+
+def _arrow_schema(columns):
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise RuntimeError("pyarrow is required for Parquet and Arrow exports.")
+    return pa.schema([(name, getattr(pa, dtype)()) for name, dtype in columns])
+
+
+def write_parquet(rows: Iterable[Dict[str, Any]], columns, out: BinaryIO) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(columns)
+    with pq.ParquetWriter(out, schema) as writer:
+        for batch in _batched(rows, BATCH_SIZE):
+            writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+
+
+def write_arrow_ipc(rows: Iterable[Dict[str, Any]], columns, out: BinaryIO) -> None:
+    import pyarrow as pa
+
+    schema = _arrow_schema(columns)
+    with pa.ipc.new_file(out, schema) as writer:
+        for batch in _batched(rows, BATCH_SIZE):
+            writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+
+
+def write_xlsx(rows: Iterable[Dict[str, Any]], columns, out: BinaryIO) -> None:
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise RuntimeError("openpyxl is required for XLSX exports.")
+
+    # write-only mode streams rows to the archive instead of building cells in memory
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    names = [name for name, _ in columns]
+    ws.append(names)
+    for row in rows:
+        ws.append([row.get(name) for name in names])
+    wb.save(out)
+
+
+_BINARY_WRITERS = {
+    "parquet": write_parquet,
+    "arrow": write_arrow_ipc,
+    "xlsx": write_xlsx,
+}
+
+
+def iter_binary(
+    rows: Iterable[Dict[str, Any]],
+    columns,
+    fmt: str,
+    chunk_size: int = 1024 * 1024,
+) -> Iterator[bytes]:
+    """Write a binary export to a spooled temp file, then yield it in chunks."""
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as out:
+        _BINARY_WRITERS[fmt](rows, columns, out)
+        out.seek(0)
+        while True:
+            chunk = out.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def _check_format(fmt: str) -> None:
+    """Fail before streaming starts on a bad format or a missing optional dependency."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if fmt in ("parquet", "arrow"):
+        _arrow_schema([])
+    elif fmt == "xlsx":
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError:
+            raise RuntimeError("openpyxl is required for XLSX exports.")
+
+
+def iter_index_export(index: Iterable[Dict[str, Any]], fmt: str = "csv") -> Iterator[bytes]:
+    """Stream the drawing index as CSV, Parquet, Arrow IPC or XLSX."""
+    _check_format(fmt)
+    if fmt == "csv":
+        return iter_csv(index, INDEX_CSV_HEADER, index_csv_row)
+    return iter_binary(index, INDEX_COLUMNS, fmt)
+
+
+def iter_register_export(
+    index: Iterable[Dict[str, Any]],
+    fmt: str = "csv",
+    project_code: str = "PRJ",
+    revision: str = "A",
+) -> Iterator[bytes]:
+    """Stream the drawing register built from the index, one row at a time."""
+    _check_format(fmt)
+    register = iter_register(index, project_code, revision)
+    if fmt == "csv":
+        names = [name for name, _ in REGISTER_COLUMNS]
+        return iter_csv(register, names, lambda r: ["" if r[n] is None else r[n] for n in names])
+    return iter_binary(register, REGISTER_COLUMNS, fmt)
@@ -1,5 +1,6 @@
 # services/overrides.py
 from typing import Dict, Any, List
+from services.drawing_index import DrawingIndex
 
 def apply_overrides(
     pages: List[Dict[str, Any]],
@@ -25,3 +26,16 @@ def apply_overrides(
             corrected.append(p)
 
     return corrected
+
+
+def apply_overrides_to_index(
+    index: DrawingIndex,
+    overrides: Dict[int, Dict[str, Any]],
+) -> DrawingIndex:
+    """
+    Apply overrides to an incremental DrawingIndex in place.
+    Only the overridden pages (and the QA aggregates they feed) are touched.
+    """
+    for page_num, changes in overrides.items():
+        index.apply_override(page_num, changes)
+    return index
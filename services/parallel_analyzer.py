@@ -0,0 +1,89 @@
+# services/parallel_analyzer.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+import fitz
+
+from services.view_classifier import classify_text
+from services.scale_detector import detect_page_scale
+
+# Pages handed to a worker per task (tweakable)
+DEFAULT_CHUNK_SIZE = 25
+# Upper bounds accepted from API callers; workers are clamped to the CPUs anyway
+MAX_WORKERS = 64
+MAX_CHUNK_SIZE = 1000
+
+# Per-process document handle, opened once by _init_worker
+_worker_doc = None
+
+
+def _init_worker(pdf_bytes: bytes) -> None:
+    global _worker_doc
+    _worker_doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+
+
+def analyze_page(page, page_num: int, text: Optional[str] = None, words: Optional[list] = None) -> Dict[str, Any]:
+    """
+    Classify one page and detect its scale from a single text extraction.
+    Pass `text` and `words` when the page has already been extracted.
+    """
+    if text is None or words is None:
+        textpage = page.get_textpage()
+        if text is None:
+            text = page.get_text("text", textpage=textpage)
+        if words is None:
+            words = page.get_text("words", textpage=textpage)
+    view = classify_text(text)
+    view["page"] = page_num
+    return {
+        "page": page_num,
+        "view": view,
+        "scale": detect_page_scale(page, full_text=text, words=words) or "Unknown",
+        "text_len": len(text.strip()),
+        "image_count": len(page.get_images()),
+    }
+
+
+def _analyze_chunk(page_range: Tuple[int, int]) -> List[Dict[str, Any]]:
+    start, end = page_range
+    return [analyze_page(_worker_doc[i], i + 1) for i in range(start, end)]
+
+
+def page_chunks(page_count: int, chunk_size: int) -> List[Tuple[int, int]]:
+    """Split [0, page_count) into contiguous (start, end) ranges."""
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    return [
+        (start, min(start + chunk_size, page_count))
+        for start in range(0, page_count, chunk_size)
+    ]
+
+
+def analyze_pages_parallel(
+    pdf_bytes: bytes,
+    page_count: int,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> List[Dict[str, Any]]:
+    """
+    Analyze every page in a process pool, each worker holding its own
+    PyMuPDF handle. Results come back in page order:
+    [{page, view, scale, text_len, image_count}, ...]
+    At most one worker per CPU is started, whatever workers asks for.
+    """
+    cpus = os.cpu_count() or 1
+    chunks = page_chunks(page_count, chunk_size)
+    workers = min(workers or cpus, cpus, len(chunks)) or 1
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(pdf_bytes,),
+    ) as pool:
+        results: List[Dict[str, Any]] = []
+        # map() yields in submission order, so pages stay sorted
+        for chunk in pool.map(_analyze_chunk, chunks):
+            results.extend(chunk)
+
+    return results
@@ -1,5 +1,7 @@
 # services/pdf_to_word.py
 import logging
+from typing import List, Optional, Union
+
 from utils.convert import pdf_to_word as util_pdf_to_word
 
 logger = logging.getLogger(__name__)
@@ -15,12 +17,34 @@ class PdfToWordService:
     
     """
 
-    def execute(self, input_bytes: bytes) -> bytes:
+    def execute(
+        self,
+        input_bytes: bytes,
+        pages: Optional[Union[str, List[int]]] = None,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        parallel: bool = False,
+        workers: Optional[int] = None,
+        engine: str = "auto",
+    ) -> bytes:
+        """
+        pages/start/end select 1-based pages to convert (whole document by
+        default); parallel=True parses page chunks in a process pool.
+        engine: "auto", "fast" (text flow) or "pdf2docx".
+        """
         if not input_bytes:
             raise ValueError("No input bytes provided")
 
         try:
-            result = util_pdf_to_word(input_bytes)
+            result = util_pdf_to_word(
+                input_bytes,
+                pages=pages,
+                start=start,
+                end=end,
+                parallel=parallel,
+                workers=workers,
+                engine=engine,
+            )
             if result is None:
                 raise RuntimeError("Conversion returned no output")
             return result
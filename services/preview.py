@@ -0,0 +1,184 @@
+# services/preview.py
+import math
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+import fitz
+
+from utils.cache import ResultCache, get_default_cache, hash_bytes
+
+# Tile edge in pixels and zoom factors (1.0 = 72 dpi), smallest first
+TILE_SIZE = 256
+ZOOM_LEVELS = [0.25, 0.5, 1.0, 2.0, 4.0]
+
+# Parsed documents kept open for tile rendering
+MAX_OPEN_DOCS = 4
+
+
+class PreviewService:
+    """
+    Deep-zoom style page previews.
+
+    Each page is split into TILE_SIZE tiles at every zoom level. Tiles are
+    rendered lazily, one clip rectangle at a time, and cached by document
+    hash, page, level and tile coordinates, so no full-resolution pixmap of
+    a large sheet is ever built.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[ResultCache] = None,
+        tile_size: int = TILE_SIZE,
+        zoom_levels: Optional[List[float]] = None,
+        max_open_docs: int = MAX_OPEN_DOCS,
+    ):
+        self.cache = cache or get_default_cache()
+        self.tile_size = tile_size
+        self.zoom_levels = list(zoom_levels or ZOOM_LEVELS)
+        self.max_open_docs = max_open_docs
+
+        self._docs: "OrderedDict[str, fitz.Document]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def open(self, pdf_bytes: bytes, doc_hash: Optional[str] = None) -> str:
+        """Keep the document open for rendering and return its hash."""
+        doc_hash = doc_hash or hash_bytes(pdf_bytes)
+        with self._lock:
+            if doc_hash in self._docs:
+                self._docs.move_to_end(doc_hash)
+                return doc_hash
+
+            self._docs[doc_hash] = fitz.open(stream=pdf_bytes, filetype="pdf")
+            while len(self._docs) > self.max_open_docs:
+                _, old = self._docs.popitem(last=False)
+                old.close()
+        return doc_hash
+
+    def _page(self, doc_hash: str, page: int) -> "fitz.Page":
+        doc = self._docs.get(doc_hash)
+        if doc is None:
+            raise KeyError("Document is not open; call open() first")
+        self._docs.move_to_end(doc_hash)
+        if not 1 <= page <= len(doc):
+            raise ValueError(f"Page {page} out of range (1-{len(doc)})")
+        return doc[page - 1]
+
+    def page_count(self, doc_hash: str) -> int:
+        with self._lock:
+            doc = self._docs.get(doc_hash)
+            if doc is None:
+                raise KeyError("Document is not open; call open() first")
+            return len(doc)
+
+    def grid(self, doc_hash: str, page: int, level: int) -> Dict[str, Any]:
+        """Tile layout of one page at one zoom level."""
+        with self._lock:
+            rect = self._page(doc_hash, page).rect
+        return self.page_grid(rect, level)
+
+    def page_grid(self, rect: "fitz.Rect", level: int) -> Dict[str, Any]:
+        """Tile layout of a page rectangle at one zoom level."""
+        zoom = self.zoom_levels[level]
+        width = math.ceil(rect.width * zoom)
+        height = math.ceil(rect.height * zoom)
+        return {
+            "level": level,
+            "zoom": zoom,
+            "width": width,
+            "height": height,
+            "tile_size": self.tile_size,
+            "columns": math.ceil(width / self.tile_size),
+            "rows": math.ceil(height / self.tile_size),
+        }
+
+    def overview_level(self, doc_hash: str, page: int, max_size: int = 1024) -> int:
+        """Highest zoom level at which the whole page fits in max_size pixels."""
+        best = 0
+        for level in range(len(self.zoom_levels)):
+            g = self.grid(doc_hash, page, level)
+            if max(g["width"], g["height"]) <= max_size:
+                best = level
+        return best
+
+    def _tile_key(self, doc_hash: str, page: int, level: int, col: int, row: int) -> str:
+        return ResultCache.make_key(
+            doc_hash,
+            "preview-tile",
+            {"page": page, "level": level, "col": col, "row": row, "tile_size": self.tile_size,
+             "zoom": self.zoom_levels[level]},
+        )
+
+    def _render_tile(self, p: "fitz.Page", g: Dict[str, Any], col: int, row: int) -> bytes:
+        if not (0 <= col < g["columns"] and 0 <= row < g["rows"]):
+            raise ValueError(f"Tile ({col}, {row}) outside {g['columns']}x{g['rows']} grid")
+
+        # tile bounds in page coordinates
+        zoom = g["zoom"]
+        step = self.tile_size / zoom
+        clip = fitz.Rect(
+            p.rect.x0 + col * step,
+            p.rect.y0 + row * step,
+            min(p.rect.x0 + (col + 1) * step, p.rect.x1),
+            min(p.rect.y0 + (row + 1) * step, p.rect.y1),
+        )
+        pix = p.get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=clip)
+        return pix.tobytes("png")
+
+    def render_tile(self, doc_hash: str, page: int, level: int, col: int, row: int) -> bytes:
+        """PNG bytes of one tile, from the cache when available."""
+        key = self._tile_key(doc_hash, page, level, col, row)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        g = self.grid(doc_hash, page, level)
+        with self._lock:
+            png = self._render_tile(self._page(doc_hash, page), g, col, row)
+
+        self.cache.set(key, png)
+        return png
+
+    def render_tile_from_page(
+        self, doc_hash: str, p: "fitz.Page", level: int, col: int, row: int
+    ) -> bytes:
+        """
+        Like render_tile, for a caller that already holds the page (and is
+        responsible for locking its document). Shares the tile cache.
+        """
+        key = self._tile_key(doc_hash, p.number + 1, level, col, row)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        png = self._render_tile(p, self.page_grid(p.rect, level), col, row)
+        self.cache.set(key, png)
+        return png
+
+    def render_page(self, doc_hash: str, page: int, level: int) -> bytes:
+        """PNG of a whole page at one level (use for small overview levels only)."""
+        g = self.grid(doc_hash, page, level)
+        if g["columns"] == 1 and g["rows"] == 1:
+            return self.render_tile(doc_hash, page, level, 0, 0)
+
+        key = ResultCache.make_key(doc_hash, "preview-page", {"page": page, "zoom": g["zoom"]})
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            p = self._page(doc_hash, page)
+            png = p.get_pixmap(matrix=fitz.Matrix(g["zoom"], g["zoom"])).tobytes("png")
+
+        self.cache.set(key, png)
+        return png
+
+
+_default_service: Optional[PreviewService] = None
+
+
+def get_default_preview_service() -> PreviewService:
+    global _default_service
+    if _default_service is None:
+        _default_service = PreviewService()
+    return _default_service
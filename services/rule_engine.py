@@ -1,14 +1,65 @@
 # services/rule_engine.py
-from typing import Dict, Any, List
+import os
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Union
+
+import pandas as pd
+
 from services.rules import RULE_TEMPLATES
+from utils.files import load_structured_file
+
+# Optional JSON/YAML file of extra templates {PROJECT_TYPE: template}; entries
+# replace RULE_TEMPLATES entries of the same name
+RULES_FILE = os.environ.get("CEAYDOCS_RULES_FILE")
+
+
+def compile_rules(template: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a rule template into set-based lookups."""
+    return {
+        "required_views": tuple(template.get("required_views", [])),
+        "allowed_scales": {
+            vt: frozenset(scales)
+            for vt, scales in template.get("allowed_scales", {}).items()
+        },
+        "min_confidence": float(template.get("min_confidence", 0.0)),
+    }
+
+
+def load_rule_templates(path) -> Dict[str, Dict[str, Any]]:
+    data = load_structured_file(path)
+    if not isinstance(data, dict):
+        raise ValueError(f"Rule file must map project types to templates: {path}")
+    return {str(pt).upper(): template for pt, template in data.items()}
+
+
+@lru_cache(maxsize=None)
+def get_compiled_rules(path: Optional[str] = RULES_FILE) -> Dict[str, Dict[str, Any]]:
+    """All rule templates compiled once per process."""
+    templates = dict(RULE_TEMPLATES)
+    if path:
+        templates.update(load_rule_templates(path))
+    return {pt.upper(): compile_rules(t) for pt, t in templates.items()}
+
+
+def _unknown_project_type(project_type: str) -> Dict[str, Any]:
+    return {
+        "status": "UNKNOWN_PROJECT_TYPE",
+        "issues": [f"No rules defined for {project_type}"],
+    }
+
+
+def _confidence(value: Any) -> Optional[float]:
+    """A row's confidence as a float; missing or non-numeric values are None and never flagged."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
 
 def apply_rules(index: List[Dict[str, Any]], project_type: str) -> Dict[str, Any]:
-    rules = RULE_TEMPLATES.get(project_type.upper())
+    rules = get_compiled_rules().get(project_type.upper())
     if not rules:
-        return {
-            "status": "UNKNOWN_PROJECT_TYPE",
-            "issues": [f"No rules defined for {project_type}"],
-        }
+        return _unknown_project_type(project_type)
 
     issues = []
 
@@ -19,13 +70,14 @@ def apply_rules(index: List[Dict[str, Any]], project_type: str) -> Dict[str, Any
             issues.append(f"Missing required view: {rv}")
 
     # Check scales & confidence
+    allowed_scales = rules["allowed_scales"]
     for row in index:
         vt = row["view_type"]
         sc = row["scale"]
-        conf = row["confidence"]
+        conf = _confidence(row["confidence"])
 
-        if vt in rules["allowed_scales"]:
-            if sc not in rules["allowed_scales"][vt]:
+        if vt in allowed_scales:
+            if sc not in allowed_scales[vt]:
                 issues.append(
                     f"Invalid scale on page {row['page']} "
                     f"for {vt}: {sc}"
@@ -40,3 +92,96 @@ def apply_rules(index: List[Dict[str, Any]], project_type: str) -> Dict[str, Any
         "status": "PASS" if not issues else "FAIL",
         "issues": issues,
     }
+
+
+def apply_rules_batch(
+    indexes: Dict[str, List[Dict[str, Any]]],
+    project_types: Union[str, Dict[str, str]],
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Evaluate many drawing indexes in one call.
+
+    indexes: {project_id: index rows}
+    project_types: one project type for all projects, or {project_id: project_type}
+
+    Scale and confidence checks run as column operations over every row of
+    every project at once. Returns {project_id: {status, issues}} with the
+    same issues, in the same order, as apply_rules per project.
+    """
+    compiled = get_compiled_rules()
+    if isinstance(project_types, str):
+        project_types = {pid: project_types for pid in indexes}
+
+    results: Dict[str, Dict[str, Any]] = {}
+    known: Dict[str, str] = {}
+    for pid in indexes:
+        pt = project_types[pid].upper()
+        if pt in compiled:
+            known[pid] = pt
+        else:
+            results[pid] = _unknown_project_type(project_types[pid])
+
+    frames = [
+        pd.DataFrame(indexes[pid], columns=["page", "view_type", "scale", "confidence"], dtype=object)
+        .assign(project=pid)
+        for pid in known
+    ]
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+        columns=["page", "view_type", "scale", "confidence", "project"]
+    )
+    df["project_type"] = df["project"].map(known)
+
+    # (project_type, view_type) pairs that have scale rules, and the allowed triples
+    ruled_views = pd.MultiIndex.from_tuples(
+        [(pt, vt) for pt in set(known.values()) for vt in compiled[pt]["allowed_scales"]]
+        or [("", "")]
+    )
+    allowed = pd.MultiIndex.from_tuples(
+        [
+            (pt, vt, sc)
+            for pt in set(known.values())
+            for vt, scales in compiled[pt]["allowed_scales"].items()
+            for sc in scales
+        ]
+        or [("", "", "")]
+    )
+
+    has_rule = pd.MultiIndex.from_frame(df[["project_type", "view_type"]]).isin(ruled_views)
+    scale_ok = pd.MultiIndex.from_frame(df[["project_type", "view_type", "scale"]]).isin(allowed)
+    invalid_scale = has_rule & ~scale_ok
+
+    min_conf = df["project_type"].map({pt: compiled[pt]["min_confidence"] for pt in set(known.values())})
+    confidence = pd.to_numeric(df["confidence"].map(_confidence), errors="coerce")
+    low_conf = (confidence < min_conf).to_numpy()
+
+    present_views = df.groupby("project", sort=False)["view_type"].agg(set).to_dict()
+
+    issues: Dict[str, List[str]] = {}
+    for pid, pt in known.items():
+        present = present_views.get(pid, set())
+        issues[pid] = [
+            f"Missing required view: {rv}"
+            for rv in compiled[pt]["required_views"]
+            if rv not in present
+        ]
+
+    # only flagged rows are visited in Python
+    flagged_mask = invalid_scale | low_conf
+    flagged = df.loc[flagged_mask, ["project", "page", "view_type", "scale"]]
+    for (pid, page, vt, sc), bad_scale, low in zip(
+        flagged.itertuples(index=False, name=None),
+        invalid_scale[flagged_mask],
+        low_conf[flagged_mask],
+    ):
+        if bad_scale:
+            issues[pid].append(f"Invalid scale on page {page} for {vt}: {sc}")
+        if low:
+            issues[pid].append(f"Low confidence on page {page} ({vt})")
+
+    for pid in known:
+        results[pid] = {
+            "status": "PASS" if not issues[pid] else "FAIL",
+            "issues": issues[pid],
+        }
+
+    return {pid: results[pid] for pid in indexes}
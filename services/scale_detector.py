@@ -1,30 +1,125 @@
 import re
+from typing import Optional, Sequence, Tuple, Union
+
 import fitz
 
+from utils.pdf import DocumentContext, open_context
+
 SCALE_PATTERNS = [
     r"SCALE\s*[:=]?\s*(1\s*[:/]\s*\d+)",
     r"SCALE\s*\(?(1\s*[:/]\s*\d+)\)?",
     r"(1\s*[:/]\s*\d+)"
 ]
 
-def detect_scales(pdf_bytes: bytes):
-    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-    result = []
+COMPILED_SCALE_PATTERNS = [re.compile(p) for p in SCALE_PATTERNS]
+
+# Title block regions as fractions of the page (x0, y0, x1, y1), tried in order:
+# bottom-right block, right-hand strip, bottom strip
+TITLE_BLOCK_REGIONS: Sequence[Tuple[float, float, float, float]] = [
+    (0.60, 0.75, 1.00, 1.00),
+    (0.85, 0.00, 1.00, 1.00),
+    (0.00, 0.90, 1.00, 1.00),
+]
+
+SCALE_MODES = {"title_block", "full"}
+
+
+def detect_scale_in_text(text: str):
+    text = text.upper()
+
+    for pattern in COMPILED_SCALE_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            return match.group(1).replace(" ", "")
+
+    return None
+
+
+def region_rect(page_rect: "fitz.Rect", region: Tuple[float, float, float, float]) -> "fitz.Rect":
+    x0, y0, x1, y1 = region
+    w, h = page_rect.width, page_rect.height
+    return fitz.Rect(
+        page_rect.x0 + x0 * w,
+        page_rect.y0 + y0 * h,
+        page_rect.x0 + x1 * w,
+        page_rect.y0 + y1 * h,
+    )
 
-    for i, page in enumerate(doc):
-        text = page.get_text("text").upper()
-        detected = None
 
-        for pattern in SCALE_PATTERNS:
-            match = re.search(pattern, text)
-            if match:
-                detected = match.group(1).replace(" ", "")
-                break
+def words_in_rect(words, rect: "fitz.Rect") -> str:
+    """Text of the words (PyMuPDF "words" tuples) whose centre lies in rect, in reading order."""
+    return " ".join(
+        w[4] for w in words
+        if rect.contains(fitz.Point((w[0] + w[2]) / 2, (w[1] + w[3]) / 2))
+    )
+
+
+def unrotated_rect(page: "fitz.Page") -> "fitz.Rect":
+    """
+    The page area in the unrotated space word boxes are reported in;
+    page.rect is the rotated (displayed) one.
+    """
+    return fitz.Rect(0, 0, page.cropbox.width, page.cropbox.height)
+
+
+def detect_page_scale(
+    page: "fitz.Page",
+    full_text: Optional[str] = None,
+    regions: Sequence[Tuple[float, float, float, float]] = TITLE_BLOCK_REGIONS,
+    words: Optional[list] = None,
+):
+    """
+    Look for a scale in the title block regions first, then fall back to
+    the full page text. The page is parsed at most once: the regions are
+    filtered from `words` (PyMuPDF "words" output, extracted here when
+    not given) and `full_text` is reused when already extracted.
+    """
+    textpage = None
+    if words is None:
+        textpage = page.get_textpage()
+        words = page.get_text("words", textpage=textpage)
+
+    # regions and word boxes in the same (unrotated) space, so a sheet
+    # with /Rotate set gives the same result as the unrotated page
+    page_rect = unrotated_rect(page)
+    for region in regions:
+        detected = detect_scale_in_text(words_in_rect(words, region_rect(page_rect, region)))
+        if detected:
+            return detected
+
+    if full_text is None:
+        full_text = page.get_text("text", textpage=textpage or page.get_textpage())
+    return detect_scale_in_text(full_text)
+
+
+def detect_scales(
+    source: Union[bytes, DocumentContext],
+    mode: str = "title_block",
+    regions: Optional[Sequence[Tuple[float, float, float, float]]] = None,
+):
+    if mode not in SCALE_MODES:
+        raise ValueError(f"Unknown scale detection mode: {mode}")
+
+    regions = TITLE_BLOCK_REGIONS if regions is None else regions
+    ctx, owned = open_context(source)
+    result = []
+
+    try:
+        for i in range(ctx.page_count):
+            page_num = i + 1
+            if mode == "title_block":
+                # regions and fallback reuse the context's single text pass
+                info = ctx.page(page_num)
+                detected = detect_page_scale(ctx.doc[i], info["text"], regions, info["words"])
+            else:
+                detected = detect_scale_in_text(ctx.page_text(page_num))
 
-        result.append({
-            "page": i + 1,
-            "scale": detected or "Unknown"
-        })
+            result.append({
+                "page": page_num,
+                "scale": detected or "Unknown"
+            })
+    finally:
+        if owned:
+            ctx.close()
 
-    doc.close()
     return result
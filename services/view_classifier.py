@@ -1,38 +1,118 @@
+import os
 import re
-import fitz
+from functools import lru_cache
+from typing import Dict, List, Optional, Union
+
+from utils.files import load_structured_file
+from utils.pdf import DocumentContext, open_context
 
 PLAN_KEYWORDS = ["plan", "floor plan", "layout"]
 SECTION_KEYWORDS = ["section", "sec", "s/s"]
 ELEVATION_KEYWORDS = ["elevation", "front view", "side view"]
 
-def classify_page(page) -> dict:
-    text = page.get_text("text").lower()
+# Order matters: on equal hit counts the earlier view wins
+VIEW_KEYWORDS = {
+    "PLAN": PLAN_KEYWORDS,
+    "SECTION": SECTION_KEYWORDS,
+    "ELEVATION": ELEVATION_KEYWORDS,
+}
+
+# Optional JSON/YAML file of {view_type: [keywords]} replacing VIEW_KEYWORDS
+VIEW_KEYWORDS_FILE = os.environ.get("CEAYDOCS_VIEW_KEYWORDS")
+
+# Each extra hit for the winning view closes this fraction of the remaining gap to 1.0
+HIT_CONFIDENCE_STEP = 0.75
+
+
+class ViewMatcher:
+    """
+    All view keywords compiled into one regex, matched in a single pass
+    over the page text. Keywords only match on word boundaries, so "sec"
+    does not fire inside "secondary".
+    """
+
+    def __init__(self, view_keywords: Dict[str, List[str]]):
+        if not any(view_keywords.values()):
+            raise ValueError("At least one view keyword is required")
+
+        self.views = [v.upper() for v in view_keywords]
+        self._keyword_view: Dict[str, str] = {}
+
+        for view, keywords in view_keywords.items():
+            for k in keywords:
+                # first view to claim a keyword keeps it
+                self._keyword_view.setdefault(_normalize(k), view.upper())
+
+        # longest first so "floor plan" wins over "plan" at the same position
+        alternation = "|".join(
+            r"\s+".join(re.escape(part) for part in k.split())
+            for k in sorted(self._keyword_view, key=len, reverse=True)
+        )
+        self._pattern = re.compile(rf"(?<![a-z0-9])(?:{alternation})(?![a-z0-9])")
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Return {view_type: hits} for every view (zero when absent)."""
+        hits = {view: 0 for view in self.views}
+        for match in self._pattern.finditer(text.lower()):
+            hits[self._keyword_view[_normalize(match.group(0))]] += 1
+        return hits
 
-    def contains(keywords):
-        return any(k in text for k in keywords)
 
-    if contains(PLAN_KEYWORDS):
-        view_type = "PLAN"
-    elif contains(SECTION_KEYWORDS):
-        view_type = "SECTION"
-    elif contains(ELEVATION_KEYWORDS):
-        view_type = "ELEVATION"
+def _normalize(keyword: str) -> str:
+    return " ".join(keyword.lower().split())
+
+
+def load_view_keywords(path) -> Dict[str, List[str]]:
+    data = load_structured_file(path)
+    if not isinstance(data, dict):
+        raise ValueError(f"View keyword file must map view types to keyword lists: {path}")
+    return {str(view).upper(): [str(k) for k in keywords] for view, keywords in data.items()}
+
+
+@lru_cache(maxsize=None)
+def get_matcher(path: Optional[str] = VIEW_KEYWORDS_FILE) -> ViewMatcher:
+    """Compiled matcher for the configured keyword set, built once per process."""
+    keywords = load_view_keywords(path) if path else VIEW_KEYWORDS
+    return ViewMatcher(keywords)
+
+
+def classify_text(text: str, matcher: Optional[ViewMatcher] = None) -> dict:
+    matcher = matcher or get_matcher()
+    hits = matcher.count(text)
+    total = sum(hits.values())
+
+    if total:
+        view_type = max(matcher.views, key=lambda v: hits[v])  # max keeps the first on ties
+        share = hits[view_type] / total
+        confidence = round(share * (1 - (1 - HIT_CONFIDENCE_STEP) ** hits[view_type]), 3)
     else:
         view_type = "UNKNOWN"
+        confidence = 0.0
 
     return {
         "view_type": view_type,
-        "text_snippet": text[:300]
+        "confidence": confidence,
+        "hits": hits,
+        "text_snippet": text[:300].lower()
     }
 
 
-def classify_pdf_views(pdf_bytes: bytes):
-    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+def classify_page(page) -> dict:
+    return classify_text(page.get_text("text"))
+
+
+def classify_pdf_views(source: Union[bytes, DocumentContext]):
+    ctx, owned = open_context(source)
     results = []
+    matcher = get_matcher()
 
-    for i, page in enumerate(doc):
-        page_result = classify_page(page)
-        page_result["page"] = i + 1
-        results.append(page_result)
+    try:
+        for info in ctx.pages:
+            page_result = classify_text(info["text"], matcher)
+            page_result["page"] = info["page"]
+            results.append(page_result)
+    finally:
+        if owned:
+            ctx.close()
 
     return results
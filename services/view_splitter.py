@@ -1,30 +1,104 @@
+import re
 import fitz
 from io import BytesIO
 from collections import defaultdict
+from typing import Union, Optional, List, Dict, Any
 from services.view_classifier import classify_pdf_views
+from utils.files import ScratchStore
+from utils.pdf import DocumentContext, open_context
 
+_SAFE_NAME = re.compile(r"[^a-z0-9_\-]")
 
-def split_views_into_pdfs(pdf_bytes: bytes):
-    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-    view_info = classify_pdf_views(pdf_bytes)
 
+def _group_pages(view_info: List[Dict[str, Any]]) -> Dict[str, List[int]]:
     grouped_pages = defaultdict(list)
 
     for info in view_info:
         grouped_pages[info["view_type"]].append(info["page"] - 1)
 
-    output_pdfs = {}
+    return grouped_pages
 
-    for view_type, pages in grouped_pages.items():
-        out_doc = fitz.open()
 
-        for p in pages:
-            out_doc.insert_pdf(doc, from_page=p, to_page=p)
+def split_views_into_pdfs(
+    source: Union[bytes, DocumentContext],
+    view_info: Optional[List[Dict[str, Any]]] = None,
+):
+    """
+    Group pages by view type and return {view_type: pdf_bytes}.
 
-        buffer = BytesIO()
-        out_doc.save(buffer)
-        buffer.seek(0)
+    Pass `view_info` (output of classify_pdf_views) to reuse an existing
+    classification instead of classifying the document again.
+    """
+    ctx, owned = open_context(source)
 
-        output_pdfs[view_type.lower()] = buffer.read()
+    try:
+        if view_info is None:
+            view_info = classify_pdf_views(ctx)
+
+        grouped_pages = _group_pages(view_info)
+
+        output_pdfs = {}
+
+        for view_type, pages in grouped_pages.items():
+            out_doc = fitz.open()
+
+            for p in pages:
+                out_doc.insert_pdf(ctx.doc, from_page=p, to_page=p)
+
+            buffer = BytesIO()
+            out_doc.save(buffer)
+            out_doc.close()
+            buffer.seek(0)
+
+            output_pdfs[view_type.lower()] = buffer.read()
+    finally:
+        if owned:
+            ctx.close()
 
     return output_pdfs
+
+
+def split_views_to_store(
+    source: Union[bytes, DocumentContext],
+    store: ScratchStore,
+    file_id: str,
+    view_info: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Write one PDF per view type into the scratch store and return handles:
+    {view_type: {file_id, name, pages, size}}
+
+    Each view PDF is saved to disk and closed before the next is built,
+    so only one is held in memory at a time.
+    """
+    ctx, owned = open_context(source)
+
+    try:
+        if view_info is None:
+            view_info = classify_pdf_views(ctx)
+
+        handles = {}
+
+        for view_type, pages in _group_pages(view_info).items():
+            name = _SAFE_NAME.sub("_", view_type.lower())
+            out_doc = fitz.open()
+
+            for p in pages:
+                out_doc.insert_pdf(ctx.doc, from_page=p, to_page=p)
+
+            tmp_path = store.temp_path(file_id, name)
+            out_doc.save(str(tmp_path))
+            out_doc.close()
+            final_path = store.commit(file_id, name, tmp_path)
+
+            handles[name] = {
+                "file_id": file_id,
+                "name": name,
+                "pages": [p + 1 for p in pages],
+                "size": final_path.stat().st_size,
+            }
+    finally:
+        if owned:
+            ctx.close()
+
+    return handles
@@ -0,0 +1,139 @@
+import fitz
+from services.analyzer import analyze_drawing, iter_analysis
+from utils.files import ScratchStore
+from utils.pdf import DocumentContext
+
+
+def _drawing_pdf(texts):
+    doc = fitz.open()
+    for text in texts:
+        page = doc.new_page(width=600, height=400)
+        page.insert_text((50, 100), text)
+    return doc.tobytes()
+
+
+def test_analyze_drawing_single_pass(monkeypatch, tmp_path):
+    pdf_bytes = _drawing_pdf(["GROUND FLOOR PLAN SCALE 1:100", "SECTION A-A SCALE 1:50"])
+
+    opened = []
+    original_init = DocumentContext.__init__
+
+    def counting_init(self, *args, **kwargs):
+        opened.append(1)
+        original_init(self, *args, **kwargs)
+
+    monkeypatch.setattr(DocumentContext, "__init__", counting_init)
+
+    result = analyze_drawing(pdf_bytes, store=ScratchStore(tmp_path))
+
+    assert len(opened) == 1
+    assert [p["view_type"] for p in result["pages"]] == ["PLAN", "SECTION"]
+    assert [p["scale"] for p in result["pages"]] == ["1:100", "1:50"]
+    assert set(result["split_files"]) == {"plan", "section"}
+
+
+def test_split_files_written_to_store(tmp_path):
+    store = ScratchStore(tmp_path)
+    pdf_bytes = _drawing_pdf(["PLAN", "SECTION", "PLAN"])
+
+    result = analyze_drawing(pdf_bytes, store=store)
+
+    plan = result["split_files"]["plan"]
+    assert plan["pages"] == [1, 3]
+    with fitz.open(stream=store.read_bytes(plan["file_id"], "plan"), filetype="pdf") as doc:
+        assert len(doc) == 2
+
+
+def test_document_context_pages():
+    pdf_bytes = _drawing_pdf(["ELEVATION"])
+
+    with DocumentContext(pdf_bytes) as ctx:
+        info = ctx.page(1)
+
+    assert "ELEVATION" in info["text"]
+    assert info["image_count"] == 0
+    assert info["width"] == 600
+
+
+def test_parallel_analysis_matches_serial(tmp_path):
+    texts = ["PLAN 1:100", "SECTION 1:50", "ELEVATION 1:100", "NOTES", "PLAN 1:50"]
+    pdf_bytes = _drawing_pdf(texts)
+
+    serial = analyze_drawing(pdf_bytes, store=ScratchStore(tmp_path))
+    parallel = analyze_drawing(pdf_bytes, parallel=True, workers=2, chunk_size=2, store=ScratchStore(tmp_path))
+
+    assert "errors" not in parallel
+    assert parallel["pages"] == serial["pages"]
+    assert parallel["index"] == serial["index"]
+    assert parallel["qa"] == serial["qa"]
+    assert parallel["classification"] == serial["classification"]
+
+
+def test_shared_context_lock_is_released_while_workers_run(monkeypatch, tmp_path):
+    import threading
+    import services.analyzer as analyzer
+
+    lock = threading.Lock()
+    original = analyzer.analyze_pages_parallel
+
+    def check_unlocked(*args, **kwargs):
+        assert not lock.locked()
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(analyzer, "analyze_pages_parallel", check_unlocked)
+    with DocumentContext(_drawing_pdf(["PLAN 1:100", "SECTION 1:50"])) as ctx:
+        result = analyze_drawing(ctx, parallel=True, workers=1, store=ScratchStore(tmp_path), lock=lock)
+
+    assert "errors" not in result
+    assert [p["view_type"] for p in result["pages"]] == ["PLAN", "SECTION"]
+
+
+def test_iter_analysis_streams_pages_then_summary(tmp_path):
+    pdf_bytes = _drawing_pdf(["PLAN 1:100", "SECTION 1:50", "NOTES"])
+
+    records = list(iter_analysis(pdf_bytes, store=ScratchStore(tmp_path)))
+
+    assert [r["type"] for r in records] == ["page", "page", "page", "summary"]
+    assert [r["page"] for r in records[:3]] == [1, 2, 3]
+
+    summary = {k: v for k, v in records[-1].items() if k != "type"}
+    assert summary == analyze_drawing(pdf_bytes, store=ScratchStore(tmp_path))
+
+
+def test_parallel_workers_are_clamped_to_cpus(monkeypatch):
+    import services.parallel_analyzer as parallel_analyzer
+
+    seen = {}
+
+    class Pool:
+        def __init__(self, max_workers, initializer, initargs):
+            seen["workers"] = max_workers
+            initializer(*initargs)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def map(self, fn, items):
+            return map(fn, items)
+
+    monkeypatch.setattr(parallel_analyzer, "ProcessPoolExecutor", Pool)
+    monkeypatch.setattr(parallel_analyzer.os, "cpu_count", lambda: 2)
+
+    pdf_bytes = _drawing_pdf(["PLAN 1:100"] * 6)
+    pages = parallel_analyzer.analyze_pages_parallel(pdf_bytes, 6, workers=10_000, chunk_size=1)
+
+    assert seen["workers"] == 2
+    assert [p["page"] for p in pages] == [1, 2, 3, 4, 5, 6]
+
+
+def test_analyze_rejects_out_of_range_parallel_settings():
+    from fastapi.testclient import TestClient
+    from api.main import app
+
+    client = TestClient(app)
+    upload = {"file": ("set.pdf", _drawing_pdf(["PLAN 1:100"]), "application/pdf")}
+    for params in ({"workers": 0}, {"workers": 10_000}, {"chunk_size": 0}, {"chunk_size": 10 ** 9}):
+        assert client.post("/drawings/analyze", params=params, files=upload).status_code == 422
@@ -0,0 +1,65 @@
+import os
+import time
+
+import pytest
+from utils.cache import ResultCache, hash_bytes
+
+
+def test_get_or_compute_reuses_result(tmp_path):
+    cache = ResultCache(tmp_path)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return b"output"
+
+    assert cache.get_or_compute(b"input", "compress", {"dpi": 120}, compute) == b"output"
+    assert cache.get_or_compute(b"input", "compress", {"dpi": 120}, compute) == b"output"
+    assert len(calls) == 1
+
+    # a second process sharing the directory sees the disk entry
+    other = ResultCache(tmp_path)
+    assert other.get_or_compute(b"input", "compress", {"dpi": 120}, compute) == b"output"
+    assert len(calls) == 1
+
+    # different parameters are a different entry
+    cache.get_or_compute(b"input", "compress", {"dpi": 150}, compute)
+    assert len(calls) == 2
+
+
+def test_ttl_and_size_eviction(tmp_path):
+    cache = ResultCache(tmp_path, ttl_seconds=0, memory_bytes=0)
+    key = ResultCache.make_key(hash_bytes(b"x"), "extract-text")
+    cache.set(key, "text")
+    time.sleep(0.01)
+    assert cache.get(key) is None
+
+    cache = ResultCache(tmp_path, max_bytes=0, memory_bytes=0)
+    cache.set(key, "text")
+    cache.evict()
+    assert cache.get(key) is None
+
+
+def test_hits_are_copies_and_failed_results_are_not_cached(tmp_path):
+    cache = ResultCache(tmp_path)
+    key = ResultCache.make_key(hash_bytes(b"x"), "drawings-analyze")
+
+    cache.set(key, {"pages": [1, 2], "errors": []})
+    cache.get(key)["pages"].append(3)
+    assert cache.get(key)["pages"] == [1, 2]
+
+    failed = ResultCache.make_key(hash_bytes(b"y"), "drawings-analyze")
+    cache.set(failed, {"pages": [], "errors": ["classify_pdf error"]})
+    assert cache.get(failed) is None
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permissions")
+def test_cache_directory_is_private(tmp_path):
+    import stat
+
+    directory = tmp_path / "cache"
+    directory.mkdir(mode=0o777)
+    os.chmod(directory, 0o777)
+    ResultCache(directory).set(ResultCache.make_key("h", "op"), b"data")
+
+    assert stat.S_IMODE(directory.stat().st_mode) == 0o700
@@ -0,0 +1,42 @@
+import fitz
+from core.classify import classify_pdf, sample_page_numbers
+
+
+def _pdf(page_count, image_pages=(), text_pages=None):
+    png = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 8, 8), False).tobytes("png")
+    doc = fitz.open()
+    for n in range(1, page_count + 1):
+        page = doc.new_page()
+        if text_pages is None or n in text_pages:
+            page.insert_text((50, 100), f"Sheet {n}")
+        if n in image_pages:
+            page.insert_image(fitz.Rect(100, 100, 200, 200), stream=png)
+    return doc.tobytes()
+
+
+def test_sample_page_numbers_spread_over_document():
+    assert sample_page_numbers(3, 5) == [1, 2, 3]
+    assert sample_page_numbers(101, 5) == [1, 26, 51, 76, 101]
+    assert sample_page_numbers(50, 1) == [1]
+
+
+def test_fast_mode_stops_once_text_and_images_seen():
+    pdf = _pdf(101, image_pages={26})
+    result = classify_pdf(pdf, fast=True, max_pages=5, page_types=True)
+
+    assert result["pdf_type"] == "hybrid"
+    assert result["pages"] == 101
+    assert result["sampled_pages"] == 2
+    assert [(p["page"], p["type"]) for p in result["page_types"]] == [(1, "vector"), (26, "hybrid")]
+
+
+def test_fast_mode_matches_full_scan_verdict():
+    pdf = _pdf(30, image_pages=set(range(1, 31)), text_pages=set())
+    fast = classify_pdf(pdf, fast=True, max_pages=4)
+    full = classify_pdf(pdf, page_types=True)
+
+    assert fast["pdf_type"] == full["pdf_type"] == "scanned"
+    assert fast["sampled_pages"] == 4
+    assert "page_types" not in fast
+    assert len(full["page_types"]) == 30
+    assert {p["type"] for p in full["page_types"]} == {"scanned"}
@@ -20,3 +20,221 @@ def test_compress_pdf(tmp_path):
 
     assert output_data is not None
     assert isinstance(output_data, bytes)
+
+
+def test_compress_fallback_parallel_matches_serial():
+    import io
+    import fitz
+    from utils.compress_fallback import compress_pdf_fallback, MIN_PARALLEL_PAGES
+
+    doc = fitz.open()
+    for n in range(MIN_PARALLEL_PAGES + 3):
+        page = doc.new_page(width=300 + n, height=200)
+        page.insert_text((50, 100), f"Sheet {n + 1}")
+    pdf_bytes = doc.tobytes()
+
+    serial = compress_pdf_fallback(io.BytesIO(pdf_bytes), dpi=50, workers=1)
+    parallel = compress_pdf_fallback(io.BytesIO(pdf_bytes), dpi=50, workers=2)
+
+    with fitz.open(stream=serial, filetype="pdf") as a, fitz.open(stream=parallel, filetype="pdf") as b:
+        assert len(a) == len(b) == MIN_PARALLEL_PAGES + 3
+        assert [p.rect for p in a] == [p.rect for p in b]
+        assert b[5].rect.width == 305
+        assert len(b[0].get_images()) == 1
+
+
+def test_image_mode_downsamples_images_and_keeps_text():
+    import io
+    import fitz
+    from utils.compress import compress_pdf
+
+    # 800x800 striped image drawn in a 2-inch box is 400 dpi
+    samples = bytes((x * 37 + y * 11) % 256 for y in range(800) for x in range(800 * 3))
+    photo = fitz.Pixmap(fitz.csRGB, 800, 800, samples, False).tobytes("png")
+
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((50, 50), "GROUND FLOOR PLAN 1:100")
+    page.draw_line((50, 400), (500, 400))
+    page.insert_image(fitz.Rect(100, 100, 244, 244), stream=photo)
+    pdf_bytes = doc.tobytes()
+
+    output = compress_pdf(io.BytesIO(pdf_bytes), mode="images")
+
+    assert len(output) < len(pdf_bytes)
+    with fitz.open(stream=output, filetype="pdf") as out:
+        page = out[0]
+        assert "GROUND FLOOR PLAN" in page.get_text()
+        assert page.get_drawings()
+        (info,) = page.get_image_info()
+        assert info["width"] == 300
+
+
+def test_unknown_compression_mode_rejected():
+    import io
+    from utils.compress import compress_pdf
+
+    with pytest.raises(ValueError):
+        compress_pdf(io.BytesIO(b""), mode="lossless")
+
+
+def _scan_pdf(pages):
+    import fitz
+
+    samples = bytes((x * 37 + y * 11) % 256 for y in range(400) for x in range(400 * 3))
+    scan = fitz.Pixmap(fitz.csRGB, 400, 400, samples, False).tobytes("png")
+    doc = fitz.open()
+    for _ in range(pages):
+        page = doc.new_page(width=150, height=150)
+        page.insert_image(page.rect, stream=scan)
+    return doc.tobytes()
+
+
+def test_presets_and_explicit_settings():
+    from utils.compress import resolve_settings, ghostscript_args
+
+    assert resolve_settings() == (150, 60)
+    assert resolve_settings("extreme") == (100, 25)
+    assert resolve_settings("high", quality=50) == (180, 50)
+    with pytest.raises(ValueError):
+        resolve_settings("tiny")
+    with pytest.raises(ValueError):
+        resolve_settings(dpi=5000)
+    assert "-dColorImageResolution=120" in ghostscript_args(120, 40)
+    assert "-dJPEGQ=40" in ghostscript_args(120, 40)
+
+
+def test_raster_presets_change_output_size():
+    import io
+    from utils.compress import compress_pdf
+
+    pdf_bytes = _scan_pdf(2)
+    high = compress_pdf(io.BytesIO(pdf_bytes), mode="raster", preset="high")
+    extreme = compress_pdf(io.BytesIO(pdf_bytes), mode="raster", preset="extreme")
+    assert len(extreme) < len(high)
+
+
+def test_target_size_picks_settings_from_sample():
+    import io
+    from utils.compress import compress_pdf, estimate_settings_for_size, QUALITY_LADDER
+
+    pdf_bytes = _scan_pdf(10)
+    assert estimate_settings_for_size(pdf_bytes, 10**9) == QUALITY_LADDER[0]
+    assert estimate_settings_for_size(pdf_bytes, 1) == QUALITY_LADDER[-1]
+
+    loose = compress_pdf(io.BytesIO(pdf_bytes), mode="raster", target_size=10**9)
+    tight = compress_pdf(io.BytesIO(pdf_bytes), mode="raster", target_size=1)
+    assert len(tight) < len(loose)
+
+
+def test_target_size_steps_down_when_estimate_is_too_high(monkeypatch):
+    import io
+    import utils.compress as compress
+
+    pdf_bytes = _scan_pdf(2)
+    sizes = [len(compress.compress_pdf(io.BytesIO(pdf_bytes), mode="raster", dpi=d, quality=q))
+             for d, q in compress.QUALITY_LADDER]
+    target = sizes[3]
+
+    # a bad estimate picks the first rung; the real output is checked afterwards
+    monkeypatch.setattr(compress, "estimate_settings_for_size", lambda *a: compress.QUALITY_LADDER[0])
+    output = compress.compress_pdf(io.BytesIO(pdf_bytes), mode="raster", target_size=target)
+    assert len(output) <= target
+
+
+@pytest.mark.skipif(not HAS_GS, reason="Ghostscript not installed.")
+def test_ghostscript_chunked_keeps_page_order(monkeypatch):
+    import io
+    import fitz
+    import utils.compress as compress
+
+    monkeypatch.setattr(compress, "GS_PIPE_MAX_PAGES", 4)
+    monkeypatch.setattr(compress, "GS_CHUNK_PAGES", 3)
+
+    doc = fitz.open()
+    for n in range(10):
+        doc.new_page().insert_text((50, 100), f"Sheet {n + 1}")
+
+    output = compress.compress_pdf(io.BytesIO(doc.tobytes()), mode="ghostscript")
+    with fitz.open(stream=output, filetype="pdf") as out:
+        assert [p.get_text().strip() for p in out] == [f"Sheet {n + 1}" for n in range(10)]
+
+
+def test_chunk_merge_restores_outline_and_cross_chunk_links(tmp_path):
+    import fitz
+    from utils.compress import _merge_chunks
+
+    doc = fitz.open()
+    for n in range(6):
+        doc.new_page().insert_text((50, 100), f"Sheet {n + 1}")
+    doc[0].insert_link({"kind": fitz.LINK_GOTO, "from": fitz.Rect(50, 80, 150, 110), "page": 4, "to": fitz.Point(0, 0)})
+    doc.set_toc([[1, "Plans", 1], [2, "Sheet 5", 5]])
+    pdf_bytes = doc.tobytes()
+
+    # stand-ins for Ghostscript chunk output: pages only, no outline or links
+    ranges = [(1, 3), (4, 6)]
+    parts = []
+    for index, (first, last) in enumerate(ranges):
+        part = fitz.open()
+        part.insert_pdf(doc, from_page=first - 1, to_page=last - 1, links=False)
+        part.set_toc([])
+        path = tmp_path / f"part-{index}.pdf"
+        part.save(path)
+        parts.append(str(path))
+
+    with fitz.open(stream=_merge_chunks(pdf_bytes, parts, ranges), filetype="pdf") as out:
+        assert [t[:3] for t in out.get_toc()] == [[1, "Plans", 1], [2, "Sheet 5", 5]]
+        assert [link["page"] for link in out[0].get_links()] == [4]
+
+
+def _embedded_font_pdf(pages):
+    import fitz
+
+    font = fitz.Font("cjk")
+    doc = fitz.open()
+    for n in range(pages):
+        page = doc.new_page()
+        page.insert_font(fontname="F0", fontbuffer=font.buffer)
+        page.insert_text((50, 100), f"Sheet {n + 1}", fontname="F0")
+    doc.subset_fonts()
+    return doc.tobytes(garbage=4, deflate=True)
+
+
+def test_chunked_ghostscript_never_returns_a_larger_file(monkeypatch):
+    import fitz
+    import utils.compress as compress
+
+    monkeypatch.setattr(compress, "GS_PIPE_MAX_PAGES", 4)
+    monkeypatch.setattr(compress, "GS_CHUNK_PAGES", 3)
+    pdf_bytes = _embedded_font_pdf(10)
+
+    def fake_gs(cmd, **kwargs):
+        # each chunk re-embeds the whole font, as pdfwrite without subsetting would
+        args = dict(a.split("=", 1) for a in cmd if a.startswith("-d") and "=" in a)
+        out = next(a for a in cmd if a.startswith("-sOutputFile=")).split("=", 1)[1]
+        part = fitz.open()
+        for n in range(int(args["-dFirstPage"]), int(args["-dLastPage"]) + 1):
+            page = part.new_page()
+            page.insert_font(fontname="F0", fontbuffer=fitz.Font("cjk").buffer)
+            page.insert_text((50, 100), f"Sheet {n}", fontname="F0")
+        part.save(out, deflate=True)
+
+    monkeypatch.setattr(compress.subprocess, "run", fake_gs)
+
+    assert compress._compress_ghostscript("gs", pdf_bytes, 150, 60) == pdf_bytes
+
+
+@pytest.mark.skipif(not HAS_GS, reason="Ghostscript not installed.")
+def test_chunked_ghostscript_keeps_embedded_fonts_small(monkeypatch):
+    import io
+    import fitz
+    import utils.compress as compress
+
+    monkeypatch.setattr(compress, "GS_PIPE_MAX_PAGES", 4)
+    monkeypatch.setattr(compress, "GS_CHUNK_PAGES", 3)
+    pdf_bytes = _embedded_font_pdf(10)
+
+    output = compress.compress_pdf(io.BytesIO(pdf_bytes), mode="ghostscript")
+    assert len(output) <= len(pdf_bytes)
+    with fitz.open(stream=output, filetype="pdf") as out:
+        assert [p.get_text().strip() for p in out] == [f"Sheet {n + 1}" for n in range(10)]
@@ -22,3 +22,109 @@ def test_word_to_pdf(tmp_path):
     result = word_to_pdf(docx_path, output)
     assert output.exists()
     assert result is True
+
+
+def _numbered_pdf(pages):
+    import fitz
+
+    doc = fitz.open()
+    for n in range(pages):
+        doc.new_page().insert_text((72, 100), f"Paragraph on page {n + 1}")
+    return doc.tobytes()
+
+
+def _docx_text(docx_bytes):
+    import io
+    from docx import Document
+
+    return [p.text for p in Document(io.BytesIO(docx_bytes)).paragraphs if p.text]
+
+
+def test_parse_page_ranges():
+    from utils.pdf import parse_page_ranges
+
+    assert parse_page_ranges("1-3, 7,9-", 10) == [1, 2, 3, 7, 9, 10]
+    assert parse_page_ranges("2,2,1", 5) == [1, 2]
+    for bad in ("0-2", "4-2", "x", "11", ","):
+        with pytest.raises(ValueError):
+            parse_page_ranges(bad, 10)
+
+
+def test_pdf_to_word_page_selection_and_parallel_chunks(monkeypatch):
+    import utils.convert
+
+    # keep the pool path covered on single-CPU machines
+    monkeypatch.setattr(utils.convert.os, "cpu_count", lambda: 2)
+    pdf_bytes = _numbered_pdf(12)
+
+    assert _docx_text(pdf_to_word(pdf_bytes, pages="2-3,7")) == [
+        "Paragraph on page 2", "Paragraph on page 3", "Paragraph on page 7"
+    ]
+    assert _docx_text(pdf_to_word(pdf_bytes, start=11)) == [
+        "Paragraph on page 11", "Paragraph on page 12"
+    ]
+
+    serial = _docx_text(pdf_to_word(pdf_bytes, engine="pdf2docx"))
+    parallel = _docx_text(pdf_to_word(pdf_bytes, engine="pdf2docx", parallel=True, workers=2, chunk_size=4))
+    assert parallel == serial
+    assert len(parallel) == 12
+
+
+def test_pdf_to_word_workers_are_clamped_to_cpus(monkeypatch):
+    import utils.convert
+
+    seen = {}
+
+    class Pool:
+        def __init__(self, max_workers, initializer, initargs):
+            seen["workers"] = max_workers
+            initializer(*initargs)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def map(self, fn, items):
+            return map(fn, items)
+
+    monkeypatch.setattr(utils.convert, "ProcessPoolExecutor", Pool)
+    monkeypatch.setattr(utils.convert.os, "cpu_count", lambda: 2)
+
+    pdf_to_word(_numbered_pdf(6), engine="pdf2docx", parallel=True, workers=10_000, chunk_size=1)
+    assert seen["workers"] == 2
+
+
+def test_auto_engine_picks_text_flow_only_for_simple_documents(monkeypatch):
+    import fitz
+    import utils.convert as convert
+
+    report = fitz.open()
+    page = report.new_page()
+    page.insert_text((72, 100), "Executive summary", fontname="helv", fontsize=16)
+    page.insert_textbox(fitz.Rect(72, 120, 520, 300), "The bridge deck was inspected in March. " * 6)
+    report.new_page().insert_text((72, 100), "Appendix")
+    report_bytes = report.tobytes()
+
+    columns = fitz.open()
+    page = columns.new_page()
+    page.insert_textbox(fitz.Rect(40, 80, 280, 300), "Left column text. " * 10)
+    page.insert_textbox(fitz.Rect(320, 80, 560, 300), "Right column text. " * 10)
+    columns_bytes = columns.tobytes()
+
+    used = []
+    real = convert.text_flow_docx
+    monkeypatch.setattr(convert, "text_flow_docx", lambda *a: used.append("fast") or real(*a))
+
+    text = _docx_text(pdf_to_word(report_bytes))
+    assert used == ["fast"]
+    assert text[0] == "Executive summary"
+    assert text[1].startswith("The bridge deck was inspected in March. The bridge")
+    assert text[-1] == "Appendix"
+
+    pdf_to_word(columns_bytes)
+    assert used == ["fast"]
+
+    with pytest.raises(ValueError):
+        pdf_to_word(report_bytes, engine="ocr")
@@ -0,0 +1,65 @@
+import json
+import os
+
+import fitz
+import convert_pdf_to_docx
+from convert_pdf_to_docx import convert_multiple_pdfs, load_manifest, MANIFEST_NAME, _convert_job
+
+
+def _write_pdf(path, text):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 100), text)
+    doc.save(path)
+
+
+def test_batch_skips_unchanged_files_and_reports_failures(tmp_path):
+    pdf_dir = tmp_path / "pdfs"
+    out_dir = tmp_path / "docx"
+    pdf_dir.mkdir()
+    _write_pdf(pdf_dir / "a.pdf", "Alpha")
+    _write_pdf(pdf_dir / "b.pdf", "Bravo")
+    (pdf_dir / "bad.pdf").write_bytes(b"not a pdf")
+
+    first = convert_multiple_pdfs(pdf_dir, out_dir, workers=2)
+    assert (first["converted"], first["failed"], first["skipped"]) == (2, 1, 0)
+    assert (out_dir / "a.docx").exists() and not list(out_dir.glob("*.part"))
+    failed = next(f for f in first["files"] if f["status"] == "failed")
+    assert failed["input"].endswith("bad.pdf") and failed["error"]
+
+    manifest = [json.loads(line) for line in (out_dir / MANIFEST_NAME).read_text().splitlines()]
+    assert {os.path.basename(e["input"]) for e in manifest} == {"a.pdf", "b.pdf"}
+    assert all(len(e["sha256"]) == 64 for e in manifest)
+
+    # touching a file without changing it is still a skip; editing it is not
+    os.utime(pdf_dir / "a.pdf", (1, 1))
+    _write_pdf(pdf_dir / "b.pdf", "Bravo revised")
+    second = convert_multiple_pdfs(pdf_dir, out_dir, workers=2)
+    status = {os.path.basename(f["input"]): f["status"] for f in second["files"]}
+    assert status == {"a.pdf": "skipped", "b.pdf": "converted", "bad.pdf": "failed"}
+
+    report = json.loads((out_dir / "conversion_report.json").read_text())
+    assert report["skipped"] == 1 and report["converted"] == 1
+
+    # the hash check refreshed the manifest mtime, so a.pdf is not rehashed again
+    assert load_manifest(out_dir / MANIFEST_NAME)[str(pdf_dir / "a.pdf")]["mtime"] == 1
+
+
+def _crashing_job(pdf_path, output_path):
+    if "crash" in pdf_path:
+        os._exit(1)  # simulates a segfault or OOM kill in the worker
+    return _convert_job(pdf_path, output_path)
+
+
+def test_batch_survives_a_dying_worker(tmp_path, monkeypatch):
+    monkeypatch.setattr(convert_pdf_to_docx, "_convert_job", _crashing_job)
+    pdf_dir = tmp_path / "pdfs"
+    pdf_dir.mkdir()
+    for name in ("a", "b", "crash", "d", "e", "f"):
+        _write_pdf(pdf_dir / f"{name}.pdf", name)
+
+    report = convert_multiple_pdfs(pdf_dir, tmp_path / "docx", workers=2)
+
+    status = {os.path.basename(f["input"]): f["status"] for f in report["files"]}
+    assert status == {"a.pdf": "converted", "b.pdf": "converted", "crash.pdf": "failed",
+                      "d.pdf": "converted", "e.pdf": "converted", "f.pdf": "converted"}
+    assert (tmp_path / "docx" / "conversion_report.json").exists()
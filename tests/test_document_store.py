@@ -0,0 +1,113 @@
+import io
+import time
+import zipfile
+
+import fitz
+import pytest
+from PyPDF2 import PdfReader
+
+from services.document_store import DocumentStore
+from utils.cache import hash_bytes
+
+
+def _pdf(pages=3, width=200):
+    doc = fitz.open()
+    for n in range(pages):
+        page = doc.new_page(width=width, height=200)
+        page.insert_text((20, 50), f"Page {n + 1}")
+    return doc.tobytes()
+
+
+def test_same_bytes_share_one_entry():
+    store = DocumentStore()
+    data = _pdf()
+
+    first = store.add(data, "a.pdf")
+    second = store.add(data, "b.pdf")
+
+    assert first is second
+    assert first.id == hash_bytes(data)
+    assert first.info() == {"document_id": first.id, "name": "a.pdf", "size": len(data), "pages": 3}
+    assert len(store) == 1
+
+
+def test_least_recently_used_is_evicted():
+    store = DocumentStore(max_documents=2)
+    a, b, c = (store.add(_pdf(width=200 + n)) for n in range(3))
+
+    assert a.id not in store and b.id in store and c.id in store
+
+    store.get(b.id)
+    d = store.add(_pdf(width=300))
+    assert c.id not in store and b.id in store and d.id in store
+    with pytest.raises(KeyError):
+        store.get(a.id)
+
+
+def test_unreadable_upload_evicts_nothing():
+    store = DocumentStore(max_documents=2)
+    a, b = store.add(_pdf(width=200)), store.add(_pdf(width=201))
+
+    with pytest.raises(ValueError):
+        store.add(b"junk")
+
+    assert len(store) == 2 and a.id in store and b.id in store
+
+
+def test_idle_and_oversized_documents():
+    store = DocumentStore(idle_seconds=60, max_bytes=10_000)
+    entry = store.add(_pdf())
+    entry.context  # opened handles are closed on eviction
+
+    entry.last_used = time.monotonic() - 120
+    with pytest.raises(KeyError):
+        store.get(entry.id)
+    assert entry._context is None
+
+    with pytest.raises(ValueError):
+        store.add(b"%PDF" + b"0" * 20_000)
+
+
+def test_document_endpoints(tmp_path):
+    from fastapi.testclient import TestClient
+    from api.deps import get_document_store, get_result_cache, get_scratch_store
+    from api.main import app
+    from utils.cache import ResultCache
+    from utils.files import ScratchStore
+
+    store = DocumentStore()
+    app.dependency_overrides[get_document_store] = lambda: store
+    app.dependency_overrides[get_result_cache] = lambda: ResultCache(tmp_path / "cache")
+    app.dependency_overrides[get_scratch_store] = lambda: ScratchStore(tmp_path / "scratch")
+    try:
+        client = TestClient(app)
+        upload = client.post("/documents/", files={"file": ("set.pdf", _pdf(4), "application/pdf")})
+        assert upload.status_code == 200
+        doc_id = upload.json()["document_id"]
+        assert upload.json()["pages"] == 4
+
+        split = client.post(f"/documents/{doc_id}/split", params={"pages": "2-3"})
+        assert len(PdfReader(io.BytesIO(split.content)).pages) == 2
+        assert client.post(f"/documents/{doc_id}/split", params={"pages": "9"}).status_code == 400
+
+        parts = client.post(f"/documents/{doc_id}/split/parts", params={"every": 3})
+        assert zipfile.ZipFile(io.BytesIO(parts.content)).namelist() == ["pages_1-3.pdf", "page_4.pdf"]
+
+        text = client.get(f"/documents/{doc_id}/text", params={"pages": "2"}).json()
+        assert text["pages"][0]["page"] == 2 and "Page 2" in text["text"]
+
+        tile = client.get(f"/documents/{doc_id}/pages/1/tiles/0/0/0")
+        assert tile.headers["content-type"] == "image/png"
+        assert client.get(f"/documents/{doc_id}/pages/9/tiles/0/0/0").status_code == 404
+
+        analysis = client.post(f"/documents/{doc_id}/analyze")
+        assert analysis.status_code == 200
+        assert len(analysis.json()["pages"]) == 4
+
+        bad = client.post("/documents/", files={"file": ("x.pdf", b"not a pdf", "application/pdf")})
+        assert bad.status_code == 400
+
+        assert client.delete(f"/documents/{doc_id}").status_code == 200
+        assert client.get(f"/documents/{doc_id}").status_code == 404
+    finally:
+        app.dependency_overrides.clear()
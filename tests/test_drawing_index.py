@@ -0,0 +1,31 @@
+from services.drawing_index import DrawingIndex, generate_index, generate_qa
+from services.overrides import apply_overrides_to_index
+
+PAGES = [
+    {"page": 2, "view_type": "SECTION", "confidence": 0.9, "scale": "1:50"},
+    {"page": 1, "view_type": "PLAN", "confidence": 0.9, "scale": "1:100"},
+    {"page": 3, "view_type": "PLAN", "confidence": 0.4, "scale": "1:50"},
+]
+
+
+def test_index_matches_generate_functions():
+    index = DrawingIndex(PAGES)
+
+    assert index.rows() == generate_index(PAGES)
+    assert [r["page"] for r in index.rows()] == [1, 2, 3]
+    assert index.qa() == generate_qa(generate_index(PAGES))
+
+
+def test_override_updates_aggregates_incrementally():
+    index = DrawingIndex(PAGES)
+    assert "Multiple scales detected for PLAN: 1:100, 1:50" in index.qa()["scale_issues"]
+    assert "ELEVATION" in index.qa()["missing_views"]
+
+    apply_overrides_to_index(index, {3: {"view_type": "ELEVATION", "scale": "1:100", "confidence": 0.95}})
+
+    corrected = [dict(p, **({"view_type": "ELEVATION", "scale": "1:100", "confidence": 0.95} if p["page"] == 3 else {}))
+                 for p in PAGES]
+    assert index.rows() == generate_index(corrected)
+    assert index.qa() == generate_qa(generate_index(corrected))
+    assert index.qa()["missing_views"] == []
+    assert index.qa()["low_confidence_pages"] == []
@@ -0,0 +1,73 @@
+import fitz
+from services.drawing_set import analyze_drawing_set
+
+
+def _pdf(texts):
+    doc = fitz.open()
+    for text in texts:
+        page = doc.new_page(width=600, height=400)
+        page.insert_text((50, 100), text)
+        page.draw_line((10, 10), (590, 390))
+    return doc.tobytes()
+
+
+def test_repeated_sheets_are_analysed_once():
+    result = analyze_drawing_set({
+        "structural.pdf": _pdf(["GROUND FLOOR PLAN 1:100", "SECTION A-A 1:50"]),
+        "resubmission.pdf": _pdf(["SECTION A-A 1:50", "NORTH ELEVATION 1:100"]),
+    })
+
+    assert [(s["source_file"], s["source_page"]) for s in result["sheets"]] == [
+        ("structural.pdf", 1), ("structural.pdf", 2), ("resubmission.pdf", 2)
+    ]
+    assert result["duplicates"] == [{"source_file": "resubmission.pdf", "source_page": 1, "sheet": 2}]
+    assert result["sheets"][1]["also_in"] == [{"file": "resubmission.pdf", "page": 1}]
+    assert [d["duplicate_sheets"] for d in result["documents"]] == [0, 1]
+
+    assert [r["view_type"] for r in result["index"]] == ["PLAN", "SECTION", "ELEVATION"]
+    assert result["index"][2]["source_file"] == "resubmission.pdf"
+    assert result["register"][2]["drawing_no"] == "PRJ-S-003"
+    assert result["register"][2]["source_page"] == 2
+    assert result["qa"]["missing_views"] == []
+
+
+def _scan(shade):
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 64, 64), False)
+    pix.clear_with(shade)
+    doc = fitz.open()
+    page = doc.new_page(width=600, height=400)
+    page.insert_image(page.rect, pixmap=pix)
+    return doc
+
+
+def test_same_size_scans_are_distinct_sheets():
+    doc = fitz.open()
+    for shade in (40, 120, 200):
+        doc.insert_pdf(_scan(shade))
+
+    result = analyze_drawing_set({"scans.pdf": doc.tobytes()})
+
+    assert len(result["sheets"]) == 3
+    assert result["duplicates"] == []
+
+
+def _form_sheet(line_end):
+    # line work inside a form, title text on the page itself
+    art = fitz.open()
+    art.new_page(width=600, height=400).draw_line((10, 10), line_end)
+    doc = fitz.open()
+    page = doc.new_page(width=600, height=400)
+    page.show_pdf_page(page.rect, art, 0)
+    page.insert_text((450, 380), "GENERAL ARRANGEMENT PLAN 1:100")
+    return doc
+
+
+def test_form_wrapped_sheets_differing_in_line_work_are_kept():
+    doc = fitz.open()
+    doc.insert_pdf(_form_sheet((590, 390)))
+    doc.insert_pdf(_form_sheet((300, 20)))
+
+    result = analyze_drawing_set({"cad.pdf": doc.tobytes()})
+
+    assert len(result["sheets"]) == 2
+    assert result["duplicates"] == []
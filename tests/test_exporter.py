@@ -0,0 +1,42 @@
+import io
+import pyarrow as pa
+import pyarrow.parquet as pq
+from services.drawing_index import generate_index, index_to_csv
+from services.drawing_register import build_register
+from services.exporter import iter_index_export, iter_register_export
+
+PAGES = [
+    {"page": i, "view_type": "PLAN", "confidence": 0.9 if i % 2 else None, "scale": "1:100"}
+    for i in range(1, 1201)
+]
+
+
+def test_streamed_csv_matches_index_to_csv():
+    index = generate_index(PAGES)
+
+    chunks = list(iter_index_export(index, "csv"))
+
+    assert len(chunks) > 1
+    assert b"".join(chunks).decode("utf-8") == index_to_csv(index)
+
+
+def test_columnar_exports():
+    index = generate_index(PAGES)
+
+    table = pq.read_table(io.BytesIO(b"".join(iter_index_export(index, "parquet"))))
+    assert table.num_rows == 1200
+    assert table.column("confidence").null_count == 600
+
+    data = b"".join(iter_register_export(index, "arrow", project_code="CEAY"))
+    register = pa.ipc.open_file(pa.BufferReader(data)).read_all()
+    assert register.column("drawing_no")[0].as_py() == build_register(index[:1], "CEAY")[0]["drawing_no"]
+
+    xlsx = b"".join(iter_register_export(index, "xlsx"))
+    assert xlsx[:2] == b"PK"
+
+
+def test_register_rows_without_status_are_for_review():
+    rows = [{"page": 1, "view_type": "PLAN", "scale": "1:100", "confidence": 0.9}]
+
+    assert build_register(rows)[0]["status"] == "FOR REVIEW"
+    assert build_register([dict(rows[0], status="OK")])[0]["status"] == "FOR CONSTRUCTION"
@@ -0,0 +1,38 @@
+import os
+import stat
+
+import pytest
+from utils.files import ScratchStore
+
+FILE_ID = "ab" * 16
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permissions")
+def test_scratch_files_are_private(tmp_path):
+    directory = tmp_path / "scratch"
+    directory.mkdir()
+    os.chmod(directory, 0o755)
+    store = ScratchStore(directory)
+
+    tmp = store.temp_path(FILE_ID, "plan")
+    tmp.write_bytes(b"%PDF")
+    final = store.commit(FILE_ID, "plan", tmp)
+
+    assert stat.S_IMODE(directory.stat().st_mode) == 0o700
+    assert stat.S_IMODE(final.stat().st_mode) == 0o600
+    assert store.read_bytes(FILE_ID, "plan") == b"%PDF"
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX symlinks")
+def test_planted_symlink_is_refused(tmp_path):
+    target = tmp_path / "elsewhere"
+    target.mkdir()
+    (tmp_path / "scratch").symlink_to(target)
+
+    with pytest.raises(RuntimeError):
+        ScratchStore(tmp_path / "scratch")
+
+
+def test_temp_paths_are_unique_per_writer(tmp_path):
+    store = ScratchStore(tmp_path)
+    assert store.temp_path(FILE_ID, "plan") != store.temp_path(FILE_ID, "plan")
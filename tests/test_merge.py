@@ -21,3 +21,64 @@ def test_merge_pdfs(tmp_path):
 
     merge_pdfs([pdf1, pdf2], output)
     assert output.exists()
+
+
+def _blank_pdf(width):
+    import io
+
+    writer = PdfWriter()
+    writer.add_blank_page(width=width, height=200)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def test_merge_from_streams_with_a_small_spool_limit():
+    import io
+    from PyPDF2 import PdfReader
+    from utils.merge import merge_pdfs, merge_pdfs_to_file
+
+    inputs = [_blank_pdf(100 + n) for n in range(3)]
+
+    merged = merge_pdfs([io.BytesIO(inputs[0]), inputs[1], io.BytesIO(inputs[2])])
+    assert [p.mediabox.width for p in PdfReader(io.BytesIO(merged)).pages] == [100, 101, 102]
+
+    with merge_pdfs_to_file([io.BytesIO(b) for b in inputs], spool_max_bytes=64) as output:
+        reader = PdfReader(output)
+        assert [p.mediabox.width for p in reader.pages] == [100, 101, 102]
+
+
+def test_upload_streams_are_read_in_place(monkeypatch, tmp_path):
+    import io
+    from PyPDF2 import PdfReader
+    import utils.merge as merge
+
+    paths = []
+    for n in range(3):
+        path = tmp_path / f"{n}.pdf"
+        path.write_bytes(_blank_pdf(100 + n))
+        paths.append(path)
+    uploads = [open(path, "rb") for path in paths]
+
+    # no input is buffered into a BytesIO before parsing
+    monkeypatch.setattr(merge, "BytesIO", lambda *a: (_ for _ in ()).throw(AssertionError))
+    try:
+        with merge.merge_pdfs_to_file(uploads + paths) as output:
+            widths = [p.mediabox.width for p in PdfReader(output).pages]
+    finally:
+        for f in uploads:
+            f.close()
+    assert widths == [100, 101, 102, 100, 101, 102]
+
+
+def test_merge_endpoint_reads_every_upload():
+    import io
+    from fastapi.testclient import TestClient
+    from PyPDF2 import PdfReader
+    from api.main import app
+
+    files = [("files", (f"{n}.pdf", _blank_pdf(100 + n), "application/pdf")) for n in range(3)]
+    response = TestClient(app).post("/merge/", files=files)
+
+    assert response.status_code == 200
+    assert len(PdfReader(io.BytesIO(response.content)).pages) == 3
@@ -0,0 +1,117 @@
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+from utils.office import OfficePool
+
+FAKE_SOFFICE = textwrap.dedent(f"""\
+    #!{sys.executable}
+    # Stand-in for `soffice --convert-to pdf --outdir DIR FILE...`
+    import sys, time
+    from pathlib import Path
+
+    args = sys.argv[1:]
+    profile = next(a for a in args if a.startswith("-env:UserInstallation="))
+    out_dir = Path(args[args.index("--outdir") + 1])
+    for src in map(Path, args[args.index("--outdir") + 2:]):
+        if b"hang" in src.read_bytes():
+            time.sleep(30)
+        if b"corrupt" in src.read_bytes():
+            continue
+        (out_dir / (src.stem + ".pdf")).write_bytes(b"%PDF-1.4 " + src.read_bytes() + b" " + profile.encode())
+""")
+
+
+@pytest.fixture
+def fake_soffice(tmp_path):
+    path = tmp_path / "soffice"
+    path.write_text(FAKE_SOFFICE)
+    path.chmod(0o755)
+    return str(path)
+
+
+def test_workers_use_private_profiles(fake_soffice):
+    pool = OfficePool(size=2, soffice=fake_soffice, use_uno=False)
+    try:
+        first = pool.convert(b"one")
+        second = pool.convert(b"two")
+    finally:
+        pool.close()
+
+    assert first.startswith(b"%PDF-1.4 one ")
+    assert second.startswith(b"%PDF-1.4 two ")
+    # the idle queue hands workers out in turn, each with its own profile
+    assert first.split()[-1] != second.split()[-1]
+
+
+def test_hung_conversion_times_out_and_worker_is_reused(fake_soffice):
+    pool = OfficePool(size=1, soffice=fake_soffice, use_uno=False, timeout=0.5)
+    try:
+        with pytest.raises(Exception):
+            pool.convert(b"hang")
+        assert pool.convert(b"ok").startswith(b"%PDF-1.4 ok ")
+    finally:
+        pool.close()
+
+
+def test_missing_libreoffice(monkeypatch):
+    monkeypatch.setattr("utils.office.find_soffice", lambda: None)
+    with pytest.raises(RuntimeError):
+        OfficePool()
+
+
+def test_batch_converts_in_one_session_per_worker_and_reports_failures(fake_soffice):
+    import io
+    import json
+    import zipfile
+    from utils.convert import iter_pdf_batch_zip
+
+    pool = OfficePool(size=2, soffice=fake_soffice, use_uno=False)
+    try:
+        results = pool.convert_batch([
+            ("contract.docx", b"a"),
+            ("broken.docx", b"corrupt"),
+            ("contract.docx", b"b"),
+        ])
+    finally:
+        pool.close()
+
+    assert [r["status"] for r in results] == ["ok", "failed", "ok"]
+    assert results[1]["error"] == "PDF conversion failed"
+    assert results[0]["pdf"].startswith(b"%PDF-1.4 a ")
+    assert results[2]["pdf"].startswith(b"%PDF-1.4 b ")
+
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(iter_pdf_batch_zip(results))))
+    assert archive.namelist() == ["contract.pdf", "contract (2).pdf", "status.json"]
+    status = json.loads(archive.read("status.json"))
+    assert [s["status"] for s in status] == ["ok", "failed", "ok"]
+    assert status[2]["output"] == "contract (2).pdf"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX process groups")
+def test_timeout_kills_soffice_children(tmp_path):
+    import os
+    from utils.office import _run_soffice
+
+    # a launcher that starts a long-lived child, like soffice -> soffice.bin
+    pid_file = tmp_path / "child.pid"
+    launcher = tmp_path / "launcher"
+    launcher.write_text(textwrap.dedent(f"""\
+        #!{sys.executable}
+        import subprocess, sys
+        child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+        open({str(pid_file)!r}, "w").write(str(child.pid))
+        child.wait()
+    """))
+    launcher.chmod(0o755)
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        _run_soffice([str(launcher)], timeout=1)
+
+    child_pid = int(pid_file.read_text())
+    with pytest.raises(ProcessLookupError):
+        for _ in range(50):
+            os.kill(child_pid, 0)
+            time.sleep(0.1)
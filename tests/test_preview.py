@@ -0,0 +1,36 @@
+import fitz
+from services.preview import PreviewService
+from utils.cache import ResultCache
+
+
+def _sheet_pdf():
+    doc = fitz.open()
+    for _ in range(2):
+        page = doc.new_page(width=2384, height=1684)  # A1 landscape
+        page.insert_text((100, 100), "GENERAL ARRANGEMENT PLAN")
+    return doc.tobytes()
+
+
+def test_tiles_are_rendered_lazily_and_cached(tmp_path, monkeypatch):
+    service = PreviewService(cache=ResultCache(tmp_path), tile_size=256)
+    doc_hash = service.open(_sheet_pdf())
+
+    grid = service.grid(doc_hash, 2, 2)
+    assert grid["columns"] == 10 and grid["rows"] == 7
+
+    tile = service.render_tile(doc_hash, 2, 2, 9, 6)
+    assert tile[:8] == b"\x89PNG\r\n\x1a\n"
+    assert fitz.Pixmap(service.render_tile(doc_hash, 2, 2, 0, 0)).width == 256
+
+    # a second request is served from the cache without rendering
+    monkeypatch.setattr(fitz.Page, "get_pixmap", lambda *a, **k: (_ for _ in ()).throw(AssertionError))
+    assert service.render_tile(doc_hash, 2, 2, 9, 6) == tile
+
+
+def test_overview_level_fits_max_size(tmp_path):
+    service = PreviewService(cache=ResultCache(tmp_path))
+    doc_hash = service.open(_sheet_pdf())
+
+    level = service.overview_level(doc_hash, 1, max_size=1024)
+
+    assert service.zoom_levels[level] == 0.25
@@ -0,0 +1,56 @@
+import json
+from services.rule_engine import apply_rules, apply_rules_batch, compile_rules, load_rule_templates
+
+GOOD = [
+    {"page": 1, "view_type": "PLAN", "scale": "1:100", "confidence": 0.9},
+    {"page": 2, "view_type": "SECTION", "scale": "1:50", "confidence": 0.8},
+    {"page": 3, "view_type": "ELEVATION", "scale": "1:100", "confidence": None},
+]
+BAD = [
+    {"page": 1, "view_type": "PLAN", "scale": "1:200", "confidence": 0.3},
+    {"page": 2, "view_type": "UNKNOWN", "scale": "Unknown", "confidence": 0.0},
+    {"page": 3, "view_type": "SECTION", "scale": None, "confidence": 0.9},
+]
+
+
+def test_batch_matches_single_project_rules():
+    indexes = {"good": GOOD, "bad": BAD, "empty": []}
+
+    results = apply_rules_batch(indexes, "structural")
+
+    assert list(results) == ["good", "bad", "empty"]
+    for pid, index in indexes.items():
+        assert results[pid] == apply_rules(index, "structural")
+    assert results["good"]["status"] == "PASS"
+    assert results["bad"]["status"] == "FAIL"
+
+
+def test_batch_and_single_agree_on_non_float_confidence():
+    index = [
+        {"page": 1, "view_type": "PLAN", "scale": "1:100", "confidence": "0.1"},
+        {"page": 2, "view_type": "SECTION", "scale": "1:50", "confidence": "0.9"},
+        {"page": 3, "view_type": "ELEVATION", "scale": "1:100", "confidence": "n/a"},
+        {"page": 4, "view_type": "DETAIL", "scale": "1:10", "confidence": 0},
+    ]
+
+    single = apply_rules(index, "structural")
+
+    assert apply_rules_batch({"p": index}, "structural")["p"] == single
+    assert single["issues"] == ["Low confidence on page 1 (PLAN)", "Low confidence on page 4 (DETAIL)"]
+
+
+def test_batch_per_project_types():
+    results = apply_rules_batch({"a": GOOD, "b": GOOD}, {"a": "ARCHITECTURAL", "b": "ROADS"})
+
+    assert results["a"] == apply_rules(GOOD, "ARCHITECTURAL")
+    assert results["b"]["status"] == "UNKNOWN_PROJECT_TYPE"
+
+
+def test_templates_load_from_json(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"roads": {"required_views": ["PLAN"], "allowed_scales": {"PLAN": ["1:500"]}}}))
+
+    rules = compile_rules(load_rule_templates(path)["ROADS"])
+
+    assert rules["allowed_scales"]["PLAN"] == frozenset({"1:500"})
+    assert rules["min_confidence"] == 0.0
@@ -0,0 +1,50 @@
+import fitz
+from services.scale_detector import detect_scales
+
+
+def _sheet(body_text, title_block_text=None):
+    doc = fitz.open()
+    page = doc.new_page(width=1000, height=700)
+    page.insert_text((50, 100), body_text)
+    if title_block_text:
+        page.insert_text((800, 680), title_block_text)
+    return doc.tobytes()
+
+
+def test_title_block_scale_wins_over_body_ratios():
+    pdf_bytes = _sheet("FALL 1:20 TO OUTLET", "1:100")
+
+    assert detect_scales(pdf_bytes)[0]["scale"] == "1:100"
+    assert detect_scales(pdf_bytes, mode="full")[0]["scale"] == "1:20"
+
+
+def test_falls_back_to_full_page():
+    pdf_bytes = _sheet("DETAIL A SCALE 1:5")
+
+    assert detect_scales(pdf_bytes) == [{"page": 1, "scale": "1:5"}]
+    assert detect_scales(_sheet("GENERAL NOTES")) == [{"page": 1, "scale": "Unknown"}]
+
+
+def test_title_block_uses_the_context_text_pass(monkeypatch):
+    from utils.pdf import DocumentContext
+
+    with DocumentContext(_sheet("FALL 1:20 TO OUTLET", "1:100")) as ctx:
+        ctx.pages  # the single text pass, as done by classification
+
+        def no_extraction(*args, **kwargs):
+            raise AssertionError("page text extracted again")
+
+        monkeypatch.setattr(fitz.Page, "get_text", no_extraction)
+        monkeypatch.setattr(fitz.Page, "get_textpage", no_extraction)
+        assert detect_scales(ctx) == [{"page": 1, "scale": "1:100"}]
+
+
+def test_rotated_sheets_find_the_title_block():
+    from services.scale_detector import detect_page_scale
+
+    doc = fitz.open()
+    page = doc.new_page(width=700, height=1000)
+    page.insert_text((50, 100), "FALL 1:20 TO OUTLET")
+    page.insert_text((550, 980), "1:100")
+    page.set_rotation(90)
+    assert detect_page_scale(page) == "1:100"
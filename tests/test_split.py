@@ -17,3 +17,67 @@ def test_split_pdf(tmp_path):
     split_pdf(str(input_pdf), str(output), start=1, end=2)
 
     assert output.exists()
+
+
+def _numbered_pdf(pages):
+    import io
+
+    writer = PdfWriter()
+    for n in range(pages):
+        writer.add_blank_page(100 + n, 200)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def _zip_parts(chunks):
+    import io
+    import zipfile
+    from PyPDF2 import PdfReader
+
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    return {
+        name: [int(p.mediabox.width) - 99 for p in PdfReader(io.BytesIO(archive.read(name))).pages]
+        for name in archive.namelist()
+    }
+
+
+def test_split_modes_in_one_pass():
+    import pytest
+    from utils.split import iter_split_zip, plan_parts
+
+    pdf_bytes = _numbered_pdf(12)
+
+    assert _zip_parts(iter_split_zip(pdf_bytes, ranges="1-3,7,10-")) == {
+        "pages_01-03.pdf": [1, 2, 3],
+        "page_07.pdf": [7],
+        "pages_10-12.pdf": [10, 11, 12],
+    }
+    assert list(_zip_parts(iter_split_zip(pdf_bytes, every=5)).values()) == [
+        [1, 2, 3, 4, 5], [6, 7, 8, 9, 10], [11, 12]
+    ]
+    burst = _zip_parts(iter_split_zip(pdf_bytes, burst=True))
+    assert len(burst) == 12 and burst["page_12.pdf"] == [12]
+
+    for bad in ({}, {"ranges": "1-2", "burst": True}, {"ranges": "5-20"}, {"every": 0}):
+        with pytest.raises(ValueError):
+            plan_parts(12, **bad)
+
+
+def test_split_pdf_single_range_in_memory():
+    import io
+    from PyPDF2 import PdfReader
+
+    output = split_pdf(_numbered_pdf(5), 2, 4)
+    assert [int(p.mediabox.width) for p in PdfReader(io.BytesIO(output)).pages] == [101, 102, 103]
+
+
+def test_unreadable_upload_is_a_bad_request():
+    from fastapi.testclient import TestClient
+    from api.main import app
+
+    client = TestClient(app)
+    for data in (b"not a pdf", b""):
+        upload = {"file": ("x.pdf", data, "application/pdf")}
+        assert client.post("/split/parts", params={"burst": True}, files=upload).status_code == 400
+        assert client.post("/split/", files=upload).status_code == 400
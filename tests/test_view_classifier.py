@@ -0,0 +1,31 @@
+import json
+from services.view_classifier import ViewMatcher, classify_text, load_view_keywords, VIEW_KEYWORDS
+
+
+def test_keywords_match_on_word_boundaries():
+    matcher = ViewMatcher(VIEW_KEYWORDS)
+
+    assert matcher.count("secondary beam schedule")["SECTION"] == 0
+    assert matcher.count("SEC 1-1 and section 2-2")["SECTION"] == 2
+    assert matcher.count("GROUND FLOOR\nPLAN")["PLAN"] == 1
+
+
+def test_hit_counts_drive_view_and_confidence():
+    single = classify_text("SECTION A-A")
+    repeated = classify_text("SECTION A-A\nSECTION B-B\nKEY PLAN")
+
+    assert single["view_type"] == "SECTION"
+    assert repeated["view_type"] == "SECTION"
+    assert repeated["hits"]["PLAN"] == 1
+    assert classify_text("general notes")["view_type"] == "UNKNOWN"
+    assert classify_text("general notes")["confidence"] == 0.0
+    assert 0 < single["confidence"] <= 1
+
+
+def test_load_keywords_from_config(tmp_path):
+    path = tmp_path / "views.json"
+    path.write_text(json.dumps({"detail": ["detail", "typical connection"]}))
+
+    matcher = ViewMatcher(load_view_keywords(path))
+
+    assert matcher.count("TYPICAL  CONNECTION detail")["DETAIL"] == 2
@@ -0,0 +1,211 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from .files import secure_directory
+
+# Defaults (override with environment variables)
+CACHE_DIR = Path(os.environ.get("CEAYDOCS_CACHE_DIR", Path(tempfile.gettempdir()) / "ceaydocs-cache"))
+CACHE_MAX_BYTES = int(os.environ.get("CEAYDOCS_CACHE_MAX_BYTES", 2 * 1024 ** 3))
+CACHE_TTL_SECONDS = int(os.environ.get("CEAYDOCS_CACHE_TTL_SECONDS", 24 * 3600))
+CACHE_MEMORY_BYTES = int(os.environ.get("CEAYDOCS_CACHE_MEMORY_BYTES", 64 * 1024 ** 2))
+
+# How many writes between disk eviction sweeps
+EVICT_EVERY = 32
+
+_MISSING = object()
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class ResultCache:
+    """
+    Content-addressed result cache: in-memory LRU in front of a directory.
+
+    Keys combine the input hash, the operation name and its parameters.
+    Disk entries are written to a temp file and renamed into place, so
+    several processes (e.g. uvicorn workers) can share one directory;
+    eviction tolerates entries disappearing under it.
+
+    Entries are pickles, so the directory must only be writable by this
+    user: it is created with mode 0700 and refused when owned by someone
+    else. Both tiers keep the pickled bytes; every hit returns a fresh
+    copy that callers may modify.
+    """
+
+    def __init__(
+        self,
+        directory: Path = CACHE_DIR,
+        max_bytes: int = CACHE_MAX_BYTES,
+        ttl_seconds: int = CACHE_TTL_SECONDS,
+        memory_bytes: int = CACHE_MEMORY_BYTES,
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.memory_bytes = memory_bytes
+
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._memory_size = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        secure_directory(self.directory)
+
+    @staticmethod
+    def make_key(input_hash: str, operation: str, params: Optional[Dict[str, Any]] = None) -> str:
+        params_json = json.dumps(params or {}, sort_keys=True, default=str)
+        return hash_bytes(f"{input_hash}:{operation}:{params_json}".encode("utf-8"))
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.pkl"
+
+    # ---------- memory tier ----------
+    def _memory_get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, size, data = entry
+            if expires_at < time.time():
+                self._memory.pop(key)
+                self._memory_size -= size
+                return _MISSING
+            self._memory.move_to_end(key)
+        # unpickled per hit, so callers never share one mutable result
+        return pickle.loads(data)
+
+    def _memory_put(self, key: str, data: bytes, expires_at: float) -> None:
+        size = len(data)
+        if size > self.memory_bytes:
+            return
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._memory_size -= old[1]
+            self._memory[key] = (expires_at, size, data)
+            self._memory_size += size
+            while self._memory_size > self.memory_bytes and self._memory:
+                _, (_, old_size, _) = self._memory.popitem(last=False)
+                self._memory_size -= old_size
+
+    # ---------- public API ----------
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self._memory_get(key)
+        if value is not _MISSING:
+            return value
+
+        path = self._path(key)
+        try:
+            stat = path.stat()
+            if stat.st_mtime + self.ttl_seconds < time.time():
+                path.unlink(missing_ok=True)
+                return default
+            data = path.read_bytes()
+            value = pickle.loads(data)
+        except FileNotFoundError:
+            return default
+        except Exception:
+            # corrupt or partially evicted entry: treat as a miss
+            path.unlink(missing_ok=True)
+            return default
+
+        self._memory_put(key, data, stat.st_mtime + self.ttl_seconds)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a result. A dict result with a non-empty "errors" list is
+        not cached, so a transient failure is retried on the next request.
+        """
+        if isinstance(value, dict) and value.get("errors"):
+            return
+
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        path = self._path(key)
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        self._memory_put(key, data, time.time() + self.ttl_seconds)
+
+        with self._lock:
+            self._writes += 1
+            sweep = self._writes % EVICT_EVERY == 0
+        if sweep:
+            self.evict()
+
+    def get_or_compute(
+        self,
+        input_bytes: bytes,
+        operation: str,
+        params: Optional[Dict[str, Any]],
+        compute: Callable[[], Any],
+    ) -> Any:
+        """Return the cached result for (input, operation, params) or compute and store it."""
+        key = self.make_key(hash_bytes(input_bytes), operation, params)
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        value = compute()
+        self.set(key, value)
+        return value
+
+    def evict(self) -> None:
+        """Drop expired entries, then the least recently written until under max_bytes."""
+        now = time.time()
+        entries = []
+        total = 0
+
+        for path in self.directory.glob("*/*.pkl"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if stat.st_mtime + self.ttl_seconds < now:
+                path.unlink(missing_ok=True)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._memory_size = 0
+        for path in self.directory.glob("*/*.pkl"):
+            path.unlink(missing_ok=True)
+
+
+_default_cache: Optional[ResultCache] = None
+
+
+def get_default_cache() -> ResultCache:
+    """Process-wide cache configured from the CEAYDOCS_CACHE_* environment."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache()
+    return _default_cache
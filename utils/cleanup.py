@@ -0,0 +1,31 @@
+import shutil
+import time
+from pathlib import Path
+
+
+def remove_expired(directory: Path, max_age_seconds: float) -> int:
+    """
+    Remove direct children of `directory` not modified for `max_age_seconds`.
+    Returns the number of entries removed. Safe to run from several
+    processes at once: entries that vanish mid-sweep are skipped.
+    """
+    directory = Path(directory)
+    if not directory.exists():
+        return 0
+
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+
+    for entry in directory.iterdir():
+        try:
+            if entry.stat().st_mtime >= cutoff:
+                continue
+            if entry.is_dir():
+                shutil.rmtree(entry, ignore_errors=True)
+            else:
+                entry.unlink(missing_ok=True)
+            removed += 1
+        except FileNotFoundError:
+            continue
+
+    return removed
@@ -1,9 +1,50 @@
+import io
+import logging
 import subprocess
 import tempfile
 import shutil
 import os
 import platform
+from concurrent.futures import ThreadPoolExecutor
+
+import fitz
+
 from .compress_fallback import compress_pdf_fallback
+from .image_recompress import recompress_images
+from .pdf import sample_page_numbers
+
+logger = logging.getLogger(__name__)
+
+# auto: Ghostscript when installed, otherwise the rasterising fallback
+# ghostscript: Ghostscript only (fails when it is not installed)
+# raster: rasterise every page to JPEG
+# images: downsample embedded images only, keeping vectors and text
+COMPRESSION_MODES = ("auto", "ghostscript", "raster", "images")
+
+# preset -> (dpi, jpeg quality)
+PRESETS = {
+    "high": (180, 80),
+    "medium": (150, 60),
+    "low": (120, 40),
+    "extreme": (100, 25),
+}
+DEFAULT_PRESET = "medium"
+
+# Settings tried by the target-size search, largest output first
+QUALITY_LADDER = [
+    (180, 80), (165, 70), (150, 60), (135, 50), (120, 40),
+    (110, 32), (100, 25), (85, 20), (72, 15),
+]
+
+# Pages compressed to estimate the output size in target-size mode
+TARGET_SAMPLE_PAGES = 6
+
+# Documents up to this many pages go through one Ghostscript process over
+# stdin/stdout; larger ones are split into GS_CHUNK_PAGES page ranges
+# compressed by at most GS_CONCURRENCY processes at once
+GS_PIPE_MAX_PAGES = int(os.environ.get("CEAYDOCS_GS_PIPE_MAX_PAGES", "60"))
+GS_CHUNK_PAGES = int(os.environ.get("CEAYDOCS_GS_CHUNK_PAGES", "40"))
+GS_CONCURRENCY = int(os.environ.get("CEAYDOCS_GS_CONCURRENCY", "0")) or os.cpu_count() or 1
 
 
 def _find_ghostscript():
@@ -15,42 +56,277 @@ def _find_ghostscript():
     return None
 
 
-def compress_pdf(pdf_file):
+def resolve_settings(preset=None, dpi=None, quality=None):
+    """(dpi, quality) from a preset, with explicit values taking precedence."""
+    preset = preset or DEFAULT_PRESET
+    if preset not in PRESETS:
+        raise ValueError(f"Unknown compression preset: {preset}")
+    preset_dpi, preset_quality = PRESETS[preset]
+    dpi = preset_dpi if dpi is None else int(dpi)
+    quality = preset_quality if quality is None else int(quality)
+
+    if not 36 <= dpi <= 600:
+        raise ValueError("dpi must be between 36 and 600")
+    if not 1 <= quality <= 100:
+        raise ValueError("quality must be between 1 and 100")
+    return dpi, quality
+
+
+def compress_pdf(pdf_file, mode="auto", preset=None, dpi=None, quality=None, target_size=None):
     """
     Compress PDF using Ghostscript if available,
     otherwise use pure-Python fallback.
+
+    `mode` selects the engine explicitly, see COMPRESSION_MODES.
+    `preset` (see PRESETS), `dpi` and `quality` set image resolution and
+    JPEG quality; explicit values override the preset.
+    `target_size` (bytes) instead searches QUALITY_LADDER for the best
+    settings whose estimated output fits, then steps further down the
+    ladder if the real output is still too large.
+    """
+    if mode not in COMPRESSION_MODES:
+        raise ValueError(f"Unknown compression mode: {mode}")
+
+    engine = _select_engine(mode)
+    pdf_bytes = pdf_file.read()
+
+    if target_size is not None:
+        return _compress_to_size(engine, pdf_bytes, int(target_size))
+
+    dpi, quality = resolve_settings(preset, dpi, quality)
+    return _run_engine(engine, pdf_bytes, dpi, quality)
+
+
+def _compress_to_size(engine, pdf_bytes, target_size):
+    """
+    Compress with the estimated settings, then keep stepping down
+    QUALITY_LADDER while the real output is still above target_size.
+    When even the last step is too large, that output is returned and a
+    warning is logged; callers compare its size with the target.
     """
+    step = QUALITY_LADDER.index(estimate_settings_for_size(pdf_bytes, target_size, engine))
+    output = _run_engine(engine, pdf_bytes, *QUALITY_LADDER[step])
+
+    while len(output) > target_size and step < len(QUALITY_LADDER) - 1:
+        step += 1
+        logger.debug("Output %d bytes above target %d, retrying at %s", len(output), target_size, QUALITY_LADDER[step])
+        output = _run_engine(engine, pdf_bytes, *QUALITY_LADDER[step])
+
+    if len(output) > target_size:
+        logger.warning("Target size %d not reached; smallest output is %d bytes", target_size, len(output))
+    return output
+
+
+def _select_engine(mode):
+    if mode in ("images", "raster"):
+        return mode
+
     gs = _find_ghostscript()
 
     # If Ghostscript NOT found → use fallback
     if not gs:
-        return compress_pdf_fallback(pdf_file)
+        if mode == "ghostscript":
+            raise RuntimeError("Ghostscript is required for this compression mode.")
+        return "raster"
+    return gs
+
+
+def _run_engine(engine, pdf_bytes, dpi, quality):
+    if engine == "images":
+        return recompress_images(io.BytesIO(pdf_bytes), target_dpi=dpi, jpeg_quality=quality)
+    if engine == "raster":
+        return compress_pdf_fallback(io.BytesIO(pdf_bytes), dpi=dpi, jpeg_quality=quality)
+    return _compress_ghostscript(engine, pdf_bytes, dpi, quality)
+
 
-    # If Ghostscript found → use system-level compression
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        tmp.write(pdf_file.read())
-        input_path = tmp.name
+def _sample_pdf(pdf_bytes, budget):
+    """Return (sample bytes, sampled page count, total page count)."""
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        page_count = len(doc)
+        if page_count <= budget:
+            return pdf_bytes, page_count, page_count
 
-    output_path = input_path.replace(".pdf", "_compressed.pdf")
+        sample = fitz.open()
+        for n in sample_page_numbers(page_count, budget):
+            sample.insert_pdf(doc, from_page=n - 1, to_page=n - 1)
+        # saved without recompressing streams, so its size stays comparable to the input
+        data = sample.tobytes(garbage=1)
+        sample.close()
+    return data, budget, page_count
+
+
+def estimate_settings_for_size(pdf_bytes, target_size, engine="raster"):
+    """
+    Highest-quality QUALITY_LADDER entry whose estimated output fits
+    target_size, or the smallest entry when none does.
 
-    cmd = [
+    Each candidate compresses only a sample of pages. The raster engine
+    replaces every page with one image, so its output is extrapolated per
+    page; the other engines keep the document's structure and are
+    extrapolated from the sample's compression ratio. The ladder is
+    binary-searched, so a handful of sample runs are needed.
+    """
+    sample, sampled, page_count = _sample_pdf(pdf_bytes, TARGET_SAMPLE_PAGES)
+    whole = sampled == page_count
+
+    def estimate(settings):
+        out = len(_run_engine(engine, sample, *settings))
+        if whole:
+            return out
+        if engine == "raster":
+            return out / sampled * page_count
+        return out * len(pdf_bytes) / len(sample)
+
+    lo, hi = 0, len(QUALITY_LADDER) - 1
+    best = hi
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        size = estimate(QUALITY_LADDER[mid])
+        logger.debug("Estimated %s at %s -> %d bytes", engine, QUALITY_LADDER[mid], size)
+        if size <= target_size:
+            best = mid
+            hi = mid - 1
+        else:
+            lo = mid + 1
+
+    return QUALITY_LADDER[best]
+
+
+def ghostscript_args(dpi, quality):
+    """pdfwrite flags that downsample images to dpi and JPEG-encode at quality."""
+    args = ["-dPDFSETTINGS=/ebook", f"-dJPEGQ={quality}"]
+    for kind in ("Color", "Gray"):
+        args += [
+            f"-dDownsample{kind}Images=true",
+            f"-d{kind}ImageDownsampleType=/Bicubic",
+            f"-d{kind}ImageResolution={dpi}",
+            f"-d{kind}ImageDownsampleThreshold=1.0",
+            f"-dAutoFilter{kind}Images=false",
+            f"-d{kind}ImageFilter=/DCTEncode",
+        ]
+    # bilevel scans stay sharp at a higher resolution
+    args += [
+        "-dDownsampleMonoImages=true",
+        f"-dMonoImageResolution={max(dpi * 2, 300)}",
+    ]
+    return args
+
+
+def _gs_command(gs, dpi, quality, output, *extra):
+    return [
         gs,
         "-sDEVICE=pdfwrite",
         "-dCompatibilityLevel=1.4",
-        "-dPDFSETTINGS=/ebook",
+        *ghostscript_args(dpi, quality),
         "-dNOPAUSE",
         "-dQUIET",
         "-dBATCH",
-        f"-sOutputFile={output_path}",
-        input_path
+        f"-sOutputFile={output}",
+        *extra,
     ]
 
-    subprocess.run(cmd, check=True)
 
-    with open(output_path, "rb") as f:
-        data = f.read()
+def _compress_ghostscript(gs, pdf_bytes, dpi, quality):
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        page_count = len(doc)
+
+    if page_count <= GS_PIPE_MAX_PAGES:
+        output = _ghostscript_pipe(gs, pdf_bytes, dpi, quality)
+    else:
+        output = _ghostscript_chunked(gs, pdf_bytes, page_count, dpi, quality)
+
+    # pdfwrite can grow documents that are already compact (vector-only
+    # sheets, fonts re-embedded per chunk); never hand back a larger file
+    if len(output) >= len(pdf_bytes):
+        logger.debug("Ghostscript output %d bytes is not smaller than the %d byte input; keeping the input", len(output), len(pdf_bytes))
+        return pdf_bytes
+    return output
+
+
+def _ghostscript_pipe(gs, pdf_bytes, dpi, quality):
+    """One Ghostscript process reading stdin and writing stdout, no temp files."""
+    # PostScript-level messages go to stderr so stdout carries only the PDF
+    cmd = _gs_command(gs, dpi, quality, "%stdout", "-sstdout=%stderr", "-")
+    result = subprocess.run(cmd, input=pdf_bytes, capture_output=True, check=True)
+    return result.stdout
+
+
+def _ghostscript_chunked(gs, pdf_bytes, page_count, dpi, quality, workers=None):
+    """
+    Compress page ranges of one shared input file in concurrent
+    Ghostscript processes, then merge the pieces in page order.
+
+    Fonts stay subset per chunk: a chunk only embeds the glyphs its pages
+    use, and identical subsets are merged by _merge_chunks. The outline
+    and links that point into another chunk are copied back from the
+    input, see _merge_chunks; named destinations themselves are not kept.
+    """
+    ranges = [
+        (first, min(first + GS_CHUNK_PAGES - 1, page_count))
+        for first in range(1, page_count + 1, GS_CHUNK_PAGES)
+    ]
+    workers = min(workers or GS_CONCURRENCY, len(ranges))
+
+    with tempfile.TemporaryDirectory(prefix="ceaydocs-gs-") as tmp_dir:
+        input_path = os.path.join(tmp_dir, "input.pdf")
+        with open(input_path, "wb") as f:
+            f.write(pdf_bytes)
+
+        def run(index_range):
+            index, (first, last) = index_range
+            output_path = os.path.join(tmp_dir, f"part-{index:05d}.pdf")
+            cmd = _gs_command(
+                gs, dpi, quality, output_path,
+                f"-dFirstPage={first}", f"-dLastPage={last}", input_path,
+            )
+            subprocess.run(cmd, check=True, capture_output=True)
+            return output_path
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(run, enumerate(ranges)))
+
+        logger.debug("Ghostscript compressed %d pages in %d parts", page_count, len(parts))
+        return _merge_chunks(pdf_bytes, parts, ranges)
+
+
+def _merge_chunks(pdf_bytes, parts, ranges):
+    """
+    Join compressed chunk files (covering the 1-based `ranges` of the
+    input, in order) and restore what a per-chunk run cannot keep: the
+    document outline and links from one chunk to a page in another.
+    garbage=4 merges identical objects, such as images or font subsets
+    repeated in several chunks.
+    """
+    merged = fitz.open()
+    for part in parts:
+        with fitz.open(part) as piece:
+            merged.insert_pdf(piece)
+
+    chunk_of = {}
+    for index, (first, last) in enumerate(ranges):
+        for n in range(first - 1, last):
+            chunk_of[n] = index
+
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as source:
+        toc = source.get_toc(simple=False)
+        if toc:
+            merged.set_toc(toc)
 
-    os.remove(input_path)
-    os.remove(output_path)
+        for pno, page in enumerate(source):
+            for link in page.get_links():
+                target = link.get("page", -1)
+                if link["kind"] not in (fitz.LINK_GOTO, fitz.LINK_NAMED) or target is None or target < 0:
+                    continue
+                if chunk_of.get(target) == chunk_of[pno]:
+                    continue  # kept by Ghostscript within the chunk
+                merged[pno].insert_link({
+                    "kind": fitz.LINK_GOTO,
+                    "from": link["from"],
+                    "page": target,
+                    "to": link.get("to") or fitz.Point(0, 0),
+                    "zoom": link.get("zoom", 0),
+                })
 
+    data = merged.tobytes(garbage=4, deflate=True)
+    merged.close()
     return data
@@ -1,32 +1,78 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
 import fitz
-import io
-from PIL import Image
 
-def compress_pdf_fallback(pdf_file, dpi=120, jpeg_quality=60):
+# Pages rendered per worker task, and the smallest document worth a process pool
+CHUNK_SIZE = 8
+MIN_PARALLEL_PAGES = 16
+
+# Per-process document handle, opened once by _init_worker
+_worker_doc = None
+
+
+def _init_worker(pdf_bytes: bytes) -> None:
+    global _worker_doc
+    _worker_doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+
+
+def render_page_jpeg(page: "fitz.Page", dpi: int, jpeg_quality: int) -> Tuple[float, float, bytes]:
+    """Rasterise one page and JPEG-encode straight from the pixmap buffer."""
+    pix = page.get_pixmap(dpi=dpi)
+    return page.rect.width, page.rect.height, pix.tobytes("jpeg", jpg_quality=jpeg_quality)
+
+
+def _render_chunk(task: Tuple[int, int, int, int]) -> List[Tuple[float, float, bytes]]:
+    start, end, dpi, jpeg_quality = task
+    return [render_page_jpeg(_worker_doc[i], dpi, jpeg_quality) for i in range(start, end)]
+
+
+def _render_serial(input_bytes: bytes, dpi: int, jpeg_quality: int):
+    with fitz.open(stream=input_bytes, filetype="pdf") as doc:
+        for page in doc:
+            yield render_page_jpeg(page, dpi, jpeg_quality)
+
+
+def _render_parallel(input_bytes: bytes, page_count: int, dpi: int, jpeg_quality: int, workers: int):
+    tasks = [
+        (start, min(start + CHUNK_SIZE, page_count), dpi, jpeg_quality)
+        for start in range(0, page_count, CHUNK_SIZE)
+    ]
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(tasks)),
+        initializer=_init_worker,
+        initargs=(input_bytes,),
+    ) as pool:
+        # map() yields in submission order, so pages stay sorted
+        for chunk in pool.map(_render_chunk, tasks):
+            yield from chunk
+
+
+def compress_pdf_fallback(pdf_file, dpi=120, jpeg_quality=60, workers: Optional[int] = None):
     """
     Basic PDF compressor using rasterization + JPEG compression (no Ghostscript).
+
+    Pages are rendered and encoded in a process pool (one PyMuPDF handle
+    per worker); the main process only assembles the output document.
+    Small documents, or workers=1, are rendered in-process.
     """
 
     input_bytes = pdf_file.read()
-    doc = fitz.open(stream=input_bytes, filetype="pdf")
+    with fitz.open(stream=input_bytes, filetype="pdf") as doc:
+        page_count = len(doc)
 
-    output_pdf = fitz.open()
-
-    for page in doc:
-        # Render page → pixmap
-        pix = page.get_pixmap(dpi=dpi)
-
-        # Convert pixmap → PIL Image
-        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and page_count >= MIN_PARALLEL_PAGES:
+        pages = _render_parallel(input_bytes, page_count, dpi, jpeg_quality, workers)
+    else:
+        pages = _render_serial(input_bytes, dpi, jpeg_quality)
 
-        # Compress image using JPEG quality
-        img_bytes_io = io.BytesIO()
-        img.save(img_bytes_io, format="JPEG", quality=jpeg_quality)
-        img_bytes = img_bytes_io.getvalue()
-
-        # Insert compressed image into output PDF
-        new_page = output_pdf.new_page(width=page.rect.width, height=page.rect.height)
-        new_page.insert_image(page.rect, stream=img_bytes)
+    output_pdf = fitz.open()
+    for width, height, jpeg in pages:
+        new_page = output_pdf.new_page(width=width, height=height)
+        new_page.insert_image(new_page.rect, stream=jpeg)
 
     result = output_pdf.tobytes()
+    output_pdf.close()
     return result
@@ -1,59 +1,169 @@
-import subprocess
-import tempfile
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+import fitz
 from pdf2docx import Converter
-import shutil
+
+from .office import get_default_office_pool
+from .pdf import parse_page_ranges
+from .text_flow import is_simple_text_document, text_flow_docx
+from .zipstream import iter_zip
 
 
 # ---------- PDF → WORD ----------
-def pdf_to_word(pdf_bytes: bytes) -> bytes:
-    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp_pdf:
-        tmp_pdf.write(pdf_bytes)
-        pdf_path = tmp_pdf.name
+# Pages parsed per worker task in parallel mode
+DOCX_CHUNK_PAGES = 10
+# Upper bound on workers accepted from API callers; the pool never exceeds the CPUs
+DOCX_MAX_WORKERS = 64
+
+# auto: text-flow engine for simple text documents, pdf2docx otherwise
+# fast: always the text-flow engine
+# pdf2docx: always full layout reconstruction
+DOCX_ENGINES = ("auto", "fast", "pdf2docx")
+
+# Per-process copy of the source PDF, set once by _init_docx_worker
+_worker_pdf = None
 
-    docx_path = pdf_path.replace(".pdf", ".docx")
 
+def _init_docx_worker(pdf_bytes: bytes) -> None:
+    global _worker_pdf
+    _worker_pdf = pdf_bytes
+
+
+def _parse_docx_chunk(page_indexes: List[int]) -> List[dict]:
+    """Parse a chunk of 0-based pages and return their stored pdf2docx layouts."""
+    cv = Converter(stream=_worker_pdf)
     try:
-        cv = Converter(pdf_path)
-        cv.convert(docx_path)
+        settings = cv.default_settings
+        cv.load_pages(pages=page_indexes).parse_document(**settings).parse_pages(**settings)
+        return [page.store() for page in cv.pages if page.finalized]
+    finally:
         cv.close()
 
-        with open(docx_path, "rb") as f:
-            output = f.read()
 
-        return output
+def select_pages(
+    total: int,
+    pages: Optional[Union[str, List[int]]] = None,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+) -> List[int]:
+    """
+    1-based page numbers to convert: a range spec or list in `pages`,
+    otherwise the inclusive `start`..`end` range (whole document by default).
+    """
+    if isinstance(pages, str):
+        return parse_page_ranges(pages, total)
+    if pages:
+        selected = sorted(set(int(p) for p in pages))
+        if selected[0] < 1 or selected[-1] > total:
+            raise ValueError(f"Pages outside 1-{total}")
+        return selected
+
+    start = start or 1
+    end = end or total
+    if not 1 <= start <= end <= total:
+        raise ValueError(f"Page range {start}-{end} outside 1-{total}")
+    return list(range(start, end + 1))
+
+
+def pdf_to_word(
+    pdf_bytes: bytes,
+    pages: Optional[Union[str, List[int]]] = None,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    parallel: bool = False,
+    workers: Optional[int] = None,
+    chunk_size: int = DOCX_CHUNK_PAGES,
+    engine: str = "auto",
+) -> bytes:
+    """
+    Convert PDF bytes to DOCX bytes, in memory.
+
+    engine (see DOCX_ENGINES): "auto" uses the text-flow engine when a
+    sample of the selected pages is plain single-column text, and
+    pdf2docx layout reconstruction otherwise.
+    pages/start/end limit conversion to part of the document (1-based,
+    see select_pages). With parallel=True pdf2docx parses chunks of the
+    selected pages in a process pool of at most one worker per CPU; the
+    main process merges the parsed layouts and writes the document once.
+    """
+    if engine not in DOCX_ENGINES:
+        raise ValueError(f"Unknown conversion engine: {engine}")
+
+    if engine != "pdf2docx":
+        with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+            selected = select_pages(len(doc), pages, start, end)
+            if engine == "fast" or is_simple_text_document(doc, selected):
+                return text_flow_docx(doc, selected)
 
+    cv = Converter(stream=pdf_bytes)
+    try:
+        selected = select_pages(len(cv.fitz_doc), pages, start, end)
+        indexes = [p - 1 for p in selected]
+        settings = cv.default_settings
+        output = io.BytesIO()
+
+        cpus = os.cpu_count() or 1
+        workers = min(workers or cpus, cpus)
+        if not parallel or workers == 1 or len(indexes) <= chunk_size:
+            cv.convert(output, pages=indexes)
+            return output.getvalue()
+
+        chunks = [indexes[i:i + chunk_size] for i in range(0, len(indexes), chunk_size)]
+        cv.load_pages(pages=indexes)
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            initializer=_init_docx_worker,
+            initargs=(pdf_bytes,),
+        ) as pool:
+            for parsed in pool.map(_parse_docx_chunk, chunks):
+                cv.restore({"pages": parsed})
+
+        cv.make_docx(output, **settings)
+        return output.getvalue()
     finally:
-        Path(pdf_path).unlink(missing_ok=True)
-        Path(docx_path).unlink(missing_ok=True)
+        cv.close()
 
 
 # ---------- WORD → PDF (LibreOffice) ----------
 def word_to_pdf(docx_bytes: bytes) -> bytes:
-    if not shutil.which("libreoffice"):
-        raise RuntimeError(
-            "LibreOffice is required for Word → PDF conversion."
-        )
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        input_path = Path(tmpdir) / "input.docx"
-        input_path.write_bytes(docx_bytes)
-
-        subprocess.run(
-            [
-                "libreoffice",
-                "--headless",
-                "--convert-to",
-                "pdf",
-                "--outdir",
-                tmpdir,
-                input_path,
-            ],
-            check=True,
-        )
-
-        pdf_files = list(Path(tmpdir).glob("*.pdf"))
-        if not pdf_files:
-            raise RuntimeError("PDF conversion failed")
-
-        return pdf_files[0].read_bytes()
+    """Convert DOCX bytes to PDF bytes on the shared LibreOffice worker pool."""
+    return get_default_office_pool().convert(docx_bytes, ".docx")
+
+
+def word_to_pdf_batch(documents: List[Tuple[str, bytes]]) -> List[Dict[str, Any]]:
+    """
+    Convert many Word files in as few LibreOffice sessions as possible.
+    Returns {name, status, pdf | error} per file, in input order; a file
+    that fails to convert does not affect the others.
+    """
+    return get_default_office_pool().convert_batch(documents)
+
+
+def iter_pdf_batch_zip(results: List[Dict[str, Any]]) -> Iterator[bytes]:
+    """Stream a ZIP of the converted PDFs plus status.json with per-file results."""
+    used = set()
+    status = []
+
+    def entries():
+        for r in results:
+            entry = {"file": r["name"], "status": r["status"]}
+            if r["status"] == "ok":
+                stem = Path(r["name"]).stem or "document"
+                output = f"{stem}.pdf"
+                n = 1
+                while output in used:
+                    n += 1
+                    output = f"{stem} ({n}).pdf"
+                used.add(output)
+                entry["output"] = output
+                yield output, r["pdf"]
+            else:
+                entry["error"] = r["error"]
+            status.append(entry)
+        yield "status.json", json.dumps(status, indent=2).encode("utf-8")
+
+    return iter_zip(entries())
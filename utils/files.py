@@ -0,0 +1,114 @@
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .cleanup import remove_expired
+
+# Defaults (override with environment variables)
+SCRATCH_DIR = Path(os.environ.get("CEAYDOCS_SCRATCH_DIR", Path(tempfile.gettempdir()) / "ceaydocs-scratch"))
+SCRATCH_TTL_SECONDS = int(os.environ.get("CEAYDOCS_SCRATCH_TTL_SECONDS", 6 * 3600))
+
+CHUNK_SIZE = 1024 * 1024
+
+_SAFE_ID = re.compile(r"^[0-9a-f]{16,64}$")
+_SAFE_NAME = re.compile(r"^[a-z0-9_\-]{1,64}$")
+
+
+def secure_directory(directory: Path) -> None:
+    """Create `directory` private to this user, or refuse one another user controls."""
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    if os.name != "posix":
+        return
+    stat = directory.lstat()
+    if not os.path.isdir(directory) or directory.is_symlink():
+        raise RuntimeError(f"{directory} is not a directory")
+    if stat.st_uid != os.getuid():
+        raise RuntimeError(f"Directory {directory} is owned by another user")
+    if stat.st_mode & 0o077:
+        os.chmod(directory, 0o700)
+
+
+class ScratchStore:
+    """
+    Short-lived files produced by one request and fetched by another.
+
+    Files live under <directory>/<file_id>/<name>.pdf and expire after
+    `ttl_seconds`. Writes go to a temp file and are renamed into place,
+    so readers never see a half-written file. Uploaded documents end up
+    here, so the directory is private to this user (see secure_directory).
+    """
+
+    def __init__(self, directory: Path = SCRATCH_DIR, ttl_seconds: int = SCRATCH_TTL_SECONDS):
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+        secure_directory(self.directory)
+
+    def path(self, file_id: str, name: str) -> Path:
+        if not _SAFE_ID.match(file_id) or not _SAFE_NAME.match(name):
+            raise ValueError("Invalid scratch file reference")
+        return self.directory / file_id / f"{name}.pdf"
+
+    def temp_path(self, file_id: str, name: str) -> Path:
+        """A new, unique (mode 0600) sibling file to write to before commit()."""
+        final = self.path(file_id, name)
+        final.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=final.parent, prefix=f"{name}.", suffix=".tmp")
+        os.close(fd)
+        return Path(tmp)
+
+    def commit(self, file_id: str, name: str, temp_path: Path) -> Path:
+        final = self.path(file_id, name)
+        os.replace(temp_path, final)
+        return final
+
+    def exists(self, file_id: str, name: str) -> bool:
+        try:
+            return self.path(file_id, name).is_file()
+        except ValueError:
+            return False
+
+    def iter_file(self, file_id: str, name: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        with open(self.path(file_id, name), "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def read_bytes(self, file_id: str, name: str) -> bytes:
+        return self.path(file_id, name).read_bytes()
+
+    def cleanup(self) -> int:
+        return remove_expired(self.directory, self.ttl_seconds)
+
+
+_default_store: Optional[ScratchStore] = None
+
+
+def get_default_scratch_store() -> ScratchStore:
+    """Process-wide scratch store configured from the CEAYDOCS_SCRATCH_* environment."""
+    global _default_store
+    if _default_store is None:
+        _default_store = ScratchStore()
+    return _default_store
+
+
+def load_structured_file(path) -> object:
+    """
+    Load a JSON or YAML configuration file (by extension).
+    YAML support needs PyYAML installed.
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+
+    if path.suffix.lower() in {".yaml", ".yml"}:
+        try:
+            import yaml
+        except ImportError:
+            raise RuntimeError("PyYAML is required to load YAML configuration files.")
+        return yaml.safe_load(text)
+
+    return json.loads(text)
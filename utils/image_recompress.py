@@ -0,0 +1,108 @@
+import logging
+from typing import Dict, Optional
+
+import fitz
+
+logger = logging.getLogger(__name__)
+
+# Images at or below this many stored bytes are not worth re-encoding
+MIN_IMAGE_BYTES = 32 * 1024
+
+# Stream filters that already compress better than JPEG for their content
+# (bilevel scans)
+SKIP_FILTERS = ("/CCITTFaxDecode", "/JBIG2Decode")
+
+
+def effective_dpis(doc: "fitz.Document") -> Dict[int, float]:
+    """
+    Lowest effective DPI at which each image XObject is drawn anywhere in
+    the document: {xref: dpi}. Inline images (xref 0) are not included.
+    """
+    dpis: Dict[int, float] = {}
+    for page in doc:
+        for info in page.get_image_info(xrefs=True):
+            xref = info["xref"]
+            bbox = fitz.Rect(info["bbox"])
+            if not xref or bbox.is_empty:
+                continue
+            # placed size in inches; the larger axis is the least rounding-sensitive
+            if bbox.width >= bbox.height:
+                dpi = info["width"] / (bbox.width / 72)
+            else:
+                dpi = info["height"] / (bbox.height / 72)
+            dpis[xref] = min(dpi, dpis.get(xref, dpi))
+    return dpis
+
+
+def _should_skip(doc: "fitz.Document", xref: int, min_image_bytes: int) -> Optional[str]:
+    if doc.xref_get_key(xref, "SMask")[0] != "null":
+        return "has soft mask"
+    if doc.xref_get_key(xref, "ImageMask")[1] == "true":
+        return "stencil mask"
+    if doc.xref_get_key(xref, "BitsPerComponent")[1] == "1":
+        return "bilevel"
+    if any(f in doc.xref_get_key(xref, "Filter")[1] for f in SKIP_FILTERS):
+        return "bilevel filter"
+    if len(doc.xref_stream_raw(xref) or b"") <= min_image_bytes:
+        return "already small"
+    return None
+
+
+def _downsample(doc: "fitz.Document", xref: int, scale: float) -> "fitz.Pixmap":
+    pix = fitz.Pixmap(doc, xref)
+    if pix.alpha:
+        pix = fitz.Pixmap(pix, 0)
+    if pix.colorspace is None or pix.colorspace.n not in (1, 3):
+        pix = fitz.Pixmap(fitz.csRGB, pix)
+    if scale < 1:
+        width = max(1, round(pix.width * scale))
+        height = max(1, round(pix.height * scale))
+        pix = fitz.Pixmap(pix, width, height, None)
+    return pix
+
+
+def recompress_images(
+    pdf_file,
+    target_dpi: int = 150,
+    jpeg_quality: int = 60,
+    min_image_bytes: int = MIN_IMAGE_BYTES,
+) -> bytes:
+    """
+    Compress a PDF by downsampling only its raster images.
+
+    Every image XObject drawn above `target_dpi` is resampled to that
+    resolution and re-encoded as JPEG; the replacement is kept only when
+    it is smaller. Vector paths, fonts and text are not touched, so the
+    output stays searchable. Masked, bilevel and small images are skipped.
+    """
+    input_bytes = pdf_file.read()
+    doc = fitz.open(stream=input_bytes, filetype="pdf")
+
+    # replace_image rewrites the shared XObject, so one page serves for all
+    host_page = doc[0] if len(doc) else None
+    replaced = 0
+    for xref, dpi in effective_dpis(doc).items():
+        if dpi <= target_dpi:
+            continue
+        reason = _should_skip(doc, xref, min_image_bytes)
+        if reason:
+            logger.debug("Image %s skipped: %s", xref, reason)
+            continue
+
+        try:
+            pix = _downsample(doc, xref, target_dpi / dpi)
+            jpeg = pix.tobytes("jpeg", jpg_quality=jpeg_quality)
+        except Exception:
+            logger.exception("Could not resample image %s", xref)
+            continue
+
+        if len(jpeg) >= len(doc.xref_stream_raw(xref)):
+            continue
+
+        host_page.replace_image(xref, stream=jpeg)
+        replaced += 1
+
+    logger.debug("Recompressed %d images", replaced)
+    result = doc.tobytes(garbage=3, deflate=True)
+    doc.close()
+    return result
@@ -1,49 +1,114 @@
-from PyPDF2 import PdfMerger
+from PyPDF2 import PdfReader, PdfWriter
+import os
 import tempfile
+from contextlib import ExitStack
 from io import BytesIO
-import os
 from pathlib import Path
+from typing import BinaryIO, Iterator
+
+# Merged output is kept in memory up to this size; larger merges are
+# written straight to a temporary file
+MERGE_SPOOL_MAX_BYTES = int(os.environ.get("CEAYDOCS_MERGE_SPOOL_BYTES", 32 * 1024 * 1024))
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def _stream_size(stream) -> int:
+    pos = stream.tell()
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(pos)
+    return size
+
+
+def _append_all(writer: PdfWriter, pdf_files, files: ExitStack) -> int:
+    """
+    Append every input to the writer; returns the total input size.
+
+    Readers are opened on the caller's streams directly (paths are opened
+    as files and registered on `files`), so an input is not buffered a
+    second time; only bytes and non-seekable streams are wrapped or
+    copied into a BytesIO. PyPDF2 clones each page's objects into the
+    writer, so the writer itself holds the merged document until it is
+    written.
+    """
+    total = 0
+    for file in pdf_files:
+        if isinstance(file, (str, Path)):
+            file = files.enter_context(open(file, "rb"))
+        elif isinstance(file, (bytes, bytearray)):
+            file = BytesIO(file)
+        elif not file.seekable():
+            # PyPDF2 needs random access
+            file = BytesIO(file.read())
+        file.seek(0)
+        total += _stream_size(file)
+        writer.append(PdfReader(file))
+    return total
+
+
+def merge_pdfs_to_file(pdf_files, spool_max_bytes: int = MERGE_SPOOL_MAX_BYTES) -> BinaryIO:
+    """
+    Merge PDFs into a spooled temporary file, rewound and ready to read.
+
+    Inputs are paths, bytes, or seekable file-like objects such as upload
+    spools, read in place (see _append_all). The output is written once:
+    when the inputs total more than `spool_max_bytes` it goes to disk
+    from the first byte instead of being built in memory. Peak memory is
+    the merged document's object tree in the writer, plus the inputs
+    that arrived as bytes. The caller closes the result.
+    """
+    output = tempfile.SpooledTemporaryFile(max_size=spool_max_bytes)
+    writer = PdfWriter()
+    try:
+        with ExitStack() as files:
+            if _append_all(writer, pdf_files, files) > spool_max_bytes:
+                output.rollover()
+            writer.write(output)
+    except Exception:
+        output.close()
+        raise
+    finally:
+        writer.close()
+
+    output.seek(0)
+    return output
+
+
+def iter_file_chunks(stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield a file's contents in chunks, closing it at the end."""
+    try:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        stream.close()
+
 
 def merge_pdfs(pdf_files, output_path=None):
     """
     Merge PDFs.
-    - pdf_files: iterable of Paths/str or file-like objects
+    - pdf_files: iterable of Paths/str, bytes or file-like objects
     - output_path: if provided, write merged file to this path and return True
                    otherwise return bytes of merged PDF
     """
-    merger = PdfMerger()
-    tmp_paths = []
+    if output_path:
+        out_path = str(output_path)
+        # ensure parent directory exists
+        parent = Path(out_path).parent
+        if not parent.exists():
+            parent.mkdir(parents=True, exist_ok=True)
 
-    try:
-        for file in pdf_files:
-            if isinstance(file, (str, Path)):
-                merger.append(str(file))
-            else:
-                tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-                tmp.write(file.read())
-                tmp.close()
-                tmp_paths.append(tmp.name)
-                merger.append(tmp.name)
-
-        if output_path:
-            out_path = str(output_path)
-            # ensure parent directory exists
-            parent = Path(out_path).parent
-            if not parent.exists():
-                parent.mkdir(parents=True, exist_ok=True)
-            merger.write(out_path)
-            merger.close()
-            return True
-        else:
-            output = BytesIO()
-            merger.write(output)
-            output.seek(0)
-            merger.close()
-            return output.read()
+        writer = PdfWriter()
+        try:
+            with ExitStack() as files:
+                _append_all(writer, pdf_files, files)
+                writer.write(out_path)
+        finally:
+            writer.close()
+        return True
 
-    finally:
-        for path in tmp_paths:
-            try:
-                os.remove(path)
-            except Exception:
-                pass
+    with merge_pdfs_to_file(pdf_files) as output:
+        return output.read()
@@ -0,0 +1,396 @@
+import atexit
+import logging
+import os
+import queue
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Defaults (override with environment variables)
+OFFICE_WORKERS = int(os.environ.get("CEAYDOCS_OFFICE_WORKERS", "2"))
+OFFICE_TIMEOUT_SECONDS = float(os.environ.get("CEAYDOCS_OFFICE_TIMEOUT_SECONDS", "120"))
+OFFICE_START_TIMEOUT_SECONDS = float(os.environ.get("CEAYDOCS_OFFICE_START_TIMEOUT_SECONDS", "30"))
+
+# LibreOffice export filter per source extension; anything else goes through Writer
+PDF_EXPORT_FILTERS = {
+    ".xls": "calc_pdf_Export",
+    ".xlsx": "calc_pdf_Export",
+    ".ods": "calc_pdf_Export",
+    ".ppt": "impress_pdf_Export",
+    ".pptx": "impress_pdf_Export",
+    ".odp": "impress_pdf_Export",
+}
+DEFAULT_PDF_FILTER = "writer_pdf_Export"
+
+
+def find_soffice() -> Optional[str]:
+    for cmd in ("soffice", "libreoffice"):
+        path = shutil.which(cmd)
+        if path:
+            return path
+    return None
+
+
+def _new_process_group() -> Dict[str, Any]:
+    """Popen kwargs that start soffice in its own process group."""
+    if os.name == "posix":
+        return {"start_new_session": True}
+    return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+
+
+def _kill_process_group(process: subprocess.Popen) -> None:
+    """
+    Kill soffice together with its children: the `soffice` launcher
+    starts `soffice.bin`, which would otherwise survive a timeout.
+    """
+    if os.name == "posix":
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    else:
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    process.wait()
+
+
+def _run_soffice(args: List[str], timeout: float) -> None:
+    """subprocess.run(check=True, timeout=...) that kills the whole group on timeout."""
+    process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **_new_process_group())
+    try:
+        returncode = process.wait(timeout=timeout)
+    except BaseException:
+        _kill_process_group(process)
+        raise
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, args)
+
+
+def _has_uno() -> bool:
+    try:
+        import uno  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class OfficeWorker:
+    """
+    One headless LibreOffice instance with a private profile directory.
+
+    With the `uno` bindings available the instance is started once and
+    kept running; jobs are sent over a named UNO pipe, so each conversion
+    costs only the conversion itself. Without them every job runs
+    `soffice --convert-to` against this worker's profile (paying the full
+    start-up each time), which still keeps concurrent conversions from
+    colliding on a shared profile. soffice runs in its own process group
+    so a timeout kills `soffice.bin` as well as the launcher.
+    """
+
+    def __init__(self, soffice: str, slot: int, use_uno: bool, timeout: float = OFFICE_TIMEOUT_SECONDS):
+        self.soffice = soffice
+        self.slot = slot
+        self.use_uno = use_uno
+        self.timeout = timeout
+        self.profile_dir = Path(tempfile.mkdtemp(prefix=f"ceaydocs-office-{slot}-"))
+        self.pipe_name = f"ceaydocs_office_{os.getpid()}_{slot}"
+
+        self._process: Optional[subprocess.Popen] = None
+        self._desktop = None
+
+    def _base_args(self) -> List[str]:
+        return [
+            self.soffice,
+            "--headless",
+            "--invisible",
+            "--nologo",
+            "--norestore",
+            "--nodefault",
+            "--nolockcheck",
+            f"-env:UserInstallation={self.profile_dir.as_uri()}",
+        ]
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> None:
+        if not self.use_uno or self.alive:
+            return
+
+        import uno
+        from com.sun.star.connection import NoConnectException
+
+        self._process = subprocess.Popen(
+            self._base_args() + [f"--accept=pipe,name={self.pipe_name};urp;StarOffice.ComponentContext"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            **_new_process_group(),
+        )
+
+        local = uno.getComponentContext()
+        resolver = local.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local)
+        deadline = time.monotonic() + OFFICE_START_TIMEOUT_SECONDS
+        while True:
+            try:
+                ctx = resolver.resolve(f"uno:pipe,name={self.pipe_name};urp;StarOffice.ComponentContext")
+                break
+            except NoConnectException:
+                if not self.alive or time.monotonic() > deadline:
+                    self.kill()
+                    raise RuntimeError(f"LibreOffice worker {self.slot} failed to start")
+                time.sleep(0.2)
+
+        self._desktop = ctx.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", ctx)
+        logger.info("LibreOffice worker %s started (pid %s)", self.slot, self._process.pid)
+
+    def kill(self) -> None:
+        self._desktop = None
+        if self._process is not None:
+            _kill_process_group(self._process)
+            self._process = None
+
+    def restart(self) -> None:
+        logger.warning("Restarting LibreOffice worker %s", self.slot)
+        self.kill()
+        self.start()
+
+    def close(self) -> None:
+        self.kill()
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+    def convert(self, input_path: Path, output_path: Path) -> None:
+        """Convert one file to PDF at output_path; raises on failure or timeout."""
+        if self.use_uno:
+            self._convert_uno(input_path, output_path)
+        else:
+            self._convert_cli(input_path, output_path)
+
+        if not output_path.exists():
+            raise RuntimeError("PDF conversion failed")
+
+    def convert_many(self, input_paths: List[Path], out_dir: Path) -> Dict[Path, Optional[str]]:
+        """
+        Convert several files to <out_dir>/<stem>.pdf in one office session.
+
+        Returns {input_path: None on success, or an error message}. One
+        file failing does not stop the others: with the CLI all files go
+        to a single soffice call, and if that call crashes or times out
+        the unconverted files are retried one at a time.
+        """
+        errors: Dict[Path, Optional[str]] = {}
+        if self.use_uno:
+            for path in input_paths:
+                try:
+                    self._convert_uno(path, out_dir / f"{path.stem}.pdf")
+                    errors[path] = None
+                except Exception as exc:
+                    logger.warning("LibreOffice worker %s failed on %s: %s", self.slot, path.name, exc)
+                    self.kill()
+                    errors[path] = str(exc) or type(exc).__name__
+            return self._check_outputs(errors, out_dir)
+
+        try:
+            _run_soffice(
+                self._base_args() + ["--convert-to", "pdf", "--outdir", str(out_dir), *map(str, input_paths)],
+                self.timeout * len(input_paths),
+            )
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as exc:
+            logger.warning("Batch conversion on worker %s failed: %s", self.slot, exc)
+            for path in input_paths:
+                output_path = out_dir / f"{path.stem}.pdf"
+                if output_path.exists() or len(input_paths) == 1:
+                    continue
+                try:
+                    self._convert_cli(path, output_path)
+                except Exception as retry_exc:
+                    errors[path] = str(retry_exc)
+
+        for path in input_paths:
+            errors.setdefault(path, None)
+        return self._check_outputs(errors, out_dir)
+
+    @staticmethod
+    def _check_outputs(errors: Dict[Path, Optional[str]], out_dir: Path) -> Dict[Path, Optional[str]]:
+        for path, error in errors.items():
+            if error is None and not (out_dir / f"{path.stem}.pdf").exists():
+                errors[path] = "PDF conversion failed"
+        return errors
+
+    def _convert_cli(self, input_path: Path, output_path: Path) -> None:
+        out_dir = output_path.parent
+        _run_soffice(
+            self._base_args() + ["--convert-to", "pdf", "--outdir", str(out_dir), str(input_path)],
+            self.timeout,
+        )
+        produced = out_dir / f"{input_path.stem}.pdf"
+        if produced.exists() and produced != output_path:
+            produced.replace(output_path)
+
+    def _convert_uno(self, input_path: Path, output_path: Path) -> None:
+        import uno
+        from com.sun.star.beans import PropertyValue
+
+        def prop(name, value):
+            p = PropertyValue()
+            p.Name, p.Value = name, value
+            return p
+
+        self.start()
+        # a hung conversion cannot be interrupted over UNO; killing the
+        # process makes the blocked call fail and the pool restarts the worker
+        timer = threading.Timer(self.timeout, self.kill)
+        timer.start()
+        try:
+            doc = self._desktop.loadComponentFromURL(
+                uno.systemPathToFileUrl(str(input_path)), "_blank", 0, (prop("Hidden", True),)
+            )
+            if doc is None:
+                raise RuntimeError(f"LibreOffice could not open {input_path.name}")
+            try:
+                export_filter = PDF_EXPORT_FILTERS.get(input_path.suffix.lower(), DEFAULT_PDF_FILTER)
+                doc.storeToURL(uno.systemPathToFileUrl(str(output_path)), (prop("FilterName", export_filter),))
+            finally:
+                doc.close(True)
+        except Exception:
+            if not timer.is_alive():
+                raise TimeoutError(f"Conversion exceeded {self.timeout:.0f}s")
+            raise
+        finally:
+            timer.cancel()
+
+
+class OfficePool:
+    """
+    A fixed number of LibreOffice workers; at most `size` conversions run
+    at once and further callers wait for a free worker. A worker whose
+    job fails, times out or whose process has died is restarted before
+    it is handed out again.
+    """
+
+    def __init__(
+        self,
+        size: int = OFFICE_WORKERS,
+        soffice: Optional[str] = None,
+        use_uno: Optional[bool] = None,
+        timeout: float = OFFICE_TIMEOUT_SECONDS,
+    ):
+        self.soffice = soffice or find_soffice()
+        if not self.soffice:
+            raise RuntimeError("LibreOffice is required for Word → PDF conversion.")
+
+        self.use_uno = _has_uno() if use_uno is None else use_uno
+        if use_uno is None and not self.use_uno:
+            logger.warning(
+                "Python 'uno' bindings not found; every Word → PDF job will start a fresh "
+                "LibreOffice. Install python3-uno (see README) to keep instances warm."
+            )
+        self.size = max(1, size)
+        self._idle: "queue.Queue[OfficeWorker]" = queue.Queue()
+        self._workers = [OfficeWorker(self.soffice, slot, self.use_uno, timeout) for slot in range(self.size)]
+        for worker in self._workers:
+            self._idle.put(worker)
+
+    def _acquire(self) -> OfficeWorker:
+        worker = self._idle.get()
+        try:
+            if worker.use_uno and not worker.alive:
+                worker.restart()
+        except Exception:
+            self._idle.put(worker)
+            raise
+        return worker
+
+    def convert(self, data: bytes, suffix: str = ".docx") -> bytes:
+        """Convert one document (given as bytes) to PDF bytes."""
+        worker = self._acquire()
+        try:
+            with tempfile.TemporaryDirectory(prefix="ceaydocs-office-job-") as tmpdir:
+                input_path = Path(tmpdir) / f"input{suffix}"
+                output_path = Path(tmpdir) / "output.pdf"
+                input_path.write_bytes(data)
+                try:
+                    worker.convert(input_path, output_path)
+                except Exception:
+                    logger.exception("LibreOffice worker %s failed", worker.slot)
+                    if worker.use_uno:
+                        worker.kill()
+                    raise
+                return output_path.read_bytes()
+        finally:
+            self._idle.put(worker)
+
+    def convert_batch(self, documents: List[Tuple[str, bytes]]) -> List[Dict[str, Any]]:
+        """
+        Convert many documents with as few office sessions as possible:
+        the batch is split over the pool's workers and each worker converts
+        its share in one session.
+
+        Returns, in input order, {name, status: "ok", pdf} or
+        {name, status: "failed", error} per document.
+        """
+        if not documents:
+            return []
+
+        groups = min(self.size, len(documents))
+        shares = [list(range(len(documents)))[g::groups] for g in range(groups)]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(documents)
+
+        def run(indexes: List[int]) -> None:
+            worker = self._acquire()
+            try:
+                with tempfile.TemporaryDirectory(prefix="ceaydocs-office-batch-") as tmpdir:
+                    tmp = Path(tmpdir)
+                    inputs = {}
+                    for i in indexes:
+                        name, data = documents[i]
+                        suffix = Path(name).suffix.lower() or ".docx"
+                        # numbered names keep user filenames off the command line
+                        path = tmp / f"{i:05d}{suffix}"
+                        path.write_bytes(data)
+                        inputs[path] = i
+
+                    errors = worker.convert_many(list(inputs), tmp)
+                    for path, i in inputs.items():
+                        name = documents[i][0]
+                        if errors[path] is None:
+                            results[i] = {"name": name, "status": "ok", "pdf": (tmp / f"{path.stem}.pdf").read_bytes()}
+                        else:
+                            results[i] = {"name": name, "status": "failed", "error": errors[path]}
+            except Exception as exc:
+                logger.exception("LibreOffice worker %s batch failed", worker.slot)
+                for i in indexes:
+                    if results[i] is None:
+                        results[i] = {"name": documents[i][0], "status": "failed", "error": str(exc)}
+            finally:
+                self._idle.put(worker)
+
+        with ThreadPoolExecutor(max_workers=groups) as pool:
+            list(pool.map(run, shares))
+
+        return results
+
+    def close(self) -> None:
+        for worker in self._workers:
+            worker.close()
+
+
+_default_pool: Optional[OfficePool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_office_pool() -> OfficePool:
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = OfficePool()
+            atexit.register(_default_pool.close)
+    return _default_pool
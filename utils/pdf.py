@@ -0,0 +1,135 @@
+import fitz  # PyMuPDF
+from typing import Dict, Any, List, Optional, Union
+
+
+class DocumentContext:
+    """
+    One parsed PDF shared by every stage of a single analysis.
+
+    The document is opened once and each page's text, image count and
+    geometry are extracted once (lazily, on first access). Stages that
+    receive a context read from it instead of re-opening the bytes.
+    """
+
+    def __init__(self, pdf_bytes: bytes, doc: Optional["fitz.Document"] = None):
+        self.pdf_bytes = pdf_bytes
+        self.doc = doc if doc is not None else fitz.open(stream=pdf_bytes, filetype="pdf")
+        self._pages: Optional[List[Dict[str, Any]]] = None
+
+    def __enter__(self) -> "DocumentContext":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.doc)
+
+    @property
+    def page_count(self) -> int:
+        return len(self.doc)
+
+    @property
+    def has_text(self) -> bool:
+        """True once the single text pass has run."""
+        return self._pages is not None
+
+    @property
+    def pages(self) -> List[Dict[str, Any]]:
+        """
+        Per-page info, extracted in a single pass:
+        [{page, text, words, image_count, width, height, rotation}, ...]
+        where words are PyMuPDF (x0, y0, x1, y1, word, block, line, word_no) tuples.
+        """
+        if self._pages is None:
+            self._pages = [page_info(page, i + 1) for i, page in enumerate(self.doc)]
+        return self._pages
+
+    def page_text(self, page_num: int) -> str:
+        """Text of a 1-based page, without forcing a full-document pass."""
+        if self._pages is not None:
+            return self._pages[page_num - 1]["text"]
+        return self.doc[page_num - 1].get_text("text")
+
+    def page(self, page_num: int) -> Dict[str, Any]:
+        """Return info for a 1-based page number."""
+        return self.pages[page_num - 1]
+
+    def close(self) -> None:
+        if not self.doc.is_closed:
+            self.doc.close()
+
+
+def page_info(page: "fitz.Page", page_num: int) -> Dict[str, Any]:
+    """Extract text, words, image count and geometry from one page."""
+    rect = page.rect
+    # text and word boxes come from the same parse of the page
+    textpage = page.get_textpage()
+    return {
+        "page": page_num,
+        "text": page.get_text("text", textpage=textpage),
+        "words": page.get_text("words", textpage=textpage),
+        "image_count": len(page.get_images()),
+        "width": rect.width,
+        "height": rect.height,
+        "rotation": page.rotation,
+    }
+
+
+def sample_page_numbers(page_count: int, budget: int) -> List[int]:
+    """
+    Up to `budget` 1-based page numbers spread evenly over the document,
+    always including the first and last page.
+    """
+    if budget < 1:
+        raise ValueError("budget must be at least 1")
+    if page_count <= budget:
+        return list(range(1, page_count + 1))
+    if budget == 1:
+        return [1]
+    step = (page_count - 1) / (budget - 1)
+    return sorted({round(i * step) + 1 for i in range(budget)})
+
+
+def parse_page_ranges(spec: str, total: int) -> List[int]:
+    """
+    Parse a page-range spec such as "1-3,7,10-" into sorted, unique
+    1-based page numbers. An open-ended range ("10-") runs to the last page.
+    """
+    pages = set()
+    for part in spec.replace(" ", "").split(","):
+        if not part:
+            continue
+        try:
+            if "-" in part:
+                first, _, last = part.partition("-")
+                start = int(first) if first else 1
+                end = int(last) if last else total
+            else:
+                start = end = int(part)
+        except ValueError:
+            raise ValueError(f"Invalid page range: {part!r}")
+
+        if start > end:
+            raise ValueError(f"Invalid page range: {part!r}")
+        if start < 1 or end > total:
+            raise ValueError(f"Page range {part!r} outside 1-{total}")
+        pages.update(range(start, end + 1))
+
+    if not pages:
+        raise ValueError("No pages selected")
+    return sorted(pages)
+
+
+def open_context(source: Union[bytes, DocumentContext]):
+    """
+    Return (context, owned) for either raw bytes or an existing context.
+
+    `owned` is True when the context was created here and the caller
+    is responsible for closing it.
+    """
+    if isinstance(source, DocumentContext):
+        return source, False
+    if isinstance(source, (bytes, bytearray)):
+        return DocumentContext(bytes(source)), True
+    raise TypeError("source must be PDF bytes or a DocumentContext")
@@ -1,6 +1,19 @@
 from PyPDF2 import PdfReader, PdfWriter
-import tempfile
-from pathlib import Path
+from PyPDF2.errors import PdfReadError
+from io import BytesIO
+from typing import Iterator, List, Optional, Tuple
+
+from .pdf import parse_page_ranges
+from .zipstream import iter_zip
+
+
+def read_pdf(pdf_bytes: bytes) -> Tuple[PdfReader, int]:
+    """Parse an upload and its page tree; unreadable input raises ValueError."""
+    try:
+        reader = PdfReader(BytesIO(pdf_bytes))
+        return reader, len(reader.pages)
+    except PdfReadError as exc:
+        raise ValueError(f"Not a readable PDF: {exc}") from exc
 
 
 def split_pdf(pdf_bytes: bytes, start: int, end: int) -> bytes:
@@ -10,25 +23,81 @@ def split_pdf(pdf_bytes: bytes, start: int, end: int) -> bytes:
     if start < 1 or end < start:
         raise ValueError("Invalid page range")
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        input_path = Path(tmpdir) / "input.pdf"
-        input_path.write_bytes(pdf_bytes)
+    reader, total_pages = read_pdf(pdf_bytes)
+
+    if end > total_pages:
+        raise ValueError(
+            f"PDF has only {total_pages} pages, but end={end}"
+        )
+
+    return write_pages(reader, range(start, end + 1))
+
+
+def write_pages(reader: PdfReader, pages) -> bytes:
+    """New PDF with the given 1-based pages of an already-parsed reader."""
+    writer = PdfWriter()
+    for n in pages:
+        writer.add_page(reader.pages[n - 1])
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
 
-        reader = PdfReader(str(input_path))
-        total_pages = len(reader.pages)
+def _part_name(pages: List[int], width: int) -> str:
+    if len(pages) == 1:
+        return f"page_{pages[0]:0{width}d}.pdf"
+    return f"pages_{pages[0]:0{width}d}-{pages[-1]:0{width}d}.pdf"
 
-        if end > total_pages:
-            raise ValueError(
-                f"PDF has only {total_pages} pages, but end={end}"
-            )
 
-        writer = PdfWriter()
+def plan_parts(
+    total: int,
+    ranges: Optional[str] = None,
+    every: Optional[int] = None,
+    burst: bool = False,
+) -> List[Tuple[str, List[int]]]:
+    """
+    Output files for one split, as [(filename, 1-based pages)].
+
+    Exactly one mode is used:
+    - ranges: "1-3,7,10-" gives one file per comma-separated range
+    - every: a new file every N pages
+    - burst: one file per page
+    """
+    if sum([bool(ranges), every is not None, burst]) != 1:
+        raise ValueError("Specify exactly one of ranges, every or burst")
+
+    if ranges:
+        groups = [parse_page_ranges(part, total) for part in ranges.split(",") if part.strip()]
+    elif every is not None:
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        groups = [list(range(s, min(s + every, total + 1))) for s in range(1, total + 1, every)]
+    else:
+        groups = [[n] for n in range(1, total + 1)]
 
-        for i in range(start - 1, end):
-            writer.add_page(reader.pages[i])
+    if not groups:
+        raise ValueError("No pages selected")
+    width = len(str(total))
+    return [(_part_name(pages, width), pages) for pages in groups]
 
-        output_path = Path(tmpdir) / "split.pdf"
-        with open(output_path, "wb") as f:
-            writer.write(f)
 
-        return output_path.read_bytes()
+def iter_split_parts(reader: PdfReader, parts: List[Tuple[str, List[int]]]) -> Iterator[Tuple[str, bytes]]:
+    """Write each planned part from the one already-parsed reader, yielding as it completes."""
+    for name, pages in parts:
+        yield name, write_pages(reader, pages)
+
+
+def iter_split_zip(
+    pdf_bytes: bytes,
+    ranges: Optional[str] = None,
+    every: Optional[int] = None,
+    burst: bool = False,
+) -> Iterator[bytes]:
+    """
+    Parse the PDF once and stream a ZIP of all parts, each entry written
+    as soon as its part is built. Invalid input raises ValueError before
+    any bytes are produced.
+    """
+    reader, total = read_pdf(pdf_bytes)
+    parts = plan_parts(total, ranges, every, burst)
+    return iter_zip(iter_split_parts(reader, parts))
@@ -0,0 +1,111 @@
+import io
+from typing import List
+
+import fitz
+
+from .pdf import sample_page_numbers
+
+# Pages inspected by the simple-layout check
+LAYOUT_SAMPLE_PAGES = 10
+
+# More vector paths than this on a page suggests tables, figures or forms
+MAX_SIMPLE_DRAWINGS = 12
+
+# span flag bits from PyMuPDF's "dict" output
+_ITALIC = 2
+_BOLD = 16
+
+
+def _is_multi_column(blocks) -> bool:
+    """Two text blocks side by side (overlapping rows, separate columns)."""
+    rects = [fitz.Rect(b["bbox"]) for b in blocks]
+    for i, a in enumerate(rects):
+        for b in rects[i + 1:]:
+            rows_overlap = min(a.y1, b.y1) - max(a.y0, b.y0) > 2
+            if rows_overlap and (a.x1 <= b.x0 or b.x1 <= a.x0):
+                return True
+    return False
+
+
+def is_simple_text_page(page: "fitz.Page") -> bool:
+    """Text-only, single-column page with few vector graphics."""
+    if page.get_images():
+        return False
+    blocks = [b for b in page.get_text("dict")["blocks"] if b["type"] == 0]
+    if not blocks:
+        return False
+    if len(page.get_drawings()) > MAX_SIMPLE_DRAWINGS:
+        return False
+    return not _is_multi_column(blocks)
+
+
+def is_simple_text_document(doc: "fitz.Document", pages: List[int], budget: int = LAYOUT_SAMPLE_PAGES) -> bool:
+    """
+    Cheap pre-check for the text-flow engine: every sampled page (1-based
+    numbers from `pages`) has text and no images, one column and no
+    table-like vector graphics.
+    """
+    if not pages:
+        return False
+    picks = sample_page_numbers(len(pages), budget)
+    return all(is_simple_text_page(doc[pages[i - 1] - 1]) for i in picks)
+
+
+def _block_runs(block):
+    """(text, bold, italic, size) runs of one text block, lines joined into flowing text."""
+    runs = []
+    lines = block["lines"]
+    for n, line in enumerate(lines):
+        for span in line["spans"]:
+            if span["text"]:
+                runs.append([span["text"], bool(span["flags"] & _BOLD), bool(span["flags"] & _ITALIC), span["size"]])
+        if runs and n < len(lines) - 1:
+            # re-flow wrapped lines; keep hyphenated words together
+            if runs[-1][0].endswith("-"):
+                runs[-1][0] = runs[-1][0][:-1]
+            elif not runs[-1][0].endswith(" "):
+                runs[-1][0] += " "
+    return runs
+
+
+def text_flow_docx(doc: "fitz.Document", pages: List[int]) -> bytes:
+    """
+    Build a DOCX straight from PyMuPDF text blocks: one paragraph per
+    block, one run per font span (bold, italic and size kept), a page
+    break between PDF pages. No layout reconstruction is attempted.
+    """
+    try:
+        from docx import Document
+        from docx.enum.text import WD_BREAK
+        from docx.shared import Pt
+    except ImportError:
+        raise RuntimeError("python-docx is required for the text-flow engine.")
+
+    out = Document()
+    if pages:
+        first = doc[pages[0] - 1].rect
+        section = out.sections[0]
+        section.page_width, section.page_height = Pt(first.width), Pt(first.height)
+
+    for i, page_num in enumerate(pages):
+        page = doc[page_num - 1]
+        paragraph = None
+        for block in page.get_text("dict", sort=True)["blocks"]:
+            if block["type"] != 0:
+                continue
+            runs = _block_runs(block)
+            if not runs:
+                continue
+            paragraph = out.add_paragraph()
+            for text, bold, italic, size in runs:
+                run = paragraph.add_run(text)
+                run.bold = bold or None
+                run.italic = italic or None
+                run.font.size = Pt(round(size * 2) / 2)
+
+        if i < len(pages) - 1:
+            (paragraph or out.add_paragraph()).add_run().add_break(WD_BREAK.PAGE)
+
+    buffer = io.BytesIO()
+    out.save(buffer)
+    return buffer.getvalue()
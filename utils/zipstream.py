@@ -0,0 +1,46 @@
+import zipfile
+from typing import Iterable, Iterator, Tuple
+
+
+class _StreamBuffer:
+    """Write-only sink for ZipFile; it has no seek(), so entries use data descriptors."""
+
+    def __init__(self):
+        self._chunks = []
+        self._pos = 0
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_zip(
+    entries: Iterable[Tuple[str, bytes]],
+    compression: int = zipfile.ZIP_DEFLATED,
+) -> Iterator[bytes]:
+    """
+    Build a ZIP archive entry by entry, yielding bytes as each entry is
+    written. Only one entry is held in memory at a time.
+    """
+    buffer = _StreamBuffer()
+    with zipfile.ZipFile(buffer, "w", compression=compression) as zf:
+        for name, data in entries:
+            zf.writestr(name, data)
+            chunk = buffer.drain()
+            if chunk:
+                yield chunk
+    tail = buffer.drain()
+    if tail:
+        yield tail